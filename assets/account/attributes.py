@@ -0,0 +1,222 @@
+from typing import Any, Dict, IO, List
+from plaid.model.account_assets import AccountAssets
+from stream import AssetReportStream, account_from_json
+from summary import (
+    AccountSummary,
+    summarize_account,
+    requested_groups,
+    transaction_statistic,
+    balance_statistic,
+)
+
+"""
+The account level attributes that can be computed by compute_account_attributes.
+Each name matches the function of the same name in the account level attribute
+files and produces the same value.
+"""
+
+ACCOUNT_ATTRIBUTES = [
+    # cash_flow.py
+    "num_inflows",
+    "total_inflows_amount",
+    "inflows_monthly_summary",
+    "num_outflows",
+    "total_outflows_amount",
+    "outflows_monthly_summary",
+    "num_transactions",
+    "net_cash_flow",
+    "monthly_cash_flow",
+    # debt_insights.py
+    "count_loan_disbursements",
+    "amount_loan_disbursements",
+    "max_loan_disbursements",
+    "min_loan_disbursements",
+    "avg_loan_disbursement",
+    "loan_disbursement_monthly_summary",
+    "days_since_loan_disbursement",
+    "count_loan_payments",
+    "amount_loan_payments",
+    "max_loan_payments",
+    "min_loan_payments",
+    "avg_loan_payment",
+    "loan_payment_monthly_summary",
+    "days_since_loan_payment",
+    # historical_balances.py
+    "avg_historical_balance",
+    "min_historical_balance",
+    "max_historical_balance",
+    # negative_record.py
+    "count_negative_historical_balances",
+    "lowest_negative_historical_balance",
+    "average_negative_historical_balance",
+    "count_od_nsf",
+    "amount_od_nsf",
+    "max_od_nsf",
+    "min_od_nsf",
+    "avg_od_nsf",
+    "od_nsf_monthly_summary",
+    "days_since_od_nsf",
+    # unusual_account_activity.py
+    "num_outlier_transactions",
+]
+
+# Attributes that are a reduction over a group of transactions, as (group, statistic).
+# Groups are either a cash flow partition or a credit category primary.
+TRANSACTION_ATTRIBUTES = {
+    "num_inflows": ("inflows", "count"),
+    "total_inflows_amount": ("inflows", "total"),
+    "inflows_monthly_summary": ("inflows", "monthly"),
+    "num_outflows": ("outflows", "count"),
+    "total_outflows_amount": ("outflows", "total"),
+    "outflows_monthly_summary": ("outflows", "monthly"),
+    "num_transactions": ("transactions", "count"),
+    "net_cash_flow": ("transactions", "total"),
+    "monthly_cash_flow": ("transactions", "monthly"),
+    "count_loan_disbursements": ("LOAN_DISBURSEMENTS", "count"),
+    "amount_loan_disbursements": ("LOAN_DISBURSEMENTS", "total"),
+    "max_loan_disbursements": ("LOAN_DISBURSEMENTS", "max"),
+    "min_loan_disbursements": ("LOAN_DISBURSEMENTS", "min"),
+    "avg_loan_disbursement": ("LOAN_DISBURSEMENTS", "average"),
+    "loan_disbursement_monthly_summary": ("LOAN_DISBURSEMENTS", "monthly"),
+    "days_since_loan_disbursement": ("LOAN_DISBURSEMENTS", "days_since"),
+    "count_loan_payments": ("LOAN_PAYMENTS", "count"),
+    "amount_loan_payments": ("LOAN_PAYMENTS", "total"),
+    "max_loan_payments": ("LOAN_PAYMENTS", "max"),
+    "min_loan_payments": ("LOAN_PAYMENTS", "min"),
+    "avg_loan_payment": ("LOAN_PAYMENTS", "average"),
+    "loan_payment_monthly_summary": ("LOAN_PAYMENTS", "monthly"),
+    "days_since_loan_payment": ("LOAN_PAYMENTS", "days_since"),
+    "count_od_nsf": ("BANK_PENALTIES", "count"),
+    "amount_od_nsf": ("BANK_PENALTIES", "total"),
+    "max_od_nsf": ("BANK_PENALTIES", "max"),
+    "min_od_nsf": ("BANK_PENALTIES", "min"),
+    "avg_od_nsf": ("BANK_PENALTIES", "average"),
+    "od_nsf_monthly_summary": ("BANK_PENALTIES", "monthly"),
+    "days_since_od_nsf": ("BANK_PENALTIES", "days_since"),
+}
+
+# Attributes that are a statistic of the historical balances of the account
+BALANCE_ATTRIBUTES = {
+    "avg_historical_balance": "average",
+    "min_historical_balance": "min",
+    "max_historical_balance": "max",
+    "count_negative_historical_balances": "count_negative",
+    "lowest_negative_historical_balance": "lowest_negative",
+    "average_negative_historical_balance": "average_negative",
+}
+
+
+"""
+account_attributes_from_summary reads the requested account attributes from an
+AccountSummary built with summary.summarize_account
+
+Params
+* summary: the AccountSummary of the account
+* attributes: the names of the attributes to read, from ACCOUNT_ATTRIBUTES
+
+Returns
+* A map of attribute name to its value
+"""
+
+
+def account_attributes_from_summary(
+    summary: AccountSummary, attributes: List[str] = ACCOUNT_ATTRIBUTES
+) -> Dict[str, Any]:
+    unknown_attributes = set(attributes) - set(ACCOUNT_ATTRIBUTES)
+    if unknown_attributes:
+        raise ValueError(f"unknown attributes {sorted(unknown_attributes)}")
+
+    results = {}
+    for attribute in attributes:
+        if attribute in TRANSACTION_ATTRIBUTES:
+            group, statistic = TRANSACTION_ATTRIBUTES[attribute]
+            results[attribute] = transaction_statistic(
+                summary.transactions[group], statistic
+            )
+        elif attribute in BALANCE_ATTRIBUTES:
+            results[attribute] = balance_statistic(
+                summary.balances, BALANCE_ATTRIBUTES[attribute]
+            )
+        elif attribute == "num_outlier_transactions":
+            results[attribute] = summary.num_outliers
+    return results
+
+
+"""
+compute_account_attributes takes in an asset account and computes every requested
+attribute with a single pass over its transactions and a single pass over its
+historical balances, instead of one pass per attribute
+
+Params
+* account: one of the accounts retrieved through /asset_report/get
+* attributes: the names of the attributes to compute, from ACCOUNT_ATTRIBUTES. Defaults
+    to every account level attribute
+* outlier_threshold: the threshold used by num_outlier_transactions
+
+Returns
+* A map of attribute name to its value
+"""
+
+
+def compute_account_attributes(
+    account: AccountAssets,
+    attributes: List[str] = ACCOUNT_ATTRIBUTES,
+    outlier_threshold: float = 10000.00,
+) -> Dict[str, Any]:
+    unknown_attributes = set(attributes) - set(ACCOUNT_ATTRIBUTES)
+    if unknown_attributes:
+        raise ValueError(f"unknown attributes {sorted(unknown_attributes)}")
+
+    # Only summarize the groups, monthly summaries and balances that were requested
+    groups, monthly_groups = requested_groups(attributes, TRANSACTION_ATTRIBUTES)
+
+    summary = summarize_account(
+        account,
+        groups,
+        monthly_groups,
+        outlier_threshold if "num_outlier_transactions" in attributes else None,
+        any(attribute in BALANCE_ATTRIBUTES for attribute in attributes),
+    )
+    return account_attributes_from_summary(summary, attributes)
+
+
+"""
+compute_account_attributes_from_json computes the requested attributes for every account
+in a raw /asset_report/get JSON response. The response is read incrementally, one account
+at a time, without building the plaid model objects, and gives the same values as
+compute_account_attributes
+
+Params
+* fp: a text file object with the JSON response
+* attributes: the names of the attributes to compute, from ACCOUNT_ATTRIBUTES. Defaults
+    to every account level attribute
+* outlier_threshold: the threshold used by num_outlier_transactions
+
+Returns
+* A map of account_id to the map of attribute name to its value for that account
+"""
+
+
+def compute_account_attributes_from_json(
+    fp: IO[str],
+    attributes: List[str] = ACCOUNT_ATTRIBUTES,
+    outlier_threshold: float = 10000.00,
+) -> Dict[str, Dict[str, Any]]:
+    unknown_attributes = set(attributes) - set(ACCOUNT_ATTRIBUTES)
+    if unknown_attributes:
+        raise ValueError(f"unknown attributes {sorted(unknown_attributes)}")
+
+    groups, monthly_groups = requested_groups(attributes, TRANSACTION_ATTRIBUTES)
+    results = {}
+    for account in AssetReportStream(fp).accounts():
+        summary = summarize_account(
+            account_from_json(account),
+            groups,
+            monthly_groups,
+            outlier_threshold if "num_outlier_transactions" in attributes else None,
+            any(attribute in BALANCE_ATTRIBUTES for attribute in attributes),
+        )
+        results[summary.account_id] = account_attributes_from_summary(
+            summary, attributes
+        )
+    return results
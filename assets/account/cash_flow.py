@@ -1,9 +1,7 @@
 from typing import Dict
 from plaid.model.account_assets import AccountAssets
-from utils import (
-    calculate_user_historical_balances,
-    calculate_monthly_summary_of_transactions,
-)
+from months import get_account_monthly_buckets
+from utils import calculate_user_historical_balances
 
 """
 Count of inflows
@@ -46,11 +44,7 @@ month represented in the account
 
 
 def inflows_monthly_summary(account: AccountAssets) -> Dict[str, int]:
-    inflows = []
-    for transaction in account.transactions:
-        if transaction.amount < 0:
-            inflows.append(transaction)
-    return calculate_monthly_summary_of_transactions(inflows)
+    return get_account_monthly_buckets(account).summary("inflows")
 
 
 """
@@ -94,11 +88,7 @@ month represented in the account
 
 
 def outflows_monthly_summary(account: AccountAssets) -> Dict[str, int]:
-    outflows = []
-    for transaction in account.transactions:
-        if transaction.amount > 0:
-            outflows.append(transaction)
-    return calculate_monthly_summary_of_transactions(outflows)
+    return get_account_monthly_buckets(account).summary("outflows")
 
 
 """
@@ -140,4 +130,4 @@ month represented in the account
 
 
 def monthly_cash_flow(account: AccountAssets) -> Dict[str, int]:
-    return calculate_monthly_summary_of_transactions(account.transactions)
+    return get_account_monthly_buckets(account).summary("net")
@@ -1,12 +1,11 @@
 from typing import Dict
 from plaid.model.account_assets import AccountAssets
+from months import net_monthly_summary
 from utils import (
     calculate_user_historical_balances,
     filter_account_transactions_by_category,
-    calculate_monthly_summary_of_transactions,
-    get_most_recent_transaction,
+    get_account_category_summary,
 )
-from datetime import date
 
 """
 Count of Loan Disburstments
@@ -17,7 +16,7 @@ in the users account
 
 
 def count_loan_disbursements(account: AccountAssets) -> int:
-    return len(filter_account_transactions_by_category(account, "LOAN_DISBURSEMENTS"))
+    return get_account_category_summary(account, "LOAN_DISBURSEMENTS").count
 
 
 """
@@ -29,10 +28,7 @@ in the users account
 
 
 def amount_loan_disbursements(account: AccountAssets) -> float:
-    loan_disbursement_transactions = filter_account_transactions_by_category(
-        account, "LOAN_DISBURSEMENTS"
-    )
-    return sum([transaction.amount for transaction in loan_disbursement_transactions])
+    return get_account_category_summary(account, "LOAN_DISBURSEMENTS").total
 
 
 """
@@ -44,12 +40,10 @@ in the users account
 
 
 def max_loan_disbursements(account: AccountAssets) -> float:
-    loan_disbursement_transactions = filter_account_transactions_by_category(
-        account, "LOAN_DISBURSEMENTS"
-    )
-    if len(loan_disbursement_transactions) == 0:
+    loan_disbursements = get_account_category_summary(account, "LOAN_DISBURSEMENTS")
+    if loan_disbursements.count == 0:
         return 0.0
-    return max([transaction.amount for transaction in loan_disbursement_transactions])
+    return loan_disbursements.max
 
 
 """
@@ -61,12 +55,10 @@ in the users account
 
 
 def min_loan_disbursements(account: AccountAssets) -> float:
-    loan_disbursement_transactions = filter_account_transactions_by_category(
-        account, "LOAN_DISBURSEMENTS"
-    )
-    if len(loan_disbursement_transactions) == 0:
+    loan_disbursements = get_account_category_summary(account, "LOAN_DISBURSEMENTS")
+    if loan_disbursements.count == 0:
         return 0.0
-    return min([transaction.amount for transaction in loan_disbursement_transactions])
+    return loan_disbursements.min
 
 
 """
@@ -78,14 +70,7 @@ in the users account
 
 
 def avg_loan_disbursement(account: AccountAssets) -> float:
-    loan_disbursement_transactions = filter_account_transactions_by_category(
-        account, "LOAN_DISBURSEMENTS"
-    )
-    if len(loan_disbursement_transactions) == 0:
-        return 0.0
-    return sum(
-        [transaction.amount for transaction in loan_disbursement_transactions]
-    ) / len(loan_disbursement_transactions)
+    return get_account_category_summary(account, "LOAN_DISBURSEMENTS").average()
 
 
 """
@@ -100,7 +85,7 @@ def loan_disbursement_monthly_summary(account: AccountAssets) -> Dict[str, float
     loan_disbursement_transactions = filter_account_transactions_by_category(
         account, "LOAN_DISBURSEMENTS"
     )
-    return calculate_monthly_summary_of_transactions(loan_disbursement_transactions)
+    return net_monthly_summary(loan_disbursement_transactions)
 
 
 """
@@ -112,12 +97,9 @@ loan disbursement
 
 
 def days_since_loan_disbursement(account: AccountAssets) -> int:
-    most_recent_loan_disbursement = get_most_recent_transaction(
-        filter_account_transactions_by_category(account, "LOAN_DISBURSEMENTS")
-    )
-    if not most_recent_loan_disbursement:
-        return 0
-    return (date.today() - most_recent_loan_disbursement.date).days
+    return get_account_category_summary(
+        account, "LOAN_DISBURSEMENTS"
+    ).days_since_most_recent()
 
 
 """
@@ -129,7 +111,7 @@ across the users accounts
 
 
 def count_loan_payments(account: AccountAssets) -> int:
-    return len(filter_account_transactions_by_category(account, "LOAN_PAYMENTS"))
+    return get_account_category_summary(account, "LOAN_PAYMENTS").count
 
 
 """
@@ -141,10 +123,7 @@ across the users accounts
 
 
 def amount_loan_payments(account: AccountAssets) -> float:
-    loan_payment_transactions = filter_account_transactions_by_category(
-        account, "LOAN_PAYMENTS"
-    )
-    return sum([transaction.amount for transaction in loan_payment_transactions])
+    return get_account_category_summary(account, "LOAN_PAYMENTS").total
 
 
 """
@@ -156,12 +135,10 @@ across the users accounts
 
 
 def max_loan_payments(account: AccountAssets) -> float:
-    loan_payment_transactions = filter_account_transactions_by_category(
-        account, "LOAN_PAYMENTS"
-    )
-    if len(loan_payment_transactions) == 0:
+    loan_payments = get_account_category_summary(account, "LOAN_PAYMENTS")
+    if loan_payments.count == 0:
         return 0.0
-    return max([transaction.amount for transaction in loan_payment_transactions])
+    return loan_payments.max
 
 
 """
@@ -173,12 +150,10 @@ across the users accounts
 
 
 def min_loan_payments(account: AccountAssets) -> float:
-    loan_payment_transactions = filter_account_transactions_by_category(
-        account, "LOAN_PAYMENTS"
-    )
-    if len(loan_payment_transactions) == 0:
+    loan_payments = get_account_category_summary(account, "LOAN_PAYMENTS")
+    if loan_payments.count == 0:
         return 0.0
-    return min([transaction.amount for transaction in loan_payment_transactions])
+    return loan_payments.min
 
 
 """
@@ -190,14 +165,7 @@ across the users accounts
 
 
 def avg_loan_payment(account: AccountAssets) -> float:
-    loan_payment_transactions = filter_account_transactions_by_category(
-        account, "LOAN_PAYMENTS"
-    )
-    if len(loan_payment_transactions) == 0:
-        return 0.0
-    return sum([transaction.amount for transaction in loan_payment_transactions]) / len(
-        loan_payment_transactions
-    )
+    return get_account_category_summary(account, "LOAN_PAYMENTS").average()
 
 
 """
@@ -212,7 +180,7 @@ def loan_payment_monthly_summary(account: AccountAssets) -> Dict[str, float]:
     loan_payment_transactions = filter_account_transactions_by_category(
         account, "LOAN_PAYMENTS"
     )
-    return calculate_monthly_summary_of_transactions(loan_payment_transactions)
+    return net_monthly_summary(loan_payment_transactions)
 
 
 """
@@ -224,9 +192,6 @@ loan_payment
 
 
 def days_since_loan_payment(account: AccountAssets) -> int:
-    most_recent_loan_payment = get_most_recent_transaction(
-        filter_account_transactions_by_category(account, "LOAN_PAYMENTS")
-    )
-    if not most_recent_loan_payment:
-        return 0
-    return (date.today() - most_recent_loan_payment.date).days
+    return get_account_category_summary(
+        account, "LOAN_PAYMENTS"
+    ).days_since_most_recent()
@@ -0,0 +1,285 @@
+from typing import Dict, Tuple
+
+import numpy as np
+
+from frame import (
+    TransactionFrame,
+    avg_or_zero,
+    max_or_zero,
+    min_or_zero,
+    monthly_summary_of_columns,
+    days_since_most_recent_date,
+)
+
+"""
+Vectorized account level attributes
+----------------------
+Every function in this file is a vectorized version of the function with the same
+name in the account level attribute files. Instead of an AccountAssets, each takes
+in a TransactionFrame built with frame.build_transaction_frame and the index of the
+account in the frame (see TransactionFrame.account_index). Values match the
+original functions up to floating point rounding.
+"""
+
+
+def _transactions(
+    frame: TransactionFrame, account_index: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    transactions = frame.transaction_slice(account_index)
+    return frame.amounts[transactions], frame.dates[transactions]
+
+
+def _category_transactions(
+    frame: TransactionFrame, account_index: int, primary_category: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    transactions = frame.transaction_slice(account_index)
+    code = frame.primary_code(primary_category)
+    if code == -1:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype="datetime64[D]")
+    mask = frame.primary_codes[transactions] == code
+    return frame.amounts[transactions][mask], frame.dates[transactions][mask]
+
+
+def _balances(frame: TransactionFrame, account_index: int) -> np.ndarray:
+    return frame.balance_amounts[frame.balance_slice(account_index)]
+
+
+"""
+Cash Flow
+----------------------
+vectorized versions of the attributes in cash_flow.py
+"""
+
+
+def num_inflows(frame: TransactionFrame, account_index: int) -> int:
+    amounts, _ = _transactions(frame, account_index)
+    return int(np.count_nonzero(amounts < 0))
+
+
+def total_inflows_amount(frame: TransactionFrame, account_index: int) -> float:
+    amounts, _ = _transactions(frame, account_index)
+    return float(amounts[amounts < 0].sum())
+
+
+def inflows_monthly_summary(
+    frame: TransactionFrame, account_index: int
+) -> Dict[str, float]:
+    amounts, dates = _transactions(frame, account_index)
+    inflows = amounts < 0
+    return monthly_summary_of_columns(dates[inflows], amounts[inflows])
+
+
+def num_outflows(frame: TransactionFrame, account_index: int) -> int:
+    amounts, _ = _transactions(frame, account_index)
+    return int(np.count_nonzero(amounts > 0))
+
+
+def total_outflows_amount(frame: TransactionFrame, account_index: int) -> float:
+    amounts, _ = _transactions(frame, account_index)
+    return float(amounts[amounts > 0].sum())
+
+
+def outflows_monthly_summary(
+    frame: TransactionFrame, account_index: int
+) -> Dict[str, float]:
+    amounts, dates = _transactions(frame, account_index)
+    outflows = amounts > 0
+    return monthly_summary_of_columns(dates[outflows], amounts[outflows])
+
+
+def num_transactions(frame: TransactionFrame, account_index: int) -> int:
+    amounts, _ = _transactions(frame, account_index)
+    return len(amounts)
+
+
+def net_cash_flow(frame: TransactionFrame, account_index: int) -> float:
+    amounts, _ = _transactions(frame, account_index)
+    return float(amounts.sum())
+
+
+def monthly_cash_flow(frame: TransactionFrame, account_index: int) -> Dict[str, float]:
+    amounts, dates = _transactions(frame, account_index)
+    return monthly_summary_of_columns(dates, amounts)
+
+
+"""
+Debt Insights
+----------------------
+vectorized versions of the attributes in debt_insights.py
+"""
+
+
+def count_loan_disbursements(frame: TransactionFrame, account_index: int) -> int:
+    amounts, _ = _category_transactions(frame, account_index, "LOAN_DISBURSEMENTS")
+    return len(amounts)
+
+
+def amount_loan_disbursements(frame: TransactionFrame, account_index: int) -> float:
+    amounts, _ = _category_transactions(frame, account_index, "LOAN_DISBURSEMENTS")
+    return float(amounts.sum())
+
+
+def max_loan_disbursements(frame: TransactionFrame, account_index: int) -> float:
+    amounts, _ = _category_transactions(frame, account_index, "LOAN_DISBURSEMENTS")
+    return max_or_zero(amounts)
+
+
+def min_loan_disbursements(frame: TransactionFrame, account_index: int) -> float:
+    amounts, _ = _category_transactions(frame, account_index, "LOAN_DISBURSEMENTS")
+    return min_or_zero(amounts)
+
+
+def avg_loan_disbursement(frame: TransactionFrame, account_index: int) -> float:
+    amounts, _ = _category_transactions(frame, account_index, "LOAN_DISBURSEMENTS")
+    return avg_or_zero(amounts)
+
+
+def loan_disbursement_monthly_summary(
+    frame: TransactionFrame, account_index: int
+) -> Dict[str, float]:
+    amounts, dates = _category_transactions(
+        frame, account_index, "LOAN_DISBURSEMENTS"
+    )
+    return monthly_summary_of_columns(dates, amounts)
+
+
+def days_since_loan_disbursement(frame: TransactionFrame, account_index: int) -> int:
+    _, dates = _category_transactions(frame, account_index, "LOAN_DISBURSEMENTS")
+    return days_since_most_recent_date(dates)
+
+
+def count_loan_payments(frame: TransactionFrame, account_index: int) -> int:
+    amounts, _ = _category_transactions(frame, account_index, "LOAN_PAYMENTS")
+    return len(amounts)
+
+
+def amount_loan_payments(frame: TransactionFrame, account_index: int) -> float:
+    amounts, _ = _category_transactions(frame, account_index, "LOAN_PAYMENTS")
+    return float(amounts.sum())
+
+
+def max_loan_payments(frame: TransactionFrame, account_index: int) -> float:
+    amounts, _ = _category_transactions(frame, account_index, "LOAN_PAYMENTS")
+    return max_or_zero(amounts)
+
+
+def min_loan_payments(frame: TransactionFrame, account_index: int) -> float:
+    amounts, _ = _category_transactions(frame, account_index, "LOAN_PAYMENTS")
+    return min_or_zero(amounts)
+
+
+def avg_loan_payment(frame: TransactionFrame, account_index: int) -> float:
+    amounts, _ = _category_transactions(frame, account_index, "LOAN_PAYMENTS")
+    return avg_or_zero(amounts)
+
+
+def loan_payment_monthly_summary(
+    frame: TransactionFrame, account_index: int
+) -> Dict[str, float]:
+    amounts, dates = _category_transactions(frame, account_index, "LOAN_PAYMENTS")
+    return monthly_summary_of_columns(dates, amounts)
+
+
+def days_since_loan_payment(frame: TransactionFrame, account_index: int) -> int:
+    _, dates = _category_transactions(frame, account_index, "LOAN_PAYMENTS")
+    return days_since_most_recent_date(dates)
+
+
+"""
+Historical Balances
+----------------------
+vectorized versions of the attributes in historical_balances.py
+"""
+
+
+def avg_historical_balance(frame: TransactionFrame, account_index: int) -> float:
+    balances = _balances(frame, account_index)
+    if len(balances) == 0:
+        raise ZeroDivisionError("account has no historical balances")
+    return float(balances.mean())
+
+
+def min_historical_balance(frame: TransactionFrame, account_index: int) -> float:
+    return float(_balances(frame, account_index).min())
+
+
+def max_historical_balance(frame: TransactionFrame, account_index: int) -> float:
+    return float(_balances(frame, account_index).max())
+
+
+"""
+Negative Records
+----------------------
+vectorized versions of the attributes in negative_record.py
+"""
+
+
+def count_negative_historical_balances(
+    frame: TransactionFrame, account_index: int
+) -> int:
+    return int(np.count_nonzero(_balances(frame, account_index) < 0))
+
+
+def lowest_negative_historical_balance(
+    frame: TransactionFrame, account_index: int
+) -> float:
+    balances = _balances(frame, account_index)
+    return min(min_or_zero(balances), 0.0)
+
+
+def average_negative_historical_balance(
+    frame: TransactionFrame, account_index: int
+) -> float:
+    balances = _balances(frame, account_index)
+    return avg_or_zero(balances[balances < 0])
+
+
+def count_od_nsf(frame: TransactionFrame, account_index: int) -> int:
+    amounts, _ = _category_transactions(frame, account_index, "BANK_PENALTIES")
+    return len(amounts)
+
+
+def amount_od_nsf(frame: TransactionFrame, account_index: int) -> float:
+    amounts, _ = _category_transactions(frame, account_index, "BANK_PENALTIES")
+    return float(amounts.sum())
+
+
+def max_od_nsf(frame: TransactionFrame, account_index: int) -> float:
+    amounts, _ = _category_transactions(frame, account_index, "BANK_PENALTIES")
+    return max_or_zero(amounts)
+
+
+def min_od_nsf(frame: TransactionFrame, account_index: int) -> float:
+    amounts, _ = _category_transactions(frame, account_index, "BANK_PENALTIES")
+    return min_or_zero(amounts)
+
+
+def avg_od_nsf(frame: TransactionFrame, account_index: int) -> float:
+    amounts, _ = _category_transactions(frame, account_index, "BANK_PENALTIES")
+    return avg_or_zero(amounts)
+
+
+def od_nsf_monthly_summary(
+    frame: TransactionFrame, account_index: int
+) -> Dict[str, float]:
+    amounts, dates = _category_transactions(frame, account_index, "BANK_PENALTIES")
+    return monthly_summary_of_columns(dates, amounts)
+
+
+def days_since_od_nsf(frame: TransactionFrame, account_index: int) -> int:
+    _, dates = _category_transactions(frame, account_index, "BANK_PENALTIES")
+    return days_since_most_recent_date(dates)
+
+
+"""
+Unusual Account Activity
+----------------------
+vectorized versions of the attributes in unusual_account_activity.py
+"""
+
+
+def num_outlier_transactions(
+    frame: TransactionFrame, account_index: int, outlier_threshold: float = 10000.00
+) -> int:
+    amounts, _ = _transactions(frame, account_index)
+    return int(np.count_nonzero(np.abs(amounts) > outlier_threshold))
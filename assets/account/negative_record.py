@@ -1,11 +1,12 @@
 from plaid.model.account_assets import AccountAssets
+from datetime import date
 from typing import Dict
-from datetime import datetime
+from balances import get_account_dense_balances, negative_balance_attributes
+from months import net_monthly_summary
 from utils import (
     calculate_user_historical_balances,
     filter_account_transactions_by_category,
-    calculate_monthly_summary_of_transactions,
-    get_most_recent_transaction,
+    get_account_category_summary,
 )
 
 """
@@ -62,6 +63,92 @@ def average_negative_historical_balance(account: AccountAssets) -> float:
     return total_negative_historical_balance / num_negative_historical_balance
 
 
+"""
+Longest Negative Balance Streak
+----------------------
+longest_negative_balance_streak returns the largest number of consecutive days on
+which the user had a negative daily ending balance in the given account. A day without
+a balance ends the streak, unless gap_policy fills it in (see balances.py)
+"""
+
+
+def longest_negative_balance_streak(
+    account: AccountAssets, gap_policy: str = "skip", as_of: date = None
+) -> int:
+    return negative_balance_run_attributes(account, gap_policy, as_of)[
+        "longest_negative_balance_streak"
+    ]
+
+
+"""
+Number of Negative Balance Episodes
+----------------------
+num_negative_balance_episodes returns the number of distinct streaks of consecutive
+days on which the user had a negative daily ending balance in the given account
+"""
+
+
+def num_negative_balance_episodes(
+    account: AccountAssets, gap_policy: str = "skip", as_of: date = None
+) -> int:
+    return negative_balance_run_attributes(account, gap_policy, as_of)[
+        "num_negative_balance_episodes"
+    ]
+
+
+"""
+Days Since Most Recent Negative Balance
+----------------------
+days_since_negative_balance returns the number of days since the user last had a
+negative daily ending balance in the given account, counted to as_of (today by
+default). If the user doesn't have a negative balance, then this value will be 0
+"""
+
+
+def days_since_negative_balance(
+    account: AccountAssets, gap_policy: str = "skip", as_of: date = None
+) -> int:
+    return negative_balance_run_attributes(account, gap_policy, as_of)[
+        "days_since_negative_balance"
+    ]
+
+
+"""
+Average Negative Balance Episode Depth
+----------------------
+average_negative_episode_depth returns the average over every streak of negative
+balances in the given account of the lowest balance in the streak. If the user doesn't
+have a negative balance, then this value will be 0.0
+"""
+
+
+def average_negative_episode_depth(
+    account: AccountAssets, gap_policy: str = "skip", as_of: date = None
+) -> float:
+    return negative_balance_run_attributes(account, gap_policy, as_of)[
+        "average_negative_episode_depth"
+    ]
+
+
+"""
+Negative Balance Run Attributes
+----------------------
+negative_balance_run_attributes returns the count, lowest and average negative balance
+and the four streak attributes above, computed together in one vectorized pass over
+the daily balances of the account. The result is kept with the daily balances, so the
+functions above share one pass for the same gap_policy and as_of. To read several
+attributes, call this function once
+"""
+
+
+def negative_balance_run_attributes(
+    account: AccountAssets, gap_policy: str = "skip", as_of: date = None
+) -> Dict[str, float]:
+    return negative_balance_attributes(
+        get_account_dense_balances(account), gap_policy, as_of
+    )
+
+
 """
 Count of Overdraft/NSF
 ----------------------
@@ -71,7 +158,7 @@ in the users account
 
 
 def count_od_nsf(account: AccountAssets) -> int:
-    return len(filter_account_transactions_by_category(account, "BANK_PENALTIES"))
+    return get_account_category_summary(account, "BANK_PENALTIES").count
 
 
 """
@@ -83,10 +170,7 @@ in the users account
 
 
 def amount_od_nsf(account: AccountAssets) -> float:
-    od_nsf_transactions = filter_account_transactions_by_category(
-        account, "BANK_PENALTIES"
-    )
-    return sum([transaction.amount for transaction in od_nsf_transactions])
+    return get_account_category_summary(account, "BANK_PENALTIES").total
 
 
 """
@@ -98,12 +182,10 @@ in the users account
 
 
 def max_od_nsf(account: AccountAssets) -> float:
-    od_nsf_transactions = filter_account_transactions_by_category(
-        account, "BANK_PENALTIES"
-    )
-    if len(od_nsf_transactions) == 0:
+    od_nsf = get_account_category_summary(account, "BANK_PENALTIES")
+    if od_nsf.count == 0:
         return 0.0
-    return max([transaction.amount for transaction in od_nsf_transactions])
+    return od_nsf.max
 
 
 """
@@ -115,12 +197,10 @@ in the users account
 
 
 def min_od_nsf(account: AccountAssets) -> float:
-    od_nsf_transactions = filter_account_transactions_by_category(
-        account, "BANK_PENALTIES"
-    )
-    if len(od_nsf_transactions) == 0:
+    od_nsf = get_account_category_summary(account, "BANK_PENALTIES")
+    if od_nsf.count == 0:
         return 0.0
-    return min([transaction.amount for transaction in od_nsf_transactions])
+    return od_nsf.min
 
 
 """
@@ -132,14 +212,7 @@ in the users account
 
 
 def avg_od_nsf(account: AccountAssets) -> float:
-    od_nsf_transactions = filter_account_transactions_by_category(
-        account, "BANK_PENALTIES"
-    )
-    if len(od_nsf_transactions) == 0:
-        return 0.0
-    return sum([transaction.amount for transaction in od_nsf_transactions]) / len(
-        od_nsf_transactions
-    )
+    return get_account_category_summary(account, "BANK_PENALTIES").average()
 
 
 """
@@ -154,7 +227,7 @@ def od_nsf_monthly_summary(account: AccountAssets) -> Dict[str, float]:
     od_nsf_transactions = filter_account_transactions_by_category(
         account, "BANK_PENALTIES"
     )
-    return calculate_monthly_summary_of_transactions(od_nsf_transactions)
+    return net_monthly_summary(od_nsf_transactions)
 
 
 """
@@ -166,11 +239,6 @@ nsf
 
 
 def days_since_od_nsf(account: AccountAssets) -> int:
-    most_recent_od_nsf = get_most_recent_transaction(
-        filter_account_transactions_by_category(account, "BANK_PENALTIES")
-    )
-    if not most_recent_od_nsf:
-        return 0
-    return (
-        datetime.now() - datetime.strptime(most_recent_od_nsf.date, "%Y-%m-%d")
-    ).days
+    return get_account_category_summary(
+        account, "BANK_PENALTIES"
+    ).days_since_most_recent()
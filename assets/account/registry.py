@@ -0,0 +1,104 @@
+from typing import Any, Dict, List
+from plaid.model.account_assets import AccountAssets
+from plaid.model.asset_report_transaction import AssetReportTransaction
+from attribute_graph import AttributeRegistry
+from attribute_registry import register_reductions
+from attributes import TRANSACTION_ATTRIBUTES, BALANCE_ATTRIBUTES
+from utils import filter_account_transactions_by_category
+
+"""
+ACCOUNT_REGISTRY declares every account level attribute as a reduction of shared
+intermediates: the inflow and outflow partitions of the account's transactions, its
+loan disbursement, loan payment and OD/NSF transactions, and its daily balances.
+evaluate_account_attributes only computes the intermediates that the requested
+attributes read, each once per account.
+"""
+
+ACCOUNT_REGISTRY = AttributeRegistry(parameters={"outlier_threshold": 10000.00})
+
+
+@ACCOUNT_REGISTRY.intermediate("transactions", "source")
+def _transactions(account: AccountAssets) -> List[AssetReportTransaction]:
+    return account.transactions
+
+
+@ACCOUNT_REGISTRY.intermediate("inflows", "transactions")
+def _inflows(
+    transactions: List[AssetReportTransaction],
+) -> List[AssetReportTransaction]:
+    return [transaction for transaction in transactions if transaction.amount < 0]
+
+
+@ACCOUNT_REGISTRY.intermediate("outflows", "transactions")
+def _outflows(
+    transactions: List[AssetReportTransaction],
+) -> List[AssetReportTransaction]:
+    return [transaction for transaction in transactions if transaction.amount > 0]
+
+
+@ACCOUNT_REGISTRY.intermediate("LOAN_DISBURSEMENTS", "source")
+def _loan_disbursements(account: AccountAssets) -> List[AssetReportTransaction]:
+    return filter_account_transactions_by_category(account, "LOAN_DISBURSEMENTS")
+
+
+@ACCOUNT_REGISTRY.intermediate("LOAN_PAYMENTS", "source")
+def _loan_payments(account: AccountAssets) -> List[AssetReportTransaction]:
+    return filter_account_transactions_by_category(account, "LOAN_PAYMENTS")
+
+
+@ACCOUNT_REGISTRY.intermediate("BANK_PENALTIES", "source")
+def _od_nsf(account: AccountAssets) -> List[AssetReportTransaction]:
+    return filter_account_transactions_by_category(account, "BANK_PENALTIES")
+
+
+@ACCOUNT_REGISTRY.intermediate("balances", "source")
+def _balances(account: AccountAssets) -> List[float]:
+    return [balance.current for balance in account.historical_balances]
+
+
+@ACCOUNT_REGISTRY.intermediate("negative_balances", "balances")
+def _negative_balances(balances: List[float]) -> List[float]:
+    return [balance for balance in balances if balance < 0]
+
+
+register_reductions(ACCOUNT_REGISTRY, TRANSACTION_ATTRIBUTES, BALANCE_ATTRIBUTES)
+
+
+@ACCOUNT_REGISTRY.attribute(
+    "num_outlier_transactions", "transactions", "outlier_threshold"
+)
+def _num_outlier_transactions(
+    transactions: List[AssetReportTransaction], outlier_threshold: float
+) -> int:
+    return len(
+        [
+            transaction
+            for transaction in transactions
+            if abs(transaction.amount) > outlier_threshold
+        ]
+    )
+
+
+"""
+evaluate_account_attributes computes the requested account attributes through
+ACCOUNT_REGISTRY, computing every shared intermediate once
+
+Params
+* account: one of the accounts retrieved through /asset_report/get
+* attributes: the names of the attributes to compute. Defaults to every registered
+    account attribute
+* outlier_threshold: the threshold used by num_outlier_transactions
+
+Returns
+* A map of attribute name to its value
+"""
+
+
+def evaluate_account_attributes(
+    account: AccountAssets,
+    attributes: List[str] = None,
+    outlier_threshold: float = 10000.00,
+) -> Dict[str, Any]:
+    return ACCOUNT_REGISTRY.evaluate(
+        account, attributes, outlier_threshold=outlier_threshold
+    )
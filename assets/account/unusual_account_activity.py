@@ -1,5 +1,13 @@
+from typing import Dict, List, Union
+
 from plaid.model.account_assets import AccountAssets
 from utils import calculate_user_historical_balances
+from outliers import (
+    OUTLIER_THRESHOLDS,
+    Z_SCORE_THRESHOLD,
+    MAD_THRESHOLD,
+    build_account_outlier_index,
+)
 
 """
 Number of Outlier Transactions
@@ -17,3 +25,70 @@ def num_outlier_transactions(
         if abs(transaction.amount) > outlier_threshold:
             count += 1
     return count
+
+
+"""
+Number of Outlier Transactions by Threshold
+----------------------
+num_outlier_transactions_by_threshold returns the number of transactions in the given
+account that are larger than each of the outlier_thresholds. The absolute amounts are
+sorted once, so every threshold is a binary search instead of another scan of the
+transactions.
+"""
+
+
+def num_outlier_transactions_by_threshold(
+    account: AccountAssets, outlier_thresholds: List[float] = OUTLIER_THRESHOLDS
+) -> Dict[float, int]:
+    return build_account_outlier_index(account).counts_above(outlier_thresholds)
+
+
+"""
+Number of Z-Score Outlier Transactions
+----------------------
+num_z_score_outlier_transactions returns the number of transactions in the given
+account whose absolute amount is more than z_threshold standard deviations above the
+mean absolute amount of the account. Default of 3 standard deviations.
+"""
+
+
+def num_z_score_outlier_transactions(
+    account: AccountAssets, z_threshold: float = Z_SCORE_THRESHOLD
+) -> int:
+    return build_account_outlier_index(account).count_z_score_outliers(z_threshold)
+
+
+"""
+Number of MAD Outlier Transactions
+----------------------
+num_mad_outlier_transactions returns the number of transactions in the given account
+whose absolute amount has a modified z-score, 0.6745 * (amount - median) / MAD, above
+mad_threshold. The median and the median absolute deviation (MAD) are not pulled up by
+the outliers themselves, unlike the mean and standard deviation. Default of 3.5.
+"""
+
+
+def num_mad_outlier_transactions(
+    account: AccountAssets, mad_threshold: float = MAD_THRESHOLD
+) -> int:
+    return build_account_outlier_index(account).count_mad_outliers(mad_threshold)
+
+
+"""
+Outlier Transaction Counts
+----------------------
+outlier_transaction_counts returns num_outlier_transactions_by_threshold,
+num_z_score_outlier_transactions and num_mad_outlier_transactions of the given account
+from a single sort of its transactions, keyed by those names.
+"""
+
+
+def outlier_transaction_counts(
+    account: AccountAssets,
+    outlier_thresholds: List[float] = OUTLIER_THRESHOLDS,
+    z_threshold: float = Z_SCORE_THRESHOLD,
+    mad_threshold: float = MAD_THRESHOLD,
+) -> Dict[str, Union[int, Dict[float, int]]]:
+    return build_account_outlier_index(account).counts(
+        outlier_thresholds, z_threshold, mad_threshold
+    )
@@ -0,0 +1,91 @@
+from typing import Any, Callable, Dict, List
+
+# bank_income/registry.py loads this file from its path, so it only imports the
+# standard library
+
+"""
+AttributeRegistry records how every attribute is computed as a small dependency
+graph. Intermediates are named values computed from other named values, and attributes
+are reductions of intermediates. Every function declares the names of its inputs.
+
+plan() takes a set of requested attributes and returns the intermediates they need in
+dependency order, and evaluate() runs that plan, computing each intermediate exactly
+once and then every requested attribute from the shared intermediates.
+
+The value named "source" is the report or account being scored. Parameters are named
+values too, with defaults given to the registry and overridden per call to evaluate()
+
+Params
+* parameters: the default value of every parameter the registered functions can read
+"""
+
+
+class AttributeRegistry:
+    def __init__(self, parameters: Dict[str, Any] = None):
+        self.parameters = dict(parameters or {})
+        self.intermediates = {}
+        self.attributes = {}
+
+    def intermediate(self, name: str, *inputs: str) -> Callable:
+        def register(function: Callable) -> Callable:
+            self.intermediates[name] = (function, inputs)
+            return function
+
+        return register
+
+    def attribute(self, name: str, *inputs: str) -> Callable:
+        def register(function: Callable) -> Callable:
+            self.attributes[name] = (function, inputs)
+            return function
+
+        return register
+
+    def plan(self, attributes: List[str]) -> List[str]:
+        unknown_attributes = set(attributes) - set(self.attributes)
+        if unknown_attributes:
+            raise ValueError(f"unknown attributes {sorted(unknown_attributes)}")
+
+        order = []
+        visiting = set()
+
+        def visit(name: str) -> None:
+            if name in order or name == "source" or name in self.parameters:
+                return
+            if name not in self.intermediates:
+                raise ValueError(f"unknown input {name}")
+            if name in visiting:
+                raise ValueError(f"circular dependency on {name}")
+            visiting.add(name)
+            for input_name in self.intermediates[name][1]:
+                visit(input_name)
+            visiting.discard(name)
+            order.append(name)
+
+        for attribute in attributes:
+            for input_name in self.attributes[attribute][1]:
+                visit(input_name)
+        return order
+
+    def evaluate(
+        self, source: Any, attributes: List[str] = None, **parameters: Any
+    ) -> Dict[str, Any]:
+        if attributes is None:
+            attributes = list(self.attributes)
+        unknown_parameters = set(parameters) - set(self.parameters)
+        if unknown_parameters:
+            raise ValueError(f"unknown parameters {sorted(unknown_parameters)}")
+
+        values = dict(self.parameters)
+        values.update(parameters)
+        values["source"] = source
+        for name in self.plan(attributes):
+            function, inputs = self.intermediates[name]
+            values[name] = function(*[values[input_name] for input_name in inputs])
+
+        results = {}
+        for attribute in attributes:
+            function, inputs = self.attributes[attribute]
+            results[attribute] = function(
+                *[values[input_name] for input_name in inputs]
+            )
+        return results
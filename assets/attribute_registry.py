@@ -0,0 +1,89 @@
+from typing import Any, Dict, List
+from datetime import date
+
+from attribute_graph import AttributeRegistry
+from utils import (
+    calculate_monthly_summary_of_transactions,
+    get_most_recent_transaction,
+)
+
+
+def _total(transactions: List[Any]) -> float:
+    return sum([transaction.amount for transaction in transactions])
+
+
+def _max(transactions: List[Any]) -> float:
+    if len(transactions) == 0:
+        return 0.0
+    return max([transaction.amount for transaction in transactions])
+
+
+def _min(transactions: List[Any]) -> float:
+    if len(transactions) == 0:
+        return 0.0
+    return min([transaction.amount for transaction in transactions])
+
+
+def _average(transactions: List[Any]) -> float:
+    if len(transactions) == 0:
+        return 0.0
+    return _total(transactions) / len(transactions)
+
+
+def _days_since(transactions: List[Any]) -> int:
+    most_recent_transaction = get_most_recent_transaction(transactions)
+    if not most_recent_transaction:
+        return 0
+    return (date.today() - most_recent_transaction.date).days
+
+
+def _average_negative(negative_balances: List[float]) -> float:
+    if len(negative_balances) == 0:
+        return 0.0
+    return sum(negative_balances) / len(negative_balances)
+
+
+# Reductions of a list of transactions, by the statistic names used in the
+# TRANSACTION_ATTRIBUTES tables of the account and report attribute files
+TRANSACTION_REDUCTIONS = {
+    "count": len,
+    "total": _total,
+    "max": _max,
+    "min": _min,
+    "average": _average,
+    "monthly": calculate_monthly_summary_of_transactions,
+    "days_since": _days_since,
+}
+
+# Reductions of the daily balances ("balances") or of the negative daily balances
+# ("negative_balances"), by the statistic names used in the BALANCE_ATTRIBUTES tables
+BALANCE_REDUCTIONS = {
+    "average": ("balances", lambda balances: sum(balances) / len(balances)),
+    "min": ("balances", min),
+    "max": ("balances", max),
+    "count_negative": ("negative_balances", len),
+    "lowest_negative": (
+        "negative_balances",
+        lambda balances: min(balances, default=0.0),
+    ),
+    "average_negative": ("negative_balances", _average_negative),
+}
+
+
+"""
+register_reductions registers every attribute of a TRANSACTION_ATTRIBUTES and a
+BALANCE_ATTRIBUTES table as a reduction of the intermediate named after its transaction
+group, or of the "balances" / "negative_balances" intermediates
+"""
+
+
+def register_reductions(
+    registry: AttributeRegistry,
+    transaction_attributes: Dict[str, tuple],
+    balance_attributes: Dict[str, str],
+) -> None:
+    for attribute, (group, statistic) in transaction_attributes.items():
+        registry.attribute(attribute, group)(TRANSACTION_REDUCTIONS[statistic])
+    for attribute, statistic in balance_attributes.items():
+        input_name, reduction = BALANCE_REDUCTIONS[statistic]
+        registry.attribute(attribute, input_name)(reduction)
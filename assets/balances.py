@@ -0,0 +1,321 @@
+from typing import Any, Dict, List
+from collections import OrderedDict
+from datetime import date
+import weakref
+
+import numpy as np
+
+from plaid.model.account_assets import AccountAssets
+from plaid.model.asset_report import AssetReport
+
+"""
+Dense balances
+----------------------
+DenseBalances lays the historical balances of a set of accounts out on a shared day
+axis: one float64 row per account and one column per day from the earliest to the
+latest balance of any account, with NaN on the days an account has no balance. The
+net balance of the user on every day is then a NumPy reduction over the rows, and every
+balance attribute a reduction of that one array.
+
+Accounts often cover different windows, e.g. an account opened halfway through the
+report. How the days an account has no balance are treated is an explicit gap policy:
+* "skip": an account without a balance on a day adds nothing to that day, and days
+    without any balance are left out. This is what calculate_user_historical_balances
+    does
+* "forward_fill": an account without a balance on a day between its first and last
+    balance keeps its last known balance. Days before an account's first balance and
+    after its last balance are still skipped, so an account that stopped reporting
+    (e.g. a closed account) is not carried to the end of the report
+* "zero": an account without a balance on a day has a balance of 0, and every day on
+    the axis is included
+
+coverage() reports the window and number of missing days of every account, so that
+differences in coverage can be checked rather than silently averaged over.
+"""
+
+GAP_POLICIES = ["skip", "forward_fill", "zero"]
+
+
+class DenseBalances:
+    def __init__(self, start_day: int, balances: np.ndarray, account_ids: List[str]):
+        # start_day is the proleptic Gregorian ordinal (date.toordinal) of column 0
+        self.start_day = start_day
+        self.balances = balances
+        self.account_ids = account_ids
+        # negative_balance_attributes results keyed by (gap_policy, as_of)
+        self.negative_attributes = {}
+
+    @property
+    def num_days(self) -> int:
+        return self.balances.shape[1]
+
+    def day(self, column: int) -> date:
+        return date.fromordinal(self.start_day + column)
+
+    def coverage(self) -> Dict[str, Dict[str, Any]]:
+        coverage = {}
+        observed = ~np.isnan(self.balances)
+        for row, account_id in enumerate(self.account_ids):
+            columns = np.flatnonzero(observed[row])
+            if len(columns) == 0:
+                coverage[account_id] = {
+                    "first_date": None,
+                    "last_date": None,
+                    "days": 0,
+                    "missing_days": 0,
+                }
+                continue
+            first, last = int(columns[0]), int(columns[-1])
+            coverage[account_id] = {
+                "first_date": self.day(first),
+                "last_date": self.day(last),
+                "days": len(columns),
+                "missing_days": last - first + 1 - len(columns),
+            }
+        return coverage
+
+    def filled(self, gap_policy: str = "skip") -> np.ndarray:
+        # The balances of every account after applying the gap policy, NaN where an
+        # account still has no balance
+        if gap_policy == "skip":
+            return self.balances
+        if gap_policy == "zero":
+            return np.nan_to_num(self.balances, nan=0.0)
+        if gap_policy == "forward_fill":
+            observed = ~np.isnan(self.balances)
+            columns = np.where(observed, np.arange(self.num_days), 0)
+            np.maximum.accumulate(columns, axis=1, out=columns)
+            rows = np.arange(len(self.account_ids))[:, None]
+            filled = self.balances[rows, columns]
+            # Days before the first and after the last balance of an account stay empty
+            filled[np.cumsum(observed, axis=1) == 0] = np.nan
+            filled[np.cumsum(observed[:, ::-1], axis=1)[:, ::-1] == 0] = np.nan
+            return filled
+        raise ValueError(f"unknown gap policy {gap_policy}")
+
+    def totals(self, gap_policy: str = "skip") -> np.ndarray:
+        # The net balance across every account for every day on the axis, NaN on the
+        # days the gap policy leaves out
+        filled = self.filled(gap_policy)
+        if filled.shape[0] == 0:
+            return np.full(self.num_days, np.nan)
+        totals = np.nansum(filled, axis=0)
+        totals[np.isnan(filled).all(axis=0)] = np.nan
+        return totals
+
+
+"""
+build_dense_balances lays the historical balances of the given accounts out on a shared
+day axis. Balances on the same date of the same account are added together, as in
+calculate_user_historical_balances
+
+Params
+* accounts: the accounts to include
+
+Returns
+* The DenseBalances of the accounts
+"""
+
+
+def build_dense_balances(accounts: List[AccountAssets]) -> DenseBalances:
+    account_ids = [account.account_id for account in accounts]
+    counts = []
+    days = []
+    amounts = []
+    for account in accounts:
+        historical_balances = account.historical_balances
+        counts.append(len(historical_balances))
+        days.extend([balance.date.toordinal() for balance in historical_balances])
+        amounts.extend([balance.current for balance in historical_balances])
+    if not days:
+        return DenseBalances(0, np.empty((len(accounts), 0)), account_ids)
+
+    rows = np.repeat(np.arange(len(accounts)), counts)
+    days = np.array(days, dtype=np.int64)
+    amounts = np.array(amounts, dtype=np.float64)
+    start_day = int(days.min())
+    columns = days - start_day
+    num_days = int(columns.max()) + 1
+    cells = rows * num_days + columns
+    size = len(accounts) * num_days
+    balances = np.bincount(cells, weights=amounts, minlength=size)
+    balances[np.bincount(cells, minlength=size) == 0] = np.nan
+    return DenseBalances(
+        start_day, balances.reshape(len(accounts), num_days), account_ids
+    )
+
+
+"""
+balance_attributes computes every historical balance attribute from an array of daily
+net balances, ignoring NaN days. The names match the functions in historical_balances.py
+and negative_record.py. As with those functions, the average, minimum and maximum
+balance are undefined without any balances and raise a ValueError, while the negative
+balance attributes are 0.0 (or 0)
+"""
+
+
+def balance_attributes(totals: np.ndarray) -> Dict[str, float]:
+    balances = totals[~np.isnan(totals)]
+    if len(balances) == 0:
+        raise ValueError("balance attributes require at least one historical balance")
+    negative_balances = balances[balances < 0]
+    return {
+        "avg_historical_balance": float(balances.mean()),
+        "min_historical_balance": float(balances.min()),
+        "max_historical_balance": float(balances.max()),
+        "count_negative_historical_balances": len(negative_balances),
+        "lowest_negative_historical_balance": (
+            float(negative_balances.min()) if len(negative_balances) else 0.0
+        ),
+        "average_negative_historical_balance": (
+            float(negative_balances.mean()) if len(negative_balances) else 0.0
+        ),
+    }
+
+
+"""
+negative_balance_attributes computes every negative balance attribute of a set of
+accounts from their daily net balances in one vectorized pass: the count, lowest and
+average negative balance of negative_record.py, and the runs of consecutive days with a
+negative balance (episodes). A day the gap policy leaves out ends an episode
+
+Params
+* dense_balances: the DenseBalances of the accounts
+* gap_policy: how days an account has no balance for are treated (see GAP_POLICIES)
+* as_of: the date days_since_negative_balance is counted to. Defaults to today
+
+Returns
+* count_negative_historical_balances, lowest_negative_historical_balance and
+    average_negative_historical_balance, counted per day
+* longest_negative_balance_streak: the length in days of the longest episode
+* num_negative_balance_episodes: the number of episodes
+* days_since_negative_balance: the number of days since the last negative balance, or
+    0 if there is none
+* average_negative_episode_depth: the average of the lowest balance of every episode,
+    or 0.0 if there is none
+"""
+
+
+def negative_balance_attributes(
+    dense_balances: DenseBalances, gap_policy: str = "skip", as_of: date = None
+) -> Dict[str, float]:
+    as_of = as_of or date.today()
+    # Computed once per gap policy and date, so that reading each attribute through
+    # its own function doesn't repeat the pass
+    key = (gap_policy, as_of)
+    if key not in dense_balances.negative_attributes:
+        dense_balances.negative_attributes[key] = _negative_balance_attributes(
+            dense_balances, gap_policy, as_of
+        )
+    return dict(dense_balances.negative_attributes[key])
+
+
+def _negative_balance_attributes(
+    dense_balances: DenseBalances, gap_policy: str, as_of: date
+) -> Dict[str, float]:
+    totals = dense_balances.totals(gap_policy)
+    # NaN days compare as not negative
+    negative = totals < 0
+    negative_balances = totals[negative]
+    # Episode i covers the days [starts[i], ends[i])
+    padded = np.concatenate(([False], negative, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    starts, ends = edges[::2], edges[1::2]
+    if len(starts) == 0:
+        return {
+            "count_negative_historical_balances": 0,
+            "lowest_negative_historical_balance": 0.0,
+            "average_negative_historical_balance": 0.0,
+            "longest_negative_balance_streak": 0,
+            "num_negative_balance_episodes": 0,
+            "days_since_negative_balance": 0,
+            "average_negative_episode_depth": 0.0,
+        }
+    # Each episode is a contiguous slice of totals, so the negative balances hold the
+    # episodes back to back and reduceat finds the lowest balance of each
+    lengths = ends - starts
+    depths = np.minimum.reduceat(
+        negative_balances, np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    )
+    last_negative_day = dense_balances.start_day + int(ends[-1]) - 1
+    return {
+        "count_negative_historical_balances": len(negative_balances),
+        "lowest_negative_historical_balance": float(negative_balances.min()),
+        "average_negative_historical_balance": float(negative_balances.mean()),
+        "longest_negative_balance_streak": int(lengths.max()),
+        "num_negative_balance_episodes": len(starts),
+        "days_since_negative_balance": as_of.toordinal() - last_negative_day,
+        "average_negative_episode_depth": float(depths.mean()),
+    }
+
+
+# Dense balances keyed by (asset_report_id, include_depository_only) and stored with a
+# weak reference to their report, so that the cache never keeps a report alive. The
+# least recently used entry is evicted once a table holds DENSE_BALANCES_CACHE_SIZE
+# entries.
+DENSE_BALANCES_CACHE_SIZE = 128
+_dense_balances = OrderedDict()
+# Dense balances of single accounts, keyed by account_id and stored with a weak
+# reference to their account
+_account_dense_balances = OrderedDict()
+
+
+"""
+get_report_dense_balances returns the DenseBalances of the accounts of a report,
+building them on the first call and reusing them for later calls on the same report
+
+Params
+* asset_report: the asset report retrieved through /asset_report/get
+* include_depository_only: whether to ignore all non-depository accounts
+"""
+
+
+def get_report_dense_balances(
+    asset_report: AssetReport, include_depository_only: bool = True
+) -> DenseBalances:
+    key = (asset_report.asset_report_id, include_depository_only)
+    entry = _dense_balances.get(key)
+    # An entry is only reused for the same report object, so a report with the same
+    # id from another refresh gets its own balances
+    if entry is None or entry[0]() is not asset_report:
+        accounts = [
+            account
+            for item in asset_report.items
+            for account in item.accounts
+            if not include_depository_only or str(account.type) == "depository"
+        ]
+        entry = (weakref.ref(asset_report), build_dense_balances(accounts))
+        _dense_balances[key] = entry
+        if len(_dense_balances) > DENSE_BALANCES_CACHE_SIZE:
+            _dense_balances.popitem(last=False)
+    _dense_balances.move_to_end(key)
+    return entry[1]
+
+
+"""
+get_account_dense_balances returns the DenseBalances of a single account, building them
+on the first call and reusing them for later calls on the same account
+"""
+
+
+def get_account_dense_balances(account: AccountAssets) -> DenseBalances:
+    entry = _account_dense_balances.get(account.account_id)
+    # An entry is only reused for the same account object, so an account with the same
+    # id from another refresh gets its own
+    if entry is None or entry[0]() is not account:
+        entry = (weakref.ref(account), build_dense_balances([account]))
+        _account_dense_balances[account.account_id] = entry
+        if len(_account_dense_balances) > DENSE_BALANCES_CACHE_SIZE:
+            _account_dense_balances.popitem(last=False)
+    _account_dense_balances.move_to_end(account.account_id)
+    return entry[1]
+
+
+"""
+clear_dense_balances drops every cached DenseBalances
+"""
+
+
+def clear_dense_balances() -> None:
+    _dense_balances.clear()
+    _account_dense_balances.clear()
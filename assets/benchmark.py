@@ -0,0 +1,247 @@
+import argparse
+import importlib.util
+import inspect
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from datetime import date
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from plaid.model.asset_report import AssetReport
+from balances import clear_dense_balances
+from months import clear_monthly_buckets
+from synthetic import SIZES, generate_asset_report
+from utils import clear_category_indexes, clear_historical_balances_cache
+from window_index import clear_window_indexes
+
+"""
+Benchmarks
+----------------------
+benchmark.py times every attribute function in the account and report level attribute
+files against synthetic asset reports of every size in synthetic.SIZES, and records how
+the time of each function grows with the number of transactions.
+
+Usage
+* python benchmark.py --output benchmarks.json
+* python benchmark.py --sizes tiny,small,medium --repeat 3 --functions od_nsf
+
+Account level functions are timed over every account in the report. Every memoized
+index and table in CACHE_CLEAR_HOOKS is cleared before every run, so each run pays for
+building them. The output records, for every function and size, the median and minimum
+seconds over the runs, and for every function the scaling exponent: the slope of log
+time against log transactions, which is close to 1 for a linear scan.
+"""
+
+# The attribute files that are benchmarked in both the account and report directories
+ATTRIBUTE_MODULES = [
+    "cash_flow",
+    "debt_insights",
+    "historical_balances",
+    "negative_record",
+    "unusual_account_activity",
+]
+
+ASSETS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+"""
+load_attribute_functions returns the public functions defined in the attribute files of
+a level, as (module, function name, function)
+
+Params
+* level: "account" or "report"
+"""
+
+
+def load_attribute_functions(level: str) -> List[Tuple[str, str, Callable]]:
+    functions = []
+    for module_name in ATTRIBUTE_MODULES:
+        path = os.path.join(ASSETS_DIRECTORY, level, f"{module_name}.py")
+        # The account and report files share names, so load each under its own name
+        spec = importlib.util.spec_from_file_location(f"{level}_{module_name}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        for name, function in inspect.getmembers(module, inspect.isfunction):
+            if function.__module__ == module.__name__ and not name.startswith("_"):
+                functions.append((module_name, name, function))
+    return functions
+
+
+def _clear_bank_income_source_indexes() -> None:
+    # bank_income/util.py keeps its own indexes, and is only loaded (as util) when bank
+    # income attributes were computed in this process
+    util = sys.modules.get("util")
+    if util is not None and hasattr(util, "clear_source_indexes"):
+        util.clear_source_indexes()
+
+
+# Every memoized cache an attribute function may fill, cleared before each timed run
+CACHE_CLEAR_HOOKS = [
+    clear_category_indexes,
+    clear_historical_balances_cache,
+    clear_dense_balances,
+    clear_window_indexes,
+    clear_monthly_buckets,
+    _clear_bank_income_source_indexes,
+]
+
+
+def _clear_caches() -> None:
+    for clear in CACHE_CLEAR_HOOKS:
+        clear()
+
+
+def _time_function(
+    level: str, function: Callable, asset_report: AssetReport, repeat: int
+) -> List[float]:
+    accounts = [account for item in asset_report.items for account in item.accounts]
+    timings = []
+    for _ in range(repeat):
+        _clear_caches()
+        start = time.perf_counter()
+        if level == "account":
+            for account in accounts:
+                function(account)
+        else:
+            function(asset_report)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _scaling_exponent(points: List[Tuple[int, float]]) -> float:
+    points = [(size, seconds) for size, seconds in points if seconds > 0]
+    if len(points) < 2:
+        return None
+    sizes = np.log([size for size, _ in points])
+    seconds = np.log([seconds for _, seconds in points])
+    return float(np.polyfit(sizes, seconds, 1)[0])
+
+
+"""
+run_benchmarks times every selected attribute function on a report of every size
+
+Params
+* sizes: the names of the report sizes to run, from synthetic.SIZES
+* repeat: the number of timed runs of every function on every report
+* seed: the seed of the synthetic reports
+* levels: the attribute levels to run, "account" and / or "report"
+* functions: if set, only functions whose name contains one of these strings are run
+
+Returns
+* A map with the rows of timings (level, module, function, size, num_transactions,
+    num_balances, median_seconds, min_seconds) and the scaling exponent of every
+    function
+"""
+
+
+def run_benchmarks(
+    sizes: List[str] = tuple(SIZES),
+    repeat: int = 5,
+    seed: int = 0,
+    levels: List[str] = ("account", "report"),
+    functions: List[str] = None,
+) -> Dict[str, Any]:
+    unknown_sizes = set(sizes) - set(SIZES)
+    if unknown_sizes:
+        raise ValueError(f"unknown sizes {sorted(unknown_sizes)}")
+
+    attribute_functions = {
+        level: [
+            entry
+            for entry in load_attribute_functions(level)
+            if not functions or any(pattern in entry[1] for pattern in functions)
+        ]
+        for level in levels
+    }
+    # A fixed end date keeps the reports identical from one day to the next
+    end_date = date(2024, 1, 1)
+    rows = []
+    for size in sizes:
+        asset_report = generate_asset_report(seed, end_date=end_date, **SIZES[size])
+        accounts = [account for item in asset_report.items for account in item.accounts]
+        num_transactions = sum(len(account.transactions) for account in accounts)
+        num_balances = sum(len(account.historical_balances) for account in accounts)
+        for level, entries in attribute_functions.items():
+            for module_name, name, function in entries:
+                timings = _time_function(level, function, asset_report, repeat)
+                rows.append(
+                    {
+                        "level": level,
+                        "module": module_name,
+                        "function": name,
+                        "size": size,
+                        "num_transactions": num_transactions,
+                        "num_balances": num_balances,
+                        "median_seconds": statistics.median(timings),
+                        "min_seconds": min(timings),
+                    }
+                )
+                print(_format_row(rows[-1]), file=sys.stderr)
+
+    curves = {}
+    for row in rows:
+        key = f"{row['level']}.{row['module']}.{row['function']}"
+        curves.setdefault(key, []).append(
+            (row["num_transactions"], row["median_seconds"])
+        )
+    return {
+        "seed": seed,
+        "repeat": repeat,
+        "rows": rows,
+        "scaling_exponents": {
+            key: _scaling_exponent(points) for key, points in curves.items()
+        },
+    }
+
+
+def _format_row(row: Dict[str, Any]) -> str:
+    per_transaction = row["median_seconds"] / max(row["num_transactions"], 1)
+    return (
+        f"{row['level']:<8} {row['module'] + '.' + row['function']:<60} "
+        f"{row['size']:<7} {row['num_transactions']:>7} transactions "
+        f"{row['median_seconds'] * 1000:>10.3f} ms "
+        f"({per_transaction * 1e6:.3f} us/transaction)"
+    )
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Time every attribute function against synthetic asset reports"
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(SIZES),
+        help=f"comma separated report sizes (default: {','.join(SIZES)})",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--levels", default="account,report")
+    parser.add_argument(
+        "--functions",
+        help="comma separated substrings of the function names to run (default: all)",
+    )
+    parser.add_argument("--output", help="the JSON file to write the results to")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        sizes=args.sizes.split(","),
+        repeat=args.repeat,
+        seed=args.seed,
+        levels=args.levels.split(","),
+        functions=args.functions.split(",") if args.functions else None,
+    )
+    for key, exponent in sorted(results["scaling_exponents"].items()):
+        if exponent is not None and not math.isnan(exponent):
+            print(f"{key:<70} scales as n^{exponent:.2f}", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+from typing import Dict, List, Tuple
+from collections import defaultdict
+from datetime import date
+
+import numpy as np
+
+from plaid.model.asset_report import AssetReport
+
+
+"""
+TransactionFrame holds every transaction and historical balance of an asset report
+in flat columns, so that attributes can be computed with vectorized NumPy operations
+instead of reading attributes off each plaid model object
+
+Columns
+* amounts / dates: float64 amount and datetime64[D] date of every transaction
+* primary_codes / detailed_codes: the credit category of every transaction, coded as an
+    index into primary_categories / detailed_categories (-1 if it has none)
+* account_offsets: the transactions of account i are [account_offsets[i], account_offsets[i + 1])
+* item_offsets: the accounts of item j are [item_offsets[j], item_offsets[j + 1])
+* balance_amounts / balance_dates / balance_offsets: the historical balances of every
+    account, laid out like the transactions
+* account_ids / account_types: the id and type of every account
+"""
+
+
+class TransactionFrame:
+    def __init__(
+        self,
+        amounts: np.ndarray,
+        dates: np.ndarray,
+        primary_codes: np.ndarray,
+        detailed_codes: np.ndarray,
+        account_offsets: np.ndarray,
+        item_offsets: np.ndarray,
+        balance_amounts: np.ndarray,
+        balance_dates: np.ndarray,
+        balance_offsets: np.ndarray,
+        account_ids: List[str],
+        account_types: List[str],
+        primary_categories: List[str],
+        detailed_categories: List[str],
+        asset_report_id: str = None,
+    ):
+        self.amounts = amounts
+        self.dates = dates
+        self.primary_codes = primary_codes
+        self.detailed_codes = detailed_codes
+        self.account_offsets = account_offsets
+        self.item_offsets = item_offsets
+        self.balance_amounts = balance_amounts
+        self.balance_dates = balance_dates
+        self.balance_offsets = balance_offsets
+        self.account_ids = account_ids
+        self.account_types = account_types
+        self.primary_categories = primary_categories
+        self.detailed_categories = detailed_categories
+        self.asset_report_id = asset_report_id
+        self.depository = np.array(
+            [account_type == "depository" for account_type in account_types],
+            dtype=bool,
+        )
+
+    @property
+    def num_accounts(self) -> int:
+        return len(self.account_ids)
+
+    def transaction_slice(self, account_index: int) -> slice:
+        return slice(
+            int(self.account_offsets[account_index]),
+            int(self.account_offsets[account_index + 1]),
+        )
+
+    def balance_slice(self, account_index: int) -> slice:
+        return slice(
+            int(self.balance_offsets[account_index]),
+            int(self.balance_offsets[account_index + 1]),
+        )
+
+    def account_index(self, account_id: str) -> int:
+        return self.account_ids.index(account_id)
+
+    def primary_code(self, primary_category: str) -> int:
+        if primary_category in self.primary_categories:
+            return self.primary_categories.index(primary_category)
+        return -1
+
+    def transaction_accounts(self) -> np.ndarray:
+        # The account index of every transaction
+        return np.repeat(
+            np.arange(self.num_accounts), np.diff(self.account_offsets)
+        )
+
+    def balance_accounts(self) -> np.ndarray:
+        # The account index of every historical balance
+        return np.repeat(
+            np.arange(self.num_accounts), np.diff(self.balance_offsets)
+        )
+
+
+"""
+build_transaction_frame takes in an asset report and converts it into a TransactionFrame.
+This is the only step that reads the plaid model objects, so it should be done once per
+report and the frame shared by every vectorized attribute
+
+Params
+* asset_report: the asset report retrieved through /asset_report/get
+
+Returns
+* The TransactionFrame for the report
+"""
+
+
+def build_transaction_frame(asset_report: AssetReport) -> TransactionFrame:
+    amounts = []
+    dates = []
+    primary_codes = []
+    detailed_codes = []
+    account_offsets = [0]
+    item_offsets = [0]
+    balance_amounts = []
+    balance_dates = []
+    balance_offsets = [0]
+    account_ids = []
+    account_types = []
+    primary_vocabulary = {}
+    detailed_vocabulary = {}
+
+    for item in asset_report.items:
+        for account in item.accounts:
+            for transaction in account.transactions:
+                amounts.append(transaction.amount)
+                dates.append(transaction.date)
+                # Records of transactions without a category hold None
+                credit_category = getattr(transaction, "credit_category", None)
+                if credit_category is not None:
+                    primary = credit_category.primary
+                    detailed = credit_category.detailed
+                    primary_codes.append(
+                        primary_vocabulary.setdefault(primary, len(primary_vocabulary))
+                    )
+                    detailed_codes.append(
+                        detailed_vocabulary.setdefault(
+                            detailed, len(detailed_vocabulary)
+                        )
+                    )
+                else:
+                    primary_codes.append(-1)
+                    detailed_codes.append(-1)
+            for balance in account.historical_balances:
+                balance_amounts.append(balance.current)
+                balance_dates.append(balance.date)
+            account_offsets.append(len(amounts))
+            balance_offsets.append(len(balance_amounts))
+            account_ids.append(account.account_id)
+            account_types.append(str(account.type))
+        item_offsets.append(len(account_ids))
+
+    return TransactionFrame(
+        amounts=np.array(amounts, dtype=np.float64),
+        dates=np.array(dates, dtype="datetime64[D]"),
+        primary_codes=np.array(primary_codes, dtype=np.int32),
+        detailed_codes=np.array(detailed_codes, dtype=np.int32),
+        account_offsets=np.array(account_offsets, dtype=np.int64),
+        item_offsets=np.array(item_offsets, dtype=np.int64),
+        balance_amounts=np.array(balance_amounts, dtype=np.float64),
+        balance_dates=np.array(balance_dates, dtype="datetime64[D]"),
+        balance_offsets=np.array(balance_offsets, dtype=np.int64),
+        account_ids=account_ids,
+        account_types=account_types,
+        primary_categories=list(primary_vocabulary),
+        detailed_categories=list(detailed_vocabulary),
+        asset_report_id=asset_report.asset_report_id,
+    )
+
+
+"""
+monthly_summary_of_columns takes in the date and amount columns of a set of transactions
+and returns a map of month to the net amount of the transactions for the month, matching
+calculate_monthly_summary_of_transactions, including 0.0 for a month that isn't in it
+"""
+
+
+def monthly_summary_of_columns(
+    dates: np.ndarray, amounts: np.ndarray
+) -> Dict[str, float]:
+    monthly_summary = defaultdict(float)
+    if len(dates) == 0:
+        return monthly_summary
+    months, month_indexes = np.unique(
+        dates.astype("datetime64[M]"), return_inverse=True
+    )
+    totals = np.bincount(month_indexes, weights=amounts, minlength=len(months))
+    for month, total in zip(months, totals):
+        monthly_summary[str(month)] = float(total)
+    return monthly_summary
+
+
+"""
+max_or_zero, min_or_zero and avg_or_zero take in an amount column and return its
+maximum, minimum and average, or 0.0 if the column is empty, as the original attribute
+functions do for an account or report without any matching transactions
+"""
+
+
+def max_or_zero(amounts: np.ndarray) -> float:
+    if len(amounts) == 0:
+        return 0.0
+    return float(amounts.max())
+
+
+def min_or_zero(amounts: np.ndarray) -> float:
+    if len(amounts) == 0:
+        return 0.0
+    return float(amounts.min())
+
+
+def avg_or_zero(amounts: np.ndarray) -> float:
+    if len(amounts) == 0:
+        return 0.0
+    return float(amounts.mean())
+
+
+"""
+days_since_most_recent_date takes in a date column and returns the number of days
+between today and its most recent date, or 0 if the column is empty
+"""
+
+
+def days_since_most_recent_date(dates: np.ndarray) -> int:
+    if len(dates) == 0:
+        return 0
+    return int((np.datetime64(date.today(), "D") - dates.max()).astype(np.int64))
+
+
+"""
+sum_balances_by_date takes in the date and amount columns of a set of historical
+balances and returns the unique dates and the net balance on each date, matching
+calculate_user_historical_balances
+"""
+
+
+def sum_balances_by_date(
+    dates: np.ndarray, amounts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    unique_dates, date_indexes = np.unique(dates, return_inverse=True)
+    totals = np.bincount(date_indexes, weights=amounts, minlength=len(unique_dates))
+    return unique_dates, totals
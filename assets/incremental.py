@@ -0,0 +1,283 @@
+from typing import Any, Dict, List
+from collections import defaultdict
+from datetime import date
+
+from plaid.model.account_assets import AccountAssets
+from plaid.model.asset_report import AssetReport
+from records import AccountRecord
+from utils import TransactionSummary, merge_transaction_summaries
+from summary import (
+    AccountSummary,
+    TRANSACTION_GROUPS,
+    summarize_account_transactions,
+    summarize_balance_values,
+    summarize_account_balances,
+    merge_balance_summaries,
+)
+
+
+"""
+AccountState is an AccountSummary that can be kept between asset report refreshes. It
+remembers the most recent transaction date and historical balance date it has seen (its
+high-water marks), and update() only summarizes the transactions and balances of a
+refreshed account that are newer than them, so the cost of a refresh is proportional to
+the new days rather than the full history.
+
+Every account attribute can be read from the state with
+account_attributes_from_summary, and it can be serialized with to_dict / from_dict.
+
+The state also keeps the summary of every day with transactions. Days before the
+earliest transaction of the refreshed account have fallen out of the report's window:
+update() drops them and merges the remaining days again, and drops the daily balances
+before the earliest historical balance of the refreshed account the same way. The state
+therefore summarizes the refreshed account, not every transaction ever seen.
+
+Transactions dated on or before the high-water mark are assumed to be unchanged, so
+transactions that post late for a day that was already seen are not picked up.
+
+Params
+* account_id: the id of the account
+* account_type: the type of the account, e.g. "depository"
+* outlier_threshold: the threshold used to count outlier transactions
+"""
+
+
+class AccountState(AccountSummary):
+    def __init__(
+        self,
+        account_id: str,
+        account_type: str,
+        outlier_threshold: float = 10000.00,
+    ):
+        balances = summarize_balance_values([])
+        balances["daily"] = defaultdict(float)
+        super().__init__(
+            account_id,
+            account_type,
+            {group: TransactionSummary() for group in TRANSACTION_GROUPS},
+            0,
+            balances,
+        )
+        self.outlier_threshold = outlier_threshold
+        self.transactions_through = None
+        self.balances_through = None
+        # The transaction summaries and number of outliers of every day with
+        # transactions, as date -> (map of group to TransactionSummary, num_outliers)
+        self.days = {}
+
+    def update(self, account: AccountAssets) -> None:
+        transactions = [
+            transaction
+            for transaction in account.transactions
+            if self.transactions_through is None
+            or transaction.date > self.transactions_through
+        ]
+        historical_balances = [
+            balance
+            for balance in account.historical_balances
+            if self.balances_through is None or balance.date > self.balances_through
+        ]
+        self.account_type = str(account.type)
+        # The earliest days still in the refreshed account. Anything before them has
+        # fallen out of the report's window
+        self._update_transactions(
+            transactions,
+            min(
+                (transaction.date for transaction in account.transactions),
+                default=None,
+            ),
+        )
+        self._update_balances(
+            historical_balances,
+            min(
+                (balance.date for balance in account.historical_balances),
+                default=None,
+            ),
+        )
+        if transactions:
+            self.transactions_through = _latest(
+                self.transactions_through, transactions
+            )
+        if historical_balances:
+            self.balances_through = _latest(self.balances_through, historical_balances)
+
+    def _update_transactions(
+        self, transactions: List[Any], window_start: date
+    ) -> None:
+        new_days = defaultdict(list)
+        for transaction in transactions:
+            new_days[transaction.date].append(transaction)
+        for day, day_transactions in new_days.items():
+            # New transactions are dated after every day already in the state
+            self.days[day] = summarize_account_transactions(
+                AccountRecord(self.account_id, self.account_type, day_transactions, []),
+                TRANSACTION_GROUPS,
+                TRANSACTION_GROUPS,
+                self.outlier_threshold,
+            )
+
+        expired = [
+            day for day in self.days if window_start is None or day < window_start
+        ]
+        for day in expired:
+            del self.days[day]
+        if expired:
+            days = list(self.days.values())
+        else:
+            days = [self.days[day] for day in new_days]
+            days.append((self.transactions, self.num_outliers))
+        self.transactions = {
+            group: merge_transaction_summaries(
+                [summaries[group] for summaries, _ in days]
+            )
+            for group in TRANSACTION_GROUPS
+        }
+        self.num_outliers = sum(num_outliers for _, num_outliers in days)
+
+    def _update_balances(
+        self, historical_balances: List[Any], window_start: date
+    ) -> None:
+        delta = summarize_account_balances(
+            AccountRecord(self.account_id, self.account_type, [], historical_balances)
+        )
+        daily = self.balances["daily"]
+        expired = [
+            day for day in daily if window_start is None or day < window_start
+        ]
+        if not expired:
+            self.balances = merge_balance_summaries(self.balances, delta)
+            return
+        for day in expired:
+            del daily[day]
+        for day, balance in delta["daily"].items():
+            daily[day] += balance
+        self.balances = summarize_balance_values(daily.values())
+        self.balances["daily"] = daily
+
+    def to_dict(self) -> Dict[str, Any]:
+        balances = dict(self.balances)
+        balances["daily"] = {
+            balance_date.isoformat(): balance
+            for balance_date, balance in self.balances["daily"].items()
+        }
+        return {
+            "account_id": self.account_id,
+            "account_type": self.account_type,
+            "outlier_threshold": self.outlier_threshold,
+            "transactions_through": _isoformat(self.transactions_through),
+            "balances_through": _isoformat(self.balances_through),
+            "transactions": {
+                group: summary.to_dict() for group, summary in self.transactions.items()
+            },
+            "num_outliers": self.num_outliers,
+            "balances": balances,
+            "days": {
+                day.isoformat(): {
+                    "transactions": {
+                        group: summary.to_dict() for group, summary in summaries.items()
+                    },
+                    "num_outliers": num_outliers,
+                }
+                for day, (summaries, num_outliers) in self.days.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AccountState":
+        state = cls(data["account_id"], data["account_type"], data["outlier_threshold"])
+        state.transactions_through = _fromisoformat(data["transactions_through"])
+        state.balances_through = _fromisoformat(data["balances_through"])
+        state.transactions = {
+            group: TransactionSummary.from_dict(summary)
+            for group, summary in data["transactions"].items()
+        }
+        state.num_outliers = data["num_outliers"]
+        state.balances = dict(data["balances"])
+        state.balances["daily"] = defaultdict(float)
+        for balance_date, balance in data["balances"]["daily"].items():
+            state.balances["daily"][date.fromisoformat(balance_date)] = balance
+        state.days = {
+            date.fromisoformat(day): (
+                {
+                    group: TransactionSummary.from_dict(summary)
+                    for group, summary in summaries["transactions"].items()
+                },
+                summaries["num_outliers"],
+            )
+            for day, summaries in data["days"].items()
+        }
+        return state
+
+
+"""
+ReportState keeps an AccountState for every account seen across the refreshes of an
+asset report. update() takes in the latest asset report and only summarizes the
+transactions and balances of each account that are newer than that account's
+high-water marks. Accounts that are no longer in the latest report are dropped, and
+each account drops the days that fell out of the report's window, so the attributes
+read from the state match the attributes of the latest report.
+
+Every report attribute can be read from the account states with
+report_attributes_from_summaries, and the state can be serialized with
+to_dict / from_dict.
+
+Params
+* outlier_threshold: the threshold used to count outlier transactions
+"""
+
+
+class ReportState:
+    def __init__(self, outlier_threshold: float = 10000.00):
+        self.outlier_threshold = outlier_threshold
+        self.asset_report_id = None
+        self.accounts = {}
+
+    def update(self, asset_report: AssetReport) -> None:
+        account_ids = set()
+        for item in asset_report.items:
+            for account in item.accounts:
+                account_ids.add(account.account_id)
+                if account.account_id not in self.accounts:
+                    self.accounts[account.account_id] = AccountState(
+                        account.account_id,
+                        str(account.type),
+                        self.outlier_threshold,
+                    )
+                self.accounts[account.account_id].update(account)
+        for account_id in list(self.accounts):
+            if account_id not in account_ids:
+                del self.accounts[account_id]
+        self.asset_report_id = asset_report.asset_report_id
+
+    def account_summaries(self) -> List[AccountState]:
+        return list(self.accounts.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "outlier_threshold": self.outlier_threshold,
+            "asset_report_id": self.asset_report_id,
+            "accounts": [state.to_dict() for state in self.accounts.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ReportState":
+        state = cls(data["outlier_threshold"])
+        state.asset_report_id = data["asset_report_id"]
+        for account in data["accounts"]:
+            state.accounts[account["account_id"]] = AccountState.from_dict(account)
+        return state
+
+
+def _latest(high_water_mark: date, records: List[Any]) -> date:
+    latest = max(record.date for record in records)
+    if high_water_mark is None or latest > high_water_mark:
+        return latest
+    return high_water_mark
+
+
+def _isoformat(value: date) -> str:
+    return value.isoformat() if value is not None else None
+
+
+def _fromisoformat(value: str) -> date:
+    return date.fromisoformat(value) if value is not None else None
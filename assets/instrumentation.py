@@ -0,0 +1,242 @@
+import functools
+import inspect
+import threading
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, Tuple
+
+"""
+Attribute instrumentation
+----------------------
+Instrumentation records the wall time, call count and input size (the transactions and
+historical balances of the accounts or report passed in) of every attribute function in
+the modules it instruments, and exports them as a dict or as Prometheus text.
+
+Functions are only wrapped while instrumentation is active: instrument() replaces the
+public functions of the given modules with timing wrappers and restore() puts the
+original functions back, so uninstrumented code runs the original functions with no
+overhead. Code that imported a function by name before instrument() was called keeps
+the original function, so instrument modules before scoring with them.
+
+Usage
+* with Instrumentation(debt_insights, negative_record) as instrumentation:
+      score(asset_report)
+  print(instrumentation.to_prometheus())
+"""
+
+
+class AttributeStats:
+    __slots__ = ("calls", "seconds", "transactions", "balances")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.transactions = 0
+        self.balances = 0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "transactions": self.transactions,
+            "balances": self.balances,
+        }
+
+
+# The metrics exported by to_prometheus, as (statistic, metric suffix, help)
+PROMETHEUS_METRICS = [
+    ("calls", "calls_total", "Number of calls of the attribute function"),
+    ("seconds", "seconds_total", "Wall time spent in the attribute function"),
+    ("transactions", "transactions_total", "Transactions passed to the function"),
+    ("balances", "balances_total", "Historical balances passed to the function"),
+]
+
+
+"""
+_InstalledFunction is an attribute function replaced by its timing wrapper, and the
+Instrumentations currently recording its calls. Each function is wrapped at most once,
+however many Instrumentations cover its module
+"""
+
+
+class _InstalledFunction:
+    def __init__(self, module: ModuleType, name: str, function: Callable):
+        self.module = module
+        self.name = name
+        self.function = function
+        self.instrumentations = []
+        self.wrapper = self._wrap()
+
+    def _wrap(self) -> Callable:
+        module_name = self.module.__name__
+        name = self.name
+        function = self.function
+
+        @functools.wraps(function)
+        def instrumented(*args, **kwargs):
+            instrumentations = list(self.instrumentations)
+            # Only the outermost instrumented call is recorded, so an attribute that
+            # calls another instrumented attribute is not counted twice
+            if not instrumentations or getattr(_calls, "active", False):
+                return function(*args, **kwargs)
+            _calls.active = True
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                _calls.active = False
+                transactions, balances = _input_size(args[0] if args else None)
+                for instrumentation in instrumentations:
+                    instrumentation._record(
+                        module_name, name, elapsed, transactions, balances
+                    )
+
+        return instrumented
+
+
+# The installed wrappers keyed by (module, function name), guarded by _install_lock
+_installed = {}
+_install_lock = threading.Lock()
+# Whether the current thread is inside an instrumented call
+_calls = threading.local()
+
+
+"""
+Instrumentation wraps the public functions of attribute modules and aggregates an
+AttributeStats per (module, function). Statistics are kept after restore() until reset()
+
+Instrumentations may be nested or overlap on the same modules: every function is wrapped
+once, each active Instrumentation records its calls, and the original function is put
+back when the last one covering it is restored. Nested instrument() calls on the same
+Instrumentation are counted, and only the matching number of restore() calls stops it.
+An attribute that calls another instrumented attribute is recorded once, as the outer
+call
+
+Params
+* modules: the attribute modules to instrument, e.g. the debt_insights module
+"""
+
+
+class Instrumentation:
+    def __init__(self, *modules: ModuleType):
+        self.modules = modules
+        self.stats = {}
+        self._installed = []
+        self._depth = 0
+        self._lock = threading.Lock()
+
+    def instrument(self) -> None:
+        with _install_lock:
+            self._depth += 1
+            if self._depth > 1:
+                return
+            for module in self.modules:
+                for name, function in inspect.getmembers(module, inspect.isfunction):
+                    installed = _installed.get((module, name))
+                    if installed is None:
+                        if function.__module__ != module.__name__:
+                            continue
+                        if name.startswith("_"):
+                            continue
+                        installed = _InstalledFunction(module, name, function)
+                        _installed[(module, name)] = installed
+                        setattr(module, name, installed.wrapper)
+                    installed.instrumentations.append(self)
+                    self._installed.append(installed)
+
+    def restore(self) -> None:
+        with _install_lock:
+            if self._depth == 0:
+                return
+            self._depth -= 1
+            if self._depth > 0:
+                return
+            for installed in self._installed:
+                installed.instrumentations.remove(self)
+                if installed.instrumentations:
+                    continue
+                del _installed[(installed.module, installed.name)]
+                # Leave the function alone if something else replaced the wrapper
+                if getattr(installed.module, installed.name, None) is installed.wrapper:
+                    setattr(installed.module, installed.name, installed.function)
+            self._installed = []
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats = {}
+
+    def __enter__(self) -> "Instrumentation":
+        self.instrument()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.restore()
+
+    def _record(
+        self,
+        module_name: str,
+        name: str,
+        seconds: float,
+        transactions: int,
+        balances: int,
+    ) -> None:
+        with self._lock:
+            stats = self.stats.get((module_name, name))
+            if stats is None:
+                stats = self.stats[(module_name, name)] = AttributeStats()
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.transactions += transactions
+            stats.balances += balances
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                f"{module_name}.{name}": stats.to_dict()
+                for (module_name, name), stats in sorted(self.stats.items())
+            }
+
+    def to_prometheus(self, prefix: str = "asset_attribute") -> str:
+        with self._lock:
+            stats = sorted(self.stats.items())
+        lines = []
+        for statistic, suffix, description in PROMETHEUS_METRICS:
+            metric = f"{prefix}_{suffix}"
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} counter")
+            for (module_name, name), attribute_stats in stats:
+                lines.append(
+                    f'{metric}{{module="{module_name}",attribute="{name}"}} '
+                    f"{getattr(attribute_stats, statistic)}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+def _input_size(value: Any) -> Tuple[int, int]:
+    # The number of transactions and historical balances in an asset report or account,
+    # or (0, 0) for any other input
+    if hasattr(value, "items") and not isinstance(value, dict):
+        accounts = [account for item in value.items for account in item.accounts]
+    elif hasattr(value, "transactions"):
+        accounts = [value]
+    else:
+        return 0, 0
+    transactions = 0
+    balances = 0
+    for account in accounts:
+        transactions += len(getattr(account, "transactions", None) or [])
+        balances += len(getattr(account, "historical_balances", None) or [])
+    return transactions, balances
+
+
+"""
+instrument is a shorthand for Instrumentation(*modules) that starts instrumenting the
+modules right away. Call restore() on the result to stop
+"""
+
+
+def instrument(*modules: ModuleType) -> Instrumentation:
+    instrumentation = Instrumentation(*modules)
+    instrumentation.instrument()
+    return instrumentation
@@ -0,0 +1,237 @@
+import json
+import re
+from typing import Any, Iterator, List, Tuple
+
+import numpy as np
+
+from records import AccountRecord
+from stream import account_from_json
+
+"""
+Lazy asset reports
+----------------------
+LazyAssetReport wraps the raw bytes of a /asset_report/get response without parsing the
+transactions or balances of its accounts. Opening it finds every bracket of the JSON
+outside of strings with a few NumPy passes over the bytes and pairs them up by depth,
+so any object or array can be skipped in one lookup. It then reads only the short
+fields of the report, its items and its accounts: asset_report_id, item_id,
+account_id and type.
+
+Each account is a LazyAccount that parses its own span of the bytes into an
+AccountRecord the first time its transactions or historical balances are read, and
+keeps it for later reads. The report, its items and its accounts have the same field
+names as the plaid models, so every report and account attribute function accepts
+them, and a call that only reads depository accounts never parses the others.
+
+Usage
+* asset_report = LazyAssetReport(response_bytes), then pass asset_report to any report
+    attribute function
+"""
+
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_SCALAR = re.compile(rb"[^,}\] \t\n\r]*")
+
+# Lookup tables from a byte to whether it is a bracket, and whether it opens one
+_BRACKETS = np.zeros(256, dtype=bool)
+_BRACKETS[list(b"{}[]")] = True
+_OPENING = np.zeros(256, dtype=bool)
+_OPENING[list(b"{[")] = True
+
+
+class _JsonIndex:
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        data = np.frombuffer(raw, dtype=np.uint8)
+        quotes = np.flatnonzero(data == ord('"'))
+        # A quote after an odd run of backslashes is part of a string, not its end.
+        # These are rare, so only the quotes right after a backslash are checked
+        unescaped = np.ones(len(quotes), dtype=bool)
+        for position in np.flatnonzero(data[np.maximum(quotes - 1, 0)] == ord("\\")):
+            unescaped[position] = not _is_escaped(raw, int(quotes[position]))
+        self.quotes = quotes[unescaped]
+
+        brackets = np.flatnonzero(_BRACKETS[data])
+        # A bracket is outside of every string if an even number of quotes precede it
+        brackets = brackets[np.searchsorted(self.quotes, brackets) % 2 == 0]
+        opening = _OPENING[data[brackets]]
+        depth = np.cumsum(np.where(opening, 1, -1))
+        if len(depth) and (depth[-1] != 0 or depth.min() < 0):
+            raise ValueError("unbalanced brackets in asset report JSON")
+        # Ordered by depth and then by position, the brackets at each depth alternate
+        # between opening and closing, so every opening bracket is followed by its
+        # closing one
+        paired = brackets[np.lexsort((brackets, np.where(opening, depth, depth + 1)))]
+        order = np.argsort(paired[0::2])
+        self.opening = paired[0::2][order]
+        self.closing = paired[1::2][order]
+
+    def skip_whitespace(self, pos: int) -> int:
+        return _WHITESPACE.match(self.raw, pos).end()
+
+    def value_end(self, pos: int) -> int:
+        # The position right after the JSON value starting at pos
+        first = self.raw[pos : pos + 1]
+        if first in (b"{", b"["):
+            return int(self.closing[np.searchsorted(self.opening, pos)]) + 1
+        if first == b'"':
+            return int(self.quotes[np.searchsorted(self.quotes, pos + 1)]) + 1
+        end = _SCALAR.match(self.raw, pos).end()
+        if end == pos:
+            raise ValueError(f"expected a value in asset report JSON at byte {pos}")
+        return end
+
+    def value(self, pos: int) -> Any:
+        return json.loads(self.raw[pos : self.value_end(pos)])
+
+    def _expect(self, pos: int, character: bytes) -> int:
+        pos = self.skip_whitespace(pos)
+        if self.raw[pos : pos + 1] != character:
+            raise ValueError(
+                f"expected {character.decode()!r} in asset report JSON at byte {pos}"
+            )
+        return pos + 1
+
+    def members(self, pos: int) -> Iterator[Tuple[str, int]]:
+        # Yields the key and value position of every member of the object at pos
+        end = self.value_end(pos) - 1
+        pos = self.skip_whitespace(self._expect(pos, b"{"))
+        while pos < end:
+            key_end = self.value_end(pos)
+            key = json.loads(self.raw[pos:key_end])
+            value = self.skip_whitespace(self._expect(key_end, b":"))
+            yield key, value
+            pos = self.skip_whitespace(self.value_end(value))
+            if pos < end:
+                pos = self.skip_whitespace(self._expect(pos, b","))
+
+    def elements(self, pos: int) -> Iterator[int]:
+        # Yields the position of every element of the array at pos
+        end = self.value_end(pos) - 1
+        pos = self.skip_whitespace(self._expect(pos, b"["))
+        while pos < end:
+            yield pos
+            pos = self.skip_whitespace(self.value_end(pos))
+            if pos < end:
+                pos = self.skip_whitespace(self._expect(pos, b","))
+
+
+def _is_escaped(raw: bytes, quote: int) -> bool:
+    backslashes = 0
+    while quote - backslashes > 0 and raw[quote - backslashes - 1] == ord("\\"):
+        backslashes += 1
+    return backslashes % 2 == 1
+
+
+"""
+LazyAccount is an account of a LazyAssetReport. account_id and type are read when the
+report is opened, and transactions and historical_balances the first time either is
+read
+"""
+
+
+class LazyAccount:
+    __slots__ = (
+        "account_id",
+        "type",
+        "_raw",
+        "_start",
+        "_end",
+        "_record",
+        "__weakref__",
+    )
+
+    def __init__(
+        self, account_id: str, account_type: str, raw: bytes, start: int, end: int
+    ):
+        self.account_id = account_id
+        self.type = account_type
+        self._raw = raw
+        self._start = start
+        self._end = end
+        self._record = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._record is not None
+
+    def record(self) -> AccountRecord:
+        if self._record is None:
+            self._record = account_from_json(
+                json.loads(self._raw[self._start : self._end])
+            )
+        return self._record
+
+    @property
+    def transactions(self) -> list:
+        return self.record().transactions
+
+    @property
+    def historical_balances(self) -> list:
+        return self.record().historical_balances
+
+
+class LazyItem:
+    __slots__ = ("item_id", "accounts")
+
+    def __init__(self, item_id: str, accounts: List[LazyAccount]):
+        self.item_id = item_id
+        self.accounts = accounts
+
+
+"""
+LazyAssetReport indexes the raw bytes of an asset report and parses its accounts on
+demand
+
+Params
+* raw: the bytes of the JSON response of /asset_report/get (or only its "report"
+    object)
+"""
+
+
+class LazyAssetReport:
+    def __init__(self, raw: bytes):
+        self.asset_report_id = None
+        self.items = []
+        index = _JsonIndex(raw)
+        self._read_report(index, index.skip_whitespace(0))
+
+    @property
+    def accounts(self) -> List[LazyAccount]:
+        return [account for item in self.items for account in item.accounts]
+
+    def num_loaded_accounts(self) -> int:
+        return sum(account.loaded for account in self.accounts)
+
+    def _read_report(self, index: _JsonIndex, pos: int) -> None:
+        for key, value in index.members(pos):
+            if key == "report":
+                self._read_report(index, value)
+            elif key == "items":
+                for item in index.elements(value):
+                    self.items.append(self._read_item(index, item))
+            elif key == "asset_report_id":
+                self.asset_report_id = index.value(value)
+
+    def _read_item(self, index: _JsonIndex, pos: int) -> LazyItem:
+        item_id = None
+        accounts = []
+        for key, value in index.members(pos):
+            if key == "item_id":
+                item_id = index.value(value)
+            elif key == "accounts":
+                for account in index.elements(value):
+                    accounts.append(self._read_account(index, account))
+        return LazyItem(item_id, accounts)
+
+    def _read_account(self, index: _JsonIndex, pos: int) -> LazyAccount:
+        account_id = None
+        account_type = None
+        for key, value in index.members(pos):
+            if key == "account_id":
+                account_id = index.value(value)
+            elif key == "type":
+                account_type = index.value(value)
+        return LazyAccount(
+            account_id, account_type, index.raw, pos, index.value_end(pos)
+        )
@@ -0,0 +1,280 @@
+import weakref
+from typing import Dict, List
+from collections import OrderedDict, defaultdict
+from datetime import date
+
+import numpy as np
+
+from plaid.model.account_assets import AccountAssets
+from plaid.model.asset_report import AssetReport
+from plaid.model.asset_report_transaction import AssetReportTransaction
+from utils import month_ordinal, month_string
+
+# The monthly summaries that can be bucketed together. Each is the net amount of the
+# transactions selected by its mask, in line with inflows_monthly_summary,
+# outflows_monthly_summary and the monthly cash flow
+MONTHLY_SUMMARIES = {
+    "inflows": lambda amounts: amounts < 0,
+    "outflows": lambda amounts: amounts > 0,
+    "net": lambda amounts: np.ones(len(amounts), dtype=bool),
+}
+
+
+"""
+MonthlyBuckets holds several monthly summaries of the same transactions as dense arrays
+over a contiguous range of months, from start_month to end_month inclusive. Months are
+integer month ordinals (utils.month_ordinal), so element i of every array is month
+start_month + i, and months without transactions are filled with 0.
+
+"YYYY-MM" keys are only produced by summary(), when a summary is read out as a map
+
+Attributes
+* start_month / end_month: the first and last month ordinal covered, or None if empty
+* totals: a map of summary name to the net amount of its transactions in every month
+* counts: a map of summary name to the number of its transactions in every month
+"""
+
+
+class MonthlyBuckets:
+    def __init__(
+        self,
+        start_month: int,
+        end_month: int,
+        totals: Dict[str, np.ndarray],
+        counts: Dict[str, np.ndarray],
+    ):
+        self.start_month = start_month
+        self.end_month = end_month
+        self.totals = totals
+        self.counts = counts
+
+    def __len__(self) -> int:
+        if self.start_month is None:
+            return 0
+        return self.end_month - self.start_month + 1
+
+    def months(self) -> List[int]:
+        return list(range(self.start_month, self.start_month + len(self)))
+
+    def month_keys(self) -> List[str]:
+        return [month_string(month) for month in self.months()]
+
+    def summary(self, name: str, fill_gaps: bool = False) -> Dict[str, float]:
+        # Without fill_gaps only the months with a transaction are kept, which gives
+        # the same map as calculate_monthly_summary_of_transactions, including 0.0 for
+        # a month that isn't in it
+        totals = self.totals[name]
+        counts = self.counts[name]
+        monthly_summary = defaultdict(float)
+        for i in range(len(self)):
+            if fill_gaps or counts[i]:
+                monthly_summary[month_string(self.start_month + i)] = float(totals[i])
+        return monthly_summary
+
+
+"""
+bucket_columns_by_month buckets transaction amounts by their month ordinal and computes
+every requested monthly summary from the same month indexes
+
+Params
+* months: the month ordinal of every transaction
+* amounts: the amount of every transaction
+* summaries: the names of the summaries to compute, from MONTHLY_SUMMARIES
+* start_month / end_month: the month range to cover. Defaults to the first and last month
+    with a transaction; transactions outside the range are left out
+
+Returns
+* The MonthlyBuckets of the requested summaries
+"""
+
+
+def bucket_columns_by_month(
+    months: np.ndarray,
+    amounts: np.ndarray,
+    summaries: List[str] = tuple(MONTHLY_SUMMARIES),
+    start_month: int = None,
+    end_month: int = None,
+) -> MonthlyBuckets:
+    unknown_summaries = set(summaries) - set(MONTHLY_SUMMARIES)
+    if unknown_summaries:
+        raise ValueError(f"unknown monthly summaries {sorted(unknown_summaries)}")
+
+    months = np.asarray(months, dtype=np.int64)
+    amounts = np.asarray(amounts, dtype=np.float64)
+    if start_month is None and len(months):
+        start_month = int(months.min())
+    if end_month is None and len(months):
+        end_month = int(months.max())
+    if start_month is None or end_month is None or end_month < start_month:
+        empty = np.zeros(0)
+        return MonthlyBuckets(
+            None,
+            None,
+            {name: empty for name in summaries},
+            {name: empty.astype(np.int64) for name in summaries},
+        )
+
+    num_months = end_month - start_month + 1
+    in_range = (months >= start_month) & (months <= end_month)
+    indexes = months[in_range] - start_month
+    amounts = amounts[in_range]
+    totals = {}
+    counts = {}
+    for name in summaries:
+        mask = MONTHLY_SUMMARIES[name](amounts)
+        totals[name] = np.bincount(
+            indexes[mask], weights=amounts[mask], minlength=num_months
+        )
+        counts[name] = np.bincount(indexes[mask], minlength=num_months)
+    return MonthlyBuckets(start_month, end_month, totals, counts)
+
+
+"""
+bucket_transactions_by_month reads the month and amount of every transaction once and
+buckets them into every requested monthly summary
+
+Params
+* transactions: a list of transactions
+* summaries: the names of the summaries to compute, from MONTHLY_SUMMARIES
+* start_month / end_month: the months to cover, as dates or month ordinals. Default to
+    the first and last month with a transaction
+
+Returns
+* The MonthlyBuckets of the requested summaries
+"""
+
+
+def bucket_transactions_by_month(
+    transactions: List[AssetReportTransaction],
+    summaries: List[str] = tuple(MONTHLY_SUMMARIES),
+    start_month=None,
+    end_month=None,
+) -> MonthlyBuckets:
+    months = np.fromiter(
+        (month_ordinal(transaction.date) for transaction in transactions),
+        dtype=np.int64,
+        count=len(transactions),
+    )
+    amounts = np.fromiter(
+        (transaction.amount for transaction in transactions),
+        dtype=np.float64,
+        count=len(transactions),
+    )
+    return bucket_columns_by_month(
+        months,
+        amounts,
+        summaries,
+        _month(start_month),
+        _month(end_month),
+    )
+
+
+"""
+bucket_report_by_month buckets the transactions of every account in an asset report into
+every requested monthly summary, in a single pass over the report
+
+Params
+* asset_report: the asset report retrieved through /asset_report/get
+* summaries: the names of the summaries to compute, from MONTHLY_SUMMARIES
+* start_month / end_month: the months to cover, as dates or month ordinals. Default to
+    the first and last month with a transaction
+
+Returns
+* The MonthlyBuckets of the requested summaries
+"""
+
+
+def bucket_report_by_month(
+    asset_report: AssetReport,
+    summaries: List[str] = tuple(MONTHLY_SUMMARIES),
+    start_month=None,
+    end_month=None,
+) -> MonthlyBuckets:
+    transactions = []
+    for item in asset_report.items:
+        for account in item.accounts:
+            transactions.extend(account.transactions)
+    return bucket_transactions_by_month(
+        transactions, summaries, start_month, end_month
+    )
+
+
+def _month(value) -> int:
+    if isinstance(value, date):
+        return month_ordinal(value)
+    return value
+
+
+# Monthly buckets of every summary in MONTHLY_SUMMARIES, keyed by account_id and
+# asset_report_id. The least recently used entry is evicted once a table holds
+# MONTHLY_BUCKETS_CACHE_SIZE entries.
+MONTHLY_BUCKETS_CACHE_SIZE = 64
+_account_monthly_buckets = OrderedDict()
+_report_monthly_buckets = OrderedDict()
+
+
+def _cached(cache: OrderedDict, key: str, source: object, build) -> MonthlyBuckets:
+    # An entry is only reused for the same source object, which is held through a
+    # weak reference so that the cache never keeps a report alive
+    entry = cache.get(key)
+    if entry is None or entry[0]() is not source:
+        entry = (weakref.ref(source), build())
+        cache[key] = entry
+        if len(cache) > MONTHLY_BUCKETS_CACHE_SIZE:
+            cache.popitem(last=False)
+    cache.move_to_end(key)
+    return entry[1]
+
+
+"""
+get_account_monthly_buckets returns the inflow, outflow and net monthly buckets of the
+transactions of an account, bucketing them on the first call and reusing them for later
+calls on the same account
+"""
+
+
+def get_account_monthly_buckets(account: AccountAssets) -> MonthlyBuckets:
+    return _cached(
+        _account_monthly_buckets,
+        account.account_id,
+        account,
+        lambda: bucket_transactions_by_month(account.transactions),
+    )
+
+
+"""
+get_report_monthly_buckets returns the inflow, outflow and net monthly buckets of the
+transactions of every account in a report, bucketing them on the first call and reusing
+them for later calls on the same report
+"""
+
+
+def get_report_monthly_buckets(asset_report: AssetReport) -> MonthlyBuckets:
+    return _cached(
+        _report_monthly_buckets,
+        asset_report.asset_report_id,
+        asset_report,
+        lambda: bucket_report_by_month(asset_report),
+    )
+
+
+"""
+net_monthly_summary returns the map of "YYYY-MM" month to the net amount of the given
+transactions, the same map as calculate_monthly_summary_of_transactions
+"""
+
+
+def net_monthly_summary(
+    transactions: List[AssetReportTransaction],
+) -> Dict[str, float]:
+    return bucket_transactions_by_month(transactions, ["net"]).summary("net")
+
+
+"""
+clear_monthly_buckets drops every cached account and report MonthlyBuckets
+"""
+
+
+def clear_monthly_buckets() -> None:
+    _account_monthly_buckets.clear()
+    _report_monthly_buckets.clear()
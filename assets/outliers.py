@@ -0,0 +1,124 @@
+from typing import Dict, List, Union
+
+import numpy as np
+
+from plaid.model.account_assets import AccountAssets
+from plaid.model.asset_report import AssetReport
+
+# The outlier thresholds evaluated by default, in dollars
+OUTLIER_THRESHOLDS = [1000.00, 2500.00, 5000.00, 10000.00, 25000.00]
+
+# The default cutoffs of the statistical outlier counts. A transaction is a z-score
+# outlier if its absolute amount is more than Z_SCORE_THRESHOLD standard deviations
+# above the mean, and a MAD outlier if its modified z-score is above MAD_THRESHOLD
+Z_SCORE_THRESHOLD = 3.0
+MAD_THRESHOLD = 3.5
+
+# Scales a median absolute deviation to the standard deviation of a normal distribution
+MAD_SCALE = 0.6745
+
+
+"""
+OutlierIndex sorts the absolute amounts of a set of transactions once, so that the
+number of transactions above any threshold is a binary search, and keeps the mean,
+standard deviation, median and median absolute deviation of the absolute amounts for
+the statistical outlier counts.
+
+Every count is of transactions that are unusually large, in line with
+num_outlier_transactions: a transaction far below the typical amount is not an
+outlier.
+
+Params
+* absolute_amounts: the absolute amount of every transaction
+"""
+
+
+class OutlierIndex:
+    def __init__(self, absolute_amounts: np.ndarray):
+        self.amounts = np.sort(absolute_amounts)
+        self.mean = float(self.amounts.mean()) if len(self.amounts) else 0.0
+        self.std = float(self.amounts.std()) if len(self.amounts) else 0.0
+        self.median = float(np.median(self.amounts)) if len(self.amounts) else 0.0
+        self.mad = (
+            float(np.median(np.abs(self.amounts - self.median)))
+            if len(self.amounts)
+            else 0.0
+        )
+
+    def count_above(self, outlier_threshold: float) -> int:
+        return len(self.amounts) - int(
+            np.searchsorted(self.amounts, outlier_threshold, side="right")
+        )
+
+    def counts_above(self, outlier_thresholds: List[float]) -> Dict[float, int]:
+        stops = np.searchsorted(self.amounts, outlier_thresholds, side="right")
+        return {
+            threshold: len(self.amounts) - int(stop)
+            for threshold, stop in zip(outlier_thresholds, stops)
+        }
+
+    def count_z_score_outliers(self, z_threshold: float = Z_SCORE_THRESHOLD) -> int:
+        # Every amount is the same when the standard deviation is 0
+        if self.std == 0:
+            return 0
+        z_scores = (self.amounts - self.mean) / self.std
+        return int(np.count_nonzero(z_scores > z_threshold))
+
+    def count_mad_outliers(self, mad_threshold: float = MAD_THRESHOLD) -> int:
+        # More than half of the amounts are the same when the MAD is 0
+        if self.mad == 0:
+            return 0
+        modified_z_scores = MAD_SCALE * (self.amounts - self.median) / self.mad
+        return int(np.count_nonzero(modified_z_scores > mad_threshold))
+
+    def counts(
+        self,
+        outlier_thresholds: List[float] = OUTLIER_THRESHOLDS,
+        z_threshold: float = Z_SCORE_THRESHOLD,
+        mad_threshold: float = MAD_THRESHOLD,
+    ) -> Dict[str, Union[int, Dict[float, int]]]:
+        return {
+            "num_outlier_transactions_by_threshold": self.counts_above(
+                outlier_thresholds
+            ),
+            "num_z_score_outlier_transactions": self.count_z_score_outliers(
+                z_threshold
+            ),
+            "num_mad_outlier_transactions": self.count_mad_outliers(mad_threshold),
+        }
+
+
+def _absolute_amounts(accounts: List[AccountAssets]) -> np.ndarray:
+    return np.abs(
+        np.fromiter(
+            (
+                transaction.amount
+                for account in accounts
+                for transaction in account.transactions
+            ),
+            dtype=np.float64,
+        )
+    )
+
+
+"""
+build_account_outlier_index returns the OutlierIndex of the transactions of an account
+"""
+
+
+def build_account_outlier_index(account: AccountAssets) -> OutlierIndex:
+    return OutlierIndex(_absolute_amounts([account]))
+
+
+"""
+build_report_outlier_index returns the OutlierIndex of the transactions across every
+account of an asset report
+"""
+
+
+def build_report_outlier_index(asset_report: AssetReport) -> OutlierIndex:
+    return OutlierIndex(
+        _absolute_amounts(
+            [account for item in asset_report.items for account in item.accounts]
+        )
+    )
@@ -0,0 +1,166 @@
+from typing import List
+
+from plaid.model.account_assets import AccountAssets
+from plaid.model.asset_report import AssetReport
+
+"""
+Compact records
+----------------------
+The records in this file hold only the fields of an asset report that the attribute
+functions read, in __slots__ classes. Reading a field of a record is a plain slot access
+instead of a lookup through the plaid model's generic attribute machinery, and a record
+is a fraction of the size of the model it was extracted from. Credit categories are
+interned, so every transaction with the same category shares one CategoryRecord.
+
+Records have the same field names as the plaid models, so every account and report
+attribute function, and the single-pass summaries, accept them in place of the models.
+
+Usage
+* records = extract_report_records(asset_report) once, then pass records to any
+    report attribute function. extract_account_records does the same for one account
+"""
+
+
+class CategoryRecord:
+    __slots__ = ("primary", "detailed")
+
+    def __init__(self, primary: str, detailed: str):
+        self.primary = primary
+        self.detailed = detailed
+
+
+class TransactionRecord:
+    __slots__ = ("amount", "date", "credit_category")
+
+    def __init__(self, amount, transaction_date, credit_category: CategoryRecord):
+        self.amount = amount
+        self.date = transaction_date
+        self.credit_category = credit_category
+
+
+class BalanceRecord:
+    __slots__ = ("date", "current")
+
+    def __init__(self, balance_date, current):
+        self.date = balance_date
+        self.current = current
+
+
+class AccountRecord:
+    # __weakref__ lets the attribute caches refer to a record without keeping it alive
+    __slots__ = (
+        "account_id",
+        "type",
+        "transactions",
+        "historical_balances",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        account_id: str,
+        account_type: str,
+        transactions: List[TransactionRecord],
+        historical_balances: List[BalanceRecord],
+    ):
+        self.account_id = account_id
+        self.type = account_type
+        self.transactions = transactions
+        self.historical_balances = historical_balances
+
+
+class ItemRecord:
+    __slots__ = ("item_id", "accounts")
+
+    def __init__(self, item_id: str, accounts: List[AccountRecord]):
+        self.item_id = item_id
+        self.accounts = accounts
+
+
+class ReportRecord:
+    __slots__ = ("asset_report_id", "items", "__weakref__")
+
+    def __init__(self, asset_report_id: str, items: List[ItemRecord]):
+        self.asset_report_id = asset_report_id
+        self.items = items
+
+
+# Interned credit categories, shared by every extracted transaction. The table only
+# grows with the number of distinct credit categories
+_categories = {}
+
+
+"""
+intern_category returns the shared CategoryRecord of a (primary, detailed) credit
+category pair
+"""
+
+
+def intern_category(primary: str, detailed: str) -> CategoryRecord:
+    key = (primary, detailed)
+    category = _categories.get(key)
+    if category is None:
+        category = _categories[key] = CategoryRecord(primary, detailed)
+    return category
+
+
+def _category(credit_category) -> CategoryRecord:
+    if credit_category is None:
+        return None
+    return intern_category(credit_category.primary, credit_category.detailed)
+
+
+"""
+extract_account_records reads the fields used by the attribute functions out of an
+account once and returns them as an AccountRecord
+
+Params
+* account: one of the accounts retrieved through /asset_report/get
+
+Returns
+* The AccountRecord of the account
+"""
+
+
+def extract_account_records(account: AccountAssets) -> AccountRecord:
+    transactions = [
+        TransactionRecord(
+            transaction.amount,
+            transaction.date,
+            _category(getattr(transaction, "credit_category", None)),
+        )
+        for transaction in account.transactions
+    ]
+    historical_balances = [
+        BalanceRecord(balance.date, balance.current)
+        for balance in account.historical_balances
+    ]
+    return AccountRecord(
+        account.account_id, str(account.type), transactions, historical_balances
+    )
+
+
+"""
+extract_report_records reads the fields used by the attribute functions out of every
+account of an asset report once and returns them as a ReportRecord
+
+Params
+* asset_report: the asset report retrieved through /asset_report/get
+
+Returns
+* The ReportRecord of the report
+"""
+
+
+def extract_report_records(asset_report: AssetReport) -> ReportRecord:
+    return ReportRecord(
+        asset_report.asset_report_id,
+        [
+            ItemRecord(
+                item.item_id,
+                [extract_account_records(account) for account in item.accounts],
+            )
+            for item in asset_report.items
+        ],
+    )
+
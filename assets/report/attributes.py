@@ -0,0 +1,284 @@
+from typing import Any, Dict, IO, List
+from plaid.model.asset_report import AssetReport
+from stream import AssetReportStream, account_from_json
+from summary import (
+    AccountSummary,
+    summarize_account,
+    merge_account_summaries,
+    requested_groups,
+    transaction_statistic,
+    balance_statistic,
+)
+
+"""
+The report level attributes that can be computed by compute_report_attributes.
+Each name matches the function of the same name in the report level attribute
+files and produces the same value, up to floating point rounding.
+"""
+
+REPORT_ATTRIBUTES = [
+    # cash_flow.py
+    "num_inflows",
+    "total_inflows_amount",
+    "inflows_monthly_summary",
+    "num_outflows",
+    "total_outflows_amount",
+    "outflows_monthly_summary",
+    "num_transactions",
+    "net_cash_flow",
+    "cash_flow_monthly_summary",
+    # debt_insights.py
+    "count_loan_disbursements",
+    "amount_loan_disbursements",
+    "max_loan_disbursements",
+    "min_loan_disbursements",
+    "avg_loan_disbursement",
+    "loan_disbursement_monthly_summary",
+    "days_since_loan_disbursement",
+    "count_loan_payments",
+    "amount_loan_payments",
+    "max_loan_payments",
+    "min_loan_payments",
+    "avg_loan_payment",
+    "loan_payment_monthly_summary",
+    "days_since_loan_payment",
+    # historical_balances.py
+    "avg_historical_balance",
+    "min_historical_balance",
+    "max_historical_balance",
+    # negative_record.py
+    "count_negative_historical_balances",
+    "lowest_negative_historical_balance",
+    "average_negative_historical_balance",
+    "count_od_nsf",
+    "amount_od_nsf",
+    "max_od_nsf",
+    "min_od_nsf",
+    "avg_od_nsf",
+    "od_nsf_monthly_summary",
+    "days_since_od_nsf",
+    # unusual_account_activity.py
+    "num_outlier_transactions",
+]
+
+# Attributes that are a reduction over a group of transactions across accounts, as
+# (group, statistic)
+TRANSACTION_ATTRIBUTES = {
+    "num_inflows": ("inflows", "count"),
+    "total_inflows_amount": ("inflows", "total"),
+    "inflows_monthly_summary": ("inflows", "monthly"),
+    "num_outflows": ("outflows", "count"),
+    "total_outflows_amount": ("outflows", "total"),
+    "outflows_monthly_summary": ("outflows", "monthly"),
+    "num_transactions": ("transactions", "count"),
+    "net_cash_flow": ("transactions", "total"),
+    "cash_flow_monthly_summary": ("transactions", "monthly"),
+    "count_loan_disbursements": ("LOAN_DISBURSEMENTS", "count"),
+    "amount_loan_disbursements": ("LOAN_DISBURSEMENTS", "total"),
+    "max_loan_disbursements": ("LOAN_DISBURSEMENTS", "max"),
+    "min_loan_disbursements": ("LOAN_DISBURSEMENTS", "min"),
+    "avg_loan_disbursement": ("LOAN_DISBURSEMENTS", "average"),
+    "loan_disbursement_monthly_summary": ("LOAN_DISBURSEMENTS", "monthly"),
+    "days_since_loan_disbursement": ("LOAN_DISBURSEMENTS", "days_since"),
+    "count_loan_payments": ("LOAN_PAYMENTS", "count"),
+    "amount_loan_payments": ("LOAN_PAYMENTS", "total"),
+    "max_loan_payments": ("LOAN_PAYMENTS", "max"),
+    "min_loan_payments": ("LOAN_PAYMENTS", "min"),
+    "avg_loan_payment": ("LOAN_PAYMENTS", "average"),
+    "loan_payment_monthly_summary": ("LOAN_PAYMENTS", "monthly"),
+    "days_since_loan_payment": ("LOAN_PAYMENTS", "days_since"),
+    "count_od_nsf": ("BANK_PENALTIES", "count"),
+    "amount_od_nsf": ("BANK_PENALTIES", "total"),
+    "max_od_nsf": ("BANK_PENALTIES", "max"),
+    "min_od_nsf": ("BANK_PENALTIES", "min"),
+    "avg_od_nsf": ("BANK_PENALTIES", "average"),
+    "od_nsf_monthly_summary": ("BANK_PENALTIES", "monthly"),
+    "days_since_od_nsf": ("BANK_PENALTIES", "days_since"),
+}
+
+# Groups that only include transactions from depository accounts, in line with
+# debt_insights.py and negative_record.py. Historical balances are always
+# depository only.
+DEPOSITORY_ONLY_GROUPS = ["LOAN_DISBURSEMENTS", "BANK_PENALTIES"]
+
+# Attributes that are a statistic of the net historical balance across accounts
+BALANCE_ATTRIBUTES = {
+    "avg_historical_balance": "average",
+    "min_historical_balance": "min",
+    "max_historical_balance": "max",
+    "count_negative_historical_balances": "count_negative",
+    "lowest_negative_historical_balance": "lowest_negative",
+    "average_negative_historical_balance": "average_negative",
+}
+
+
+"""
+report_attributes_from_summaries composes the requested report attributes by merging
+the summaries of the accounts in the report, without rescanning any transactions
+
+Params
+* account_summaries: the AccountSummary of every account in the report, built with
+    summary.summarize_account
+* attributes: the names of the attributes to compute, from REPORT_ATTRIBUTES
+
+Returns
+* A map of attribute name to its value
+"""
+
+
+def report_attributes_from_summaries(
+    account_summaries: List[AccountSummary],
+    attributes: List[str] = REPORT_ATTRIBUTES,
+) -> Dict[str, Any]:
+    unknown_attributes = set(attributes) - set(REPORT_ATTRIBUTES)
+    if unknown_attributes:
+        raise ValueError(f"unknown attributes {sorted(unknown_attributes)}")
+
+    all_groups = []
+    depository_groups = []
+    for attribute in attributes:
+        if attribute not in TRANSACTION_ATTRIBUTES:
+            continue
+        group, _ = TRANSACTION_ATTRIBUTES[attribute]
+        groups = depository_groups if group in DEPOSITORY_ONLY_GROUPS else all_groups
+        if group not in groups:
+            groups.append(group)
+
+    transactions, num_outliers, _ = merge_account_summaries(
+        account_summaries, all_groups, include_balances=False
+    )
+    need_balances = any(attribute in BALANCE_ATTRIBUTES for attribute in attributes)
+    depository_transactions, _, balances = merge_account_summaries(
+        account_summaries,
+        depository_groups,
+        include_depository_only=True,
+        include_balances=need_balances,
+    )
+    transactions.update(depository_transactions)
+
+    results = {}
+    for attribute in attributes:
+        if attribute in TRANSACTION_ATTRIBUTES:
+            group, statistic = TRANSACTION_ATTRIBUTES[attribute]
+            results[attribute] = transaction_statistic(transactions[group], statistic)
+        elif attribute in BALANCE_ATTRIBUTES:
+            results[attribute] = balance_statistic(
+                balances, BALANCE_ATTRIBUTES[attribute]
+            )
+        elif attribute == "num_outlier_transactions":
+            results[attribute] = num_outliers
+    return results
+
+
+"""
+compute_report_attributes takes in an asset report and computes every requested report
+attribute by summarizing each account once and merging the account summaries
+
+Params
+* asset_report: the asset report retrieved through /asset_report/get
+* attributes: the names of the attributes to compute, from REPORT_ATTRIBUTES. Defaults
+    to every report level attribute
+* outlier_threshold: the threshold used by num_outlier_transactions
+
+Returns
+* A map of attribute name to its value
+"""
+
+
+def compute_report_attributes(
+    asset_report: AssetReport,
+    attributes: List[str] = REPORT_ATTRIBUTES,
+    outlier_threshold: float = 10000.00,
+) -> Dict[str, Any]:
+    unknown_attributes = set(attributes) - set(REPORT_ATTRIBUTES)
+    if unknown_attributes:
+        raise ValueError(f"unknown attributes {sorted(unknown_attributes)}")
+
+    # Only summarize the groups, monthly summaries and balances that were requested
+    groups, monthly_groups = requested_groups(attributes, TRANSACTION_ATTRIBUTES)
+    need_balances = any(attribute in BALANCE_ATTRIBUTES for attribute in attributes)
+
+    account_summaries = []
+    for item in asset_report.items:
+        for account in item.accounts:
+            account_summaries.append(
+                summarize_account(
+                    account,
+                    groups,
+                    monthly_groups,
+                    outlier_threshold
+                    if "num_outlier_transactions" in attributes
+                    else None,
+                    need_balances and str(account.type) == "depository",
+                )
+            )
+    return report_attributes_from_summaries(account_summaries, attributes)
+
+
+"""
+report_attributes_from_stream computes the requested report attributes from an
+AssetReportStream. Each account is summarized and discarded before the next one is
+read, so memory stays roughly constant with the number of transactions. Once it
+returns, the stream's asset_report_id is set
+
+Params
+* report_stream: the AssetReportStream over a raw /asset_report/get JSON response
+* attributes: the names of the attributes to compute, from REPORT_ATTRIBUTES
+* outlier_threshold: the threshold used by num_outlier_transactions
+
+Returns
+* A map of attribute name to its value
+"""
+
+
+def report_attributes_from_stream(
+    report_stream: AssetReportStream,
+    attributes: List[str] = REPORT_ATTRIBUTES,
+    outlier_threshold: float = 10000.00,
+) -> Dict[str, Any]:
+    unknown_attributes = set(attributes) - set(REPORT_ATTRIBUTES)
+    if unknown_attributes:
+        raise ValueError(f"unknown attributes {sorted(unknown_attributes)}")
+
+    groups, monthly_groups = requested_groups(attributes, TRANSACTION_ATTRIBUTES)
+    need_balances = any(attribute in BALANCE_ATTRIBUTES for attribute in attributes)
+    account_summaries = []
+    for account in report_stream.accounts():
+        account_summaries.append(
+            summarize_account(
+                account_from_json(account),
+                groups,
+                monthly_groups,
+                outlier_threshold
+                if "num_outlier_transactions" in attributes
+                else None,
+                need_balances and account.get("type") == "depository",
+            )
+        )
+    return report_attributes_from_summaries(account_summaries, attributes)
+
+
+"""
+compute_report_attributes_from_json computes the requested report attributes from a raw
+/asset_report/get JSON response, read incrementally with an AssetReportStream instead of
+building the plaid model objects. Gives the same values as compute_report_attributes
+
+Params
+* fp: a text file object with the JSON response
+* attributes: the names of the attributes to compute, from REPORT_ATTRIBUTES. Defaults
+    to every report level attribute
+* outlier_threshold: the threshold used by num_outlier_transactions
+
+Returns
+* A map of attribute name to its value
+"""
+
+
+def compute_report_attributes_from_json(
+    fp: IO[str],
+    attributes: List[str] = REPORT_ATTRIBUTES,
+    outlier_threshold: float = 10000.00,
+) -> Dict[str, Any]:
+    return report_attributes_from_stream(
+        AssetReportStream(fp), attributes, outlier_threshold
+    )
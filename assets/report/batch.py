@@ -0,0 +1,392 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+from sketch import AttributeSketches
+from stream import AssetReportStream
+from attributes import (
+    BALANCE_ATTRIBUTES,
+    REPORT_ATTRIBUTES,
+    TRANSACTION_ATTRIBUTES,
+    report_attributes_from_stream,
+)
+
+"""
+Batch scoring
+----------------------
+batch.py computes report level attributes for many stored /asset_report/get responses,
+fanning the reports out across a process pool and writing one row of attributes per
+report to CSV or Parquet. Reports are read with the streaming JSON ingestion, so no plaid
+model objects are built.
+
+Usage
+* python batch.py reports/ --output attributes.csv
+* python batch.py reports.jsonl --output attributes.csv --workers 8 --chunksize 64 \
+    --checkpoint attributes.checkpoint
+
+Input is either a directory of JSON files, one response per file, or a JSONL file with
+one response per line. With --checkpoint, the key of every report that has been written
+is recorded, and rerunning the same command skips those reports and appends to the
+existing output.
+"""
+
+# The columns written before the attributes in every row
+KEY_COLUMNS = ["report_key", "asset_report_id"]
+
+# Statistics written as integer columns. Monthly summaries are written as JSON strings
+# and every other statistic as a float column
+INTEGER_STATISTICS = {"count", "days_since", "count_negative"}
+
+
+"""
+iter_report_tasks lists the reports in a directory or JSONL file as (key, path, line)
+tasks. For a directory the key is the file name and the worker reads the file; for a
+JSONL file the key is the line number and the line itself is sent to the worker
+"""
+
+
+def iter_report_tasks(input_path: str) -> Iterator[Tuple[str, str, str]]:
+    if os.path.isdir(input_path):
+        for name in sorted(os.listdir(input_path)):
+            if name.endswith(".json"):
+                yield name, os.path.join(input_path, name), None
+        return
+    with open(input_path) as jsonl:
+        for line_number, line in enumerate(jsonl, start=1):
+            if line.strip():
+                yield str(line_number), None, line
+
+
+"""
+score_reports is run by the pool workers. It computes the attributes of a chunk of report
+tasks and returns, for every task, its key and either the row of attributes or the error
+that prevented scoring it
+"""
+
+
+def score_reports(
+    tasks: List[Tuple[str, str, str]],
+    attributes: List[str],
+    outlier_threshold: float,
+) -> List[Tuple[str, Dict[str, Any], str]]:
+    results = []
+    for key, path, line in tasks:
+        try:
+            if path is not None:
+                with open(path) as fp:
+                    report_stream = AssetReportStream(fp)
+                    values = report_attributes_from_stream(
+                        report_stream, attributes, outlier_threshold
+                    )
+            else:
+                report_stream = AssetReportStream(io.StringIO(line))
+                values = report_attributes_from_stream(
+                    report_stream, attributes, outlier_threshold
+                )
+        except Exception as error:
+            results.append((key, None, f"{type(error).__name__}: {error}"))
+            continue
+        row = {"report_key": key, "asset_report_id": report_stream.asset_report_id}
+        row.update(values)
+        results.append((key, row, None))
+    return results
+
+
+def _chunks(
+    tasks: Iterator[Tuple[str, str, str]],
+    chunksize: int,
+    completed: Set[str],
+    stats: Dict[str, float],
+) -> Iterator[List[Tuple[str, str, str]]]:
+    chunk = []
+    for task in tasks:
+        if task[0] in completed:
+            stats["skipped"] += 1
+            continue
+        chunk.append(task)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _cell(value: Any) -> Any:
+    # Monthly summaries are written as JSON objects
+    if isinstance(value, dict):
+        return json.dumps(value, sort_keys=True)
+    return value
+
+
+class _CsvWriter:
+    def __init__(self, path: str, columns: List[str]):
+        write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not write_header:
+            # Rows appended by a resumed run must line up with the existing header
+            with open(path, newline="") as existing:
+                header = next(csv.reader(existing), [])
+            if header != columns:
+                raise ValueError(
+                    f"{path} has the columns {header}, expected {columns}. Resume "
+                    "with the same attributes or write to a new output"
+                )
+        self.file = open(path, "a", newline="")
+        self.writer = csv.DictWriter(self.file, fieldnames=columns)
+        if write_header:
+            self.writer.writeheader()
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.writer.writerow(
+                {column: _cell(value) for column, value in row.items()}
+            )
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class _ParquetWriter:
+    # Parquet files can't be appended to, so every flush is written as a new part file
+    # in the output directory. A resumed run adds parts next to the existing ones
+    def __init__(self, path: str, columns: List[str]):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Parquet output requires pyarrow to be installed")
+        self.pyarrow = pyarrow
+        self.parquet = pyarrow.parquet
+        self.path = path
+        self.columns = columns
+        # Every part is written with the same schema, so that a column whose values
+        # are all missing, or all integers, in one part has the type it has in others
+        self.schema = pyarrow.schema(
+            [(column, _parquet_type(pyarrow, column)) for column in columns]
+        )
+        os.makedirs(path, exist_ok=True)
+        parts = sorted(name for name in os.listdir(path) if name.endswith(".parquet"))
+        if parts:
+            existing = self.parquet.read_schema(os.path.join(path, parts[-1]))
+            if not existing.equals(self.schema, check_metadata=False):
+                raise ValueError(
+                    f"{path} has parts with the columns {existing.names}, expected "
+                    f"{columns}. Resume with the same attributes or write to a new "
+                    "output"
+                )
+        self.part = len(os.listdir(path))
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        table = self.pyarrow.Table.from_pylist(
+            [{column: _cell(row[column]) for column in self.columns} for row in rows],
+            schema=self.schema,
+        )
+        self.parquet.write_table(
+            table, os.path.join(self.path, f"part-{self.part:05d}.parquet")
+        )
+        self.part += 1
+
+    def close(self) -> None:
+        pass
+
+
+def _parquet_type(pyarrow, column: str):
+    if column in KEY_COLUMNS:
+        return pyarrow.string()
+    if column in TRANSACTION_ATTRIBUTES:
+        statistic = TRANSACTION_ATTRIBUTES[column][1]
+    elif column in BALANCE_ATTRIBUTES:
+        statistic = BALANCE_ATTRIBUTES[column]
+    else:
+        # num_outlier_transactions
+        statistic = "count"
+    if statistic == "monthly":
+        return pyarrow.string()
+    if statistic in INTEGER_STATISTICS:
+        return pyarrow.int64()
+    return pyarrow.float64()
+
+
+def _read_checkpoint(checkpoint_path: str) -> Set[str]:
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return set()
+    with open(checkpoint_path) as checkpoint:
+        return {line.rstrip("\n") for line in checkpoint if line.strip()}
+
+
+"""
+run_batch scores every report in input_path and writes the rows to output_path
+
+Params
+* input_path: a directory of JSON responses or a JSONL file of responses
+* output_path: the CSV file, or the directory of Parquet part files, to write
+* output_format: "csv" or "parquet"
+* attributes: the report attributes to compute. Defaults to every report attribute
+* workers: the number of worker processes. Defaults to the number of CPUs
+* chunksize: the number of reports sent to a worker at a time
+* checkpoint_path: if set, the file used to record and skip already scored reports
+* outlier_threshold: the threshold used by num_outlier_transactions
+* report_every: the number of seconds between throughput reports on stderr
+* sketch_path: if set, the file to write a quantile sketch of every numeric attribute
+    to (see sketch.py). It is saved with every checkpoint, and a resumed run adds to
+    the sketches of the previous runs. Resuming without it raises a RuntimeError
+
+Returns
+* A map with the number of reports scored, failed and skipped, and the elapsed seconds
+"""
+
+
+def run_batch(
+    input_path: str,
+    output_path: str,
+    output_format: str = "csv",
+    attributes: List[str] = REPORT_ATTRIBUTES,
+    workers: int = None,
+    chunksize: int = 16,
+    checkpoint_path: str = None,
+    outlier_threshold: float = 10000.00,
+    report_every: float = 10.0,
+    sketch_path: str = None,
+) -> Dict[str, float]:
+    unknown_attributes = set(attributes) - set(REPORT_ATTRIBUTES)
+    if unknown_attributes:
+        raise ValueError(f"unknown attributes {sorted(unknown_attributes)}")
+
+    completed = _read_checkpoint(checkpoint_path)
+    # The sketches of a resumed run must include the reports already scored
+    if sketch_path and completed and not os.path.exists(sketch_path):
+        raise RuntimeError(
+            f"can't resume from {checkpoint_path} without the sketch file {sketch_path}"
+        )
+    columns = KEY_COLUMNS + list(attributes)
+    if output_format == "csv":
+        writer = _CsvWriter(output_path, columns)
+    elif output_format == "parquet":
+        writer = _ParquetWriter(output_path, columns)
+    else:
+        raise ValueError(f"unknown output format {output_format}")
+    checkpoint = open(checkpoint_path, "a") if checkpoint_path else None
+    sketches = None
+    if sketch_path:
+        if completed:
+            sketches = AttributeSketches.load(sketch_path)
+        else:
+            sketches = AttributeSketches()
+
+    stats = {"scored": 0, "failed": 0, "skipped": 0}
+    start = time.monotonic()
+    last_report = start
+    chunks = _chunks(iter_report_tasks(input_path), chunksize, completed, stats)
+    try:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Keep a bounded number of chunks in flight so that a large input is never
+            # read into memory all at once
+            max_pending = 2 * workers
+            pending = set()
+            while True:
+                for chunk in chunks:
+                    pending.add(
+                        executor.submit(
+                            score_reports, chunk, attributes, outlier_threshold
+                        )
+                    )
+                    if len(pending) >= max_pending:
+                        break
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    rows = []
+                    for key, row, error in future.result():
+                        if error is not None:
+                            stats["failed"] += 1
+                            print(f"failed to score {key}: {error}", file=sys.stderr)
+                        else:
+                            rows.append(row)
+                    writer.write(rows)
+                    stats["scored"] += len(rows)
+                    if sketches is not None:
+                        sketches.update_all(rows)
+                        sketches.save(sketch_path)
+                    # Only checkpoint reports once their rows and sketches have been
+                    # written
+                    if checkpoint is not None:
+                        for row in rows:
+                            checkpoint.write(row["report_key"] + "\n")
+                        checkpoint.flush()
+
+                now = time.monotonic()
+                if now - last_report >= report_every:
+                    last_report = now
+                    _report_throughput(stats, now - start)
+    finally:
+        writer.close()
+        if checkpoint is not None:
+            checkpoint.close()
+        # Saved with the rows written so far, so that a resumed run stays consistent
+        if sketches is not None:
+            sketches.save(sketch_path)
+
+    stats["seconds"] = time.monotonic() - start
+    _report_throughput(stats, stats["seconds"])
+    return stats
+
+
+def _report_throughput(stats: Dict[str, float], elapsed: float) -> None:
+    rate = stats["scored"] / elapsed if elapsed > 0 else 0.0
+    print(
+        f"scored {stats['scored']} reports ({stats['failed']} failed, "
+        f"{stats['skipped']} skipped) in {elapsed:.1f}s, {rate:.1f} reports/s",
+        file=sys.stderr,
+    )
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Compute report level attributes for a batch of asset reports"
+    )
+    parser.add_argument("input", help="a directory of JSON reports or a JSONL file")
+    parser.add_argument("--output", required=True, help="the output file or directory")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument(
+        "--attributes",
+        help="comma separated report attributes to compute (default: all)",
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=16)
+    parser.add_argument("--checkpoint", help="a file used to resume an interrupted run")
+    parser.add_argument("--outlier-threshold", type=float, default=10000.00)
+    parser.add_argument("--report-every", type=float, default=10.0)
+    parser.add_argument(
+        "--sketch-output", help="a file to write attribute quantile sketches to"
+    )
+    args = parser.parse_args(argv)
+
+    attributes = (
+        args.attributes.split(",") if args.attributes else list(REPORT_ATTRIBUTES)
+    )
+    run_batch(
+        args.input,
+        args.output,
+        output_format=args.format,
+        attributes=attributes,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        checkpoint_path=args.checkpoint,
+        outlier_threshold=args.outlier_threshold,
+        report_every=args.report_every,
+        sketch_path=args.sketch_output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from typing import Dict
 from plaid.model.asset_report import AssetReport
-from utils import calculate_monthly_summary_of_transactions
+from months import get_report_monthly_buckets
 
 """
 Count of inflows
@@ -47,13 +47,7 @@ month represented in the report
 
 
 def inflows_monthly_summary(asset_report: AssetReport) -> Dict[str, int]:
-    inflows = []
-    for item in asset_report.items:
-        for account in item.accounts:
-            for transaction in account.transactions:
-                if transaction.amount < 0:
-                    inflows.append(transaction)
-    return calculate_monthly_summary_of_transactions(inflows)
+    return get_report_monthly_buckets(asset_report).summary("inflows")
 
 
 """
@@ -101,13 +95,7 @@ month represented in the report
 
 
 def outflows_monthly_summary(asset_report: AssetReport) -> Dict[str, int]:
-    outflows = []
-    for item in asset_report.items:
-        for account in item.accounts:
-            for transaction in account.transactions:
-                if transaction.amount > 0:
-                    outflows.append(transaction)
-    return calculate_monthly_summary_of_transactions(outflows)
+    return get_report_monthly_buckets(asset_report).summary("outflows")
 
 
 """
@@ -153,9 +141,4 @@ month represented in the report
 
 
 def cash_flow_monthly_summary(asset_report: AssetReport) -> Dict[str, int]:
-    transactions = []
-    for item in asset_report.items:
-        for account in item.accounts:
-            for transaction in account.transactions:
-                transactions.append(transaction)
-    return calculate_monthly_summary_of_transactions(transactions)
+    return get_report_monthly_buckets(asset_report).summary("net")
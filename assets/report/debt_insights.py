@@ -1,10 +1,10 @@
 from typing import Dict
 from plaid.model.asset_report import AssetReport
 from datetime import date
+from months import net_monthly_summary
 from utils import (
     calculate_user_historical_balances,
     filter_report_transactions_by_category,
-    calculate_monthly_summary_of_transactions,
     get_most_recent_transaction,
 )
 
@@ -104,7 +104,7 @@ def loan_disbursement_monthly_summary(asset_report: AssetReport) -> Dict[str, fl
     loan_disbursement_transactions = filter_report_transactions_by_category(
         asset_report, "LOAN_DISBURSEMENTS", include_depository_only=True
     )
-    return calculate_monthly_summary_of_transactions(loan_disbursement_transactions)
+    return net_monthly_summary(loan_disbursement_transactions)
 
 
 """
@@ -218,7 +218,7 @@ def loan_payment_monthly_summary(asset_report: AssetReport) -> Dict[str, float]:
     loan_payment_transactions = filter_report_transactions_by_category(
         asset_report, "LOAN_PAYMENTS"
     )
-    return calculate_monthly_summary_of_transactions(loan_payment_transactions)
+    return net_monthly_summary(loan_payment_transactions)
 
 
 """
@@ -0,0 +1,255 @@
+from typing import Dict, Tuple
+
+import numpy as np
+
+from frame import (
+    TransactionFrame,
+    avg_or_zero,
+    max_or_zero,
+    min_or_zero,
+    monthly_summary_of_columns,
+    days_since_most_recent_date,
+    sum_balances_by_date,
+)
+
+"""
+Vectorized report level attributes
+----------------------
+Every function in this file is a vectorized version of the function with the same
+name in the report level attribute files. Instead of an AssetReport, each takes in a
+TransactionFrame built once per report with frame.build_transaction_frame. Values
+match the original functions up to floating point rounding.
+"""
+
+
+def _category_transactions(
+    frame: TransactionFrame, primary_category: str, include_depository_only: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    code = frame.primary_code(primary_category)
+    if code == -1:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype="datetime64[D]")
+    mask = frame.primary_codes == code
+    if include_depository_only:
+        mask &= frame.depository[frame.transaction_accounts()]
+    return frame.amounts[mask], frame.dates[mask]
+
+
+def _user_historical_balances(frame: TransactionFrame) -> np.ndarray:
+    # The net balance across all depository accounts for every date in the report
+    depository = frame.depository[frame.balance_accounts()]
+    _, totals = sum_balances_by_date(
+        frame.balance_dates[depository], frame.balance_amounts[depository]
+    )
+    return totals
+
+
+"""
+Cash Flow
+----------------------
+vectorized versions of the attributes in cash_flow.py
+"""
+
+
+def num_inflows(frame: TransactionFrame) -> int:
+    return int(np.count_nonzero(frame.amounts < 0))
+
+
+def total_inflows_amount(frame: TransactionFrame) -> float:
+    return float(frame.amounts[frame.amounts < 0].sum())
+
+
+def inflows_monthly_summary(frame: TransactionFrame) -> Dict[str, float]:
+    inflows = frame.amounts < 0
+    return monthly_summary_of_columns(frame.dates[inflows], frame.amounts[inflows])
+
+
+def num_outflows(frame: TransactionFrame) -> int:
+    return int(np.count_nonzero(frame.amounts > 0))
+
+
+def total_outflows_amount(frame: TransactionFrame) -> float:
+    return float(frame.amounts[frame.amounts > 0].sum())
+
+
+def outflows_monthly_summary(frame: TransactionFrame) -> Dict[str, float]:
+    outflows = frame.amounts > 0
+    return monthly_summary_of_columns(frame.dates[outflows], frame.amounts[outflows])
+
+
+def num_transactions(frame: TransactionFrame) -> int:
+    return len(frame.amounts)
+
+
+def net_cash_flow(frame: TransactionFrame) -> float:
+    return float(frame.amounts.sum())
+
+
+def cash_flow_monthly_summary(frame: TransactionFrame) -> Dict[str, float]:
+    return monthly_summary_of_columns(frame.dates, frame.amounts)
+
+
+"""
+Debt Insights
+----------------------
+vectorized versions of the attributes in debt_insights.py
+"""
+
+
+def count_loan_disbursements(frame: TransactionFrame) -> int:
+    amounts, _ = _category_transactions(frame, "LOAN_DISBURSEMENTS", True)
+    return len(amounts)
+
+
+def amount_loan_disbursements(frame: TransactionFrame) -> float:
+    amounts, _ = _category_transactions(frame, "LOAN_DISBURSEMENTS", True)
+    return float(amounts.sum())
+
+
+def max_loan_disbursements(frame: TransactionFrame) -> float:
+    amounts, _ = _category_transactions(frame, "LOAN_DISBURSEMENTS", True)
+    return max_or_zero(amounts)
+
+
+def min_loan_disbursements(frame: TransactionFrame) -> float:
+    amounts, _ = _category_transactions(frame, "LOAN_DISBURSEMENTS", True)
+    return min_or_zero(amounts)
+
+
+def avg_loan_disbursement(frame: TransactionFrame) -> float:
+    amounts, _ = _category_transactions(frame, "LOAN_DISBURSEMENTS", True)
+    return avg_or_zero(amounts)
+
+
+def loan_disbursement_monthly_summary(frame: TransactionFrame) -> Dict[str, float]:
+    amounts, dates = _category_transactions(frame, "LOAN_DISBURSEMENTS", True)
+    return monthly_summary_of_columns(dates, amounts)
+
+
+def days_since_loan_disbursement(frame: TransactionFrame) -> int:
+    _, dates = _category_transactions(frame, "LOAN_DISBURSEMENTS", True)
+    return days_since_most_recent_date(dates)
+
+
+def count_loan_payments(frame: TransactionFrame) -> int:
+    amounts, _ = _category_transactions(frame, "LOAN_PAYMENTS")
+    return len(amounts)
+
+
+def amount_loan_payments(frame: TransactionFrame) -> float:
+    amounts, _ = _category_transactions(frame, "LOAN_PAYMENTS")
+    return float(amounts.sum())
+
+
+def max_loan_payments(frame: TransactionFrame) -> float:
+    amounts, _ = _category_transactions(frame, "LOAN_PAYMENTS")
+    return max_or_zero(amounts)
+
+
+def min_loan_payments(frame: TransactionFrame) -> float:
+    amounts, _ = _category_transactions(frame, "LOAN_PAYMENTS")
+    return min_or_zero(amounts)
+
+
+def avg_loan_payment(frame: TransactionFrame) -> float:
+    amounts, _ = _category_transactions(frame, "LOAN_PAYMENTS")
+    return avg_or_zero(amounts)
+
+
+def loan_payment_monthly_summary(frame: TransactionFrame) -> Dict[str, float]:
+    amounts, dates = _category_transactions(frame, "LOAN_PAYMENTS")
+    return monthly_summary_of_columns(dates, amounts)
+
+
+def days_since_loan_payment(frame: TransactionFrame) -> int:
+    _, dates = _category_transactions(frame, "LOAN_PAYMENTS")
+    return days_since_most_recent_date(dates)
+
+
+"""
+Historical Balances
+----------------------
+vectorized versions of the attributes in historical_balances.py
+"""
+
+
+def avg_historical_balance(frame: TransactionFrame) -> float:
+    user_historical_balances = _user_historical_balances(frame)
+    if len(user_historical_balances) == 0:
+        raise ZeroDivisionError("report has no depository historical balances")
+    return float(user_historical_balances.mean())
+
+
+def min_historical_balance(frame: TransactionFrame) -> float:
+    return float(_user_historical_balances(frame).min())
+
+
+def max_historical_balance(frame: TransactionFrame) -> float:
+    return float(_user_historical_balances(frame).max())
+
+
+"""
+Negative Records
+----------------------
+vectorized versions of the attributes in negative_record.py
+"""
+
+
+def count_negative_historical_balances(frame: TransactionFrame) -> int:
+    return int(np.count_nonzero(_user_historical_balances(frame) < 0))
+
+
+def lowest_negative_historical_balance(frame: TransactionFrame) -> float:
+    return min(min_or_zero(_user_historical_balances(frame)), 0.0)
+
+
+def average_negative_historical_balance(frame: TransactionFrame) -> float:
+    user_historical_balances = _user_historical_balances(frame)
+    return avg_or_zero(user_historical_balances[user_historical_balances < 0])
+
+
+def count_od_nsf(frame: TransactionFrame) -> int:
+    amounts, _ = _category_transactions(frame, "BANK_PENALTIES", True)
+    return len(amounts)
+
+
+def amount_od_nsf(frame: TransactionFrame) -> float:
+    amounts, _ = _category_transactions(frame, "BANK_PENALTIES", True)
+    return float(amounts.sum())
+
+
+def max_od_nsf(frame: TransactionFrame) -> float:
+    amounts, _ = _category_transactions(frame, "BANK_PENALTIES", True)
+    return max_or_zero(amounts)
+
+
+def min_od_nsf(frame: TransactionFrame) -> float:
+    amounts, _ = _category_transactions(frame, "BANK_PENALTIES", True)
+    return min_or_zero(amounts)
+
+
+def avg_od_nsf(frame: TransactionFrame) -> float:
+    amounts, _ = _category_transactions(frame, "BANK_PENALTIES", True)
+    return avg_or_zero(amounts)
+
+
+def od_nsf_monthly_summary(frame: TransactionFrame) -> Dict[str, float]:
+    amounts, dates = _category_transactions(frame, "BANK_PENALTIES", True)
+    return monthly_summary_of_columns(dates, amounts)
+
+
+def days_since_od_nsf(frame: TransactionFrame) -> int:
+    _, dates = _category_transactions(frame, "BANK_PENALTIES", True)
+    return days_since_most_recent_date(dates)
+
+
+"""
+Unusual Account Activity
+----------------------
+vectorized versions of the attributes in unusual_account_activity.py
+"""
+
+
+def num_outlier_transactions(
+    frame: TransactionFrame, outlier_threshold: float = 10000.00
+) -> int:
+    return int(np.count_nonzero(np.abs(frame.amounts) > outlier_threshold))
@@ -1,6 +1,9 @@
+from typing import Dict
+
 from plaid.model.asset_report import AssetReport
-from attributes.utils import (
-    calculate_user_historical_balances,
+from balances import balance_attributes, get_report_dense_balances
+from utils import (
+    cached_user_historical_balances,
 )
 
 """
@@ -12,7 +15,7 @@ accounts in the report
 
 
 def avg_historical_balance(asset_report: AssetReport) -> int:
-    user_historical_balances = calculate_user_historical_balances(asset_report, True)
+    user_historical_balances = cached_user_historical_balances(asset_report, True)
     return sum(user_historical_balances.values()) / len(user_historical_balances)
 
 
@@ -25,7 +28,7 @@ accounts in the report
 
 
 def min_historical_balance(asset_report: AssetReport) -> float:
-    user_historical_balances = calculate_user_historical_balances(asset_report, True)
+    user_historical_balances = cached_user_historical_balances(asset_report, True)
     return min(user_historical_balances.values())
 
 
@@ -38,5 +41,25 @@ accounts in the report
 
 
 def max_historical_balance(asset_report: AssetReport) -> float:
-    user_historical_balances = calculate_user_historical_balances(asset_report, True)
+    user_historical_balances = cached_user_historical_balances(asset_report, True)
     return max(user_historical_balances.values())
+
+
+"""
+Historical Balance Attributes
+----------------------
+historical_balance_attributes returns avg_historical_balance, min_historical_balance,
+max_historical_balance and the negative balance attributes of negative_record.py across
+all depository accounts in the report, computed from a dense array of daily balances
+with a single NumPy reduction each. gap_policy sets how days an account has no balance
+for are treated (see balances.py). With the default "skip", values match the functions
+above up to floating point rounding, and like them it raises a ValueError if the report
+has no depository balances
+"""
+
+
+def historical_balance_attributes(
+    asset_report: AssetReport, gap_policy: str = "skip"
+) -> Dict[str, float]:
+    dense_balances = get_report_dense_balances(asset_report, True)
+    return balance_attributes(dense_balances.totals(gap_policy))
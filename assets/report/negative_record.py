@@ -1,10 +1,11 @@
 from plaid.model.asset_report import AssetReport
 from datetime import date
 from typing import Dict
+from balances import get_report_dense_balances, negative_balance_attributes
+from months import net_monthly_summary
 from utils import (
-    calculate_user_historical_balances,
+    cached_user_historical_balances,
     filter_report_transactions_by_category,
-    calculate_monthly_summary_of_transactions,
     get_most_recent_transaction,
 )
 
@@ -17,7 +18,7 @@ user had a negative daily ending balance across all their accounts
 
 
 def count_negative_historical_balances(asset_report: AssetReport) -> int:
-    user_historical_balances = calculate_user_historical_balances(asset_report, True)
+    user_historical_balances = cached_user_historical_balances(asset_report, True)
     count = 0
     for date, balance in user_historical_balances.items():
         if balance < 0:
@@ -35,7 +36,7 @@ a negative balance, then this value will be 0.0
 
 
 def lowest_negative_historical_balance(asset_report: AssetReport) -> float:
-    user_historical_balances = calculate_user_historical_balances(asset_report, True)
+    user_historical_balances = cached_user_historical_balances(asset_report, True)
     min_balance = 0.0
     for balance in user_historical_balances.values():
         min_balance = min(balance, min_balance)
@@ -52,7 +53,7 @@ any negative balances, then this value will be 0.0
 
 
 def average_negative_historical_balance(asset_report: AssetReport) -> float:
-    user_historical_balances = calculate_user_historical_balances(asset_report, True)
+    user_historical_balances = cached_user_historical_balances(asset_report, True)
     total_negative_historical_balance = 0.0
     num_negative_historical_balance = 0
     for balance in user_historical_balances.values():
@@ -65,6 +66,95 @@ def average_negative_historical_balance(asset_report: AssetReport) -> float:
     return total_negative_historical_balance / num_negative_historical_balance
 
 
+"""
+Longest Negative Balance Streak
+----------------------
+longest_negative_balance_streak returns the largest number of consecutive days on
+which the user had a negative daily ending balance across all their depository
+accounts. A day without a balance ends the streak, unless gap_policy fills it in (see
+balances.py)
+"""
+
+
+def longest_negative_balance_streak(
+    asset_report: AssetReport, gap_policy: str = "skip", as_of: date = None
+) -> int:
+    return negative_balance_run_attributes(asset_report, gap_policy, as_of)[
+        "longest_negative_balance_streak"
+    ]
+
+
+"""
+Number of Negative Balance Episodes
+----------------------
+num_negative_balance_episodes returns the number of distinct streaks of consecutive
+days on which the user had a negative daily ending balance across all their depository
+accounts
+"""
+
+
+def num_negative_balance_episodes(
+    asset_report: AssetReport, gap_policy: str = "skip", as_of: date = None
+) -> int:
+    return negative_balance_run_attributes(asset_report, gap_policy, as_of)[
+        "num_negative_balance_episodes"
+    ]
+
+
+"""
+Days Since Most Recent Negative Balance
+----------------------
+days_since_negative_balance returns the number of days since the user last had a
+negative daily ending balance across all their depository accounts, counted to as_of
+(today by default). If the user doesn't have a negative balance, then this value will
+be 0
+"""
+
+
+def days_since_negative_balance(
+    asset_report: AssetReport, gap_policy: str = "skip", as_of: date = None
+) -> int:
+    return negative_balance_run_attributes(asset_report, gap_policy, as_of)[
+        "days_since_negative_balance"
+    ]
+
+
+"""
+Average Negative Balance Episode Depth
+----------------------
+average_negative_episode_depth returns the average over every streak of negative
+balances across all their depository accounts of the lowest balance in the streak. If
+the user doesn't have a negative balance, then this value will be 0.0
+"""
+
+
+def average_negative_episode_depth(
+    asset_report: AssetReport, gap_policy: str = "skip", as_of: date = None
+) -> float:
+    return negative_balance_run_attributes(asset_report, gap_policy, as_of)[
+        "average_negative_episode_depth"
+    ]
+
+
+"""
+Negative Balance Run Attributes
+----------------------
+negative_balance_run_attributes returns the count, lowest and average negative balance
+and the four streak attributes above, computed together in one vectorized pass over
+the daily net balances of all depository accounts in the report. The result is kept
+with the daily balances, so the functions above share one pass for the same gap_policy
+and as_of. To read several attributes, call this function once
+"""
+
+
+def negative_balance_run_attributes(
+    asset_report: AssetReport, gap_policy: str = "skip", as_of: date = None
+) -> Dict[str, float]:
+    return negative_balance_attributes(
+        get_report_dense_balances(asset_report, True), gap_policy, as_of
+    )
+
+
 """
 Count of Overdraft/NSF
 ----------------------
@@ -161,7 +251,7 @@ def od_nsf_monthly_summary(asset_report: AssetReport) -> Dict[str, float]:
     od_nsf_transactions = filter_report_transactions_by_category(
         asset_report, "BANK_PENALTIES", include_depository_only=True
     )
-    return calculate_monthly_summary_of_transactions(od_nsf_transactions)
+    return net_monthly_summary(od_nsf_transactions)
 
 
 """
@@ -0,0 +1,492 @@
+import argparse
+import asyncio
+import importlib.util
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Tuple
+
+from plaid.configuration import Configuration
+from plaid.model.credit_bank_income_get_response import CreditBankIncomeGetResponse
+from plaid.model_utils import validate_and_convert_types
+from sketch import AttributeSketches
+from stream import AssetReportStream
+from attributes import REPORT_ATTRIBUTES, report_attributes_from_stream
+
+"""
+Fetch and score pipeline
+----------------------
+pipeline.py fetches /asset_report/get (or /credit/bank_income/get) responses over a
+pool of keep-alive HTTP connections and scores each response in a worker pool as
+soon as it arrives, yielding the rows of attributes as they are computed instead of
+fetching and scoring one report at a time.
+
+* ConnectionPool reuses up to `size` connections to one host. It uses httpx, which is
+    an optional dependency needed only by the pipeline
+* score_report_tokens runs the pipeline. At most `concurrency` reports are fetched or
+    scored at once, and finished rows wait in a queue of `queue_size` rows. A consumer
+    that stops reading rows fills the queue, which stops new fetches (backpressure)
+* StubServer serves canned responses on a local port, for testing and benchmarking the
+    pipeline without the Plaid API
+* PipelineStats records end-to-end throughput: reports and bytes per second over the
+    whole run, as well as the fetch latency and the time spent scoring
+
+Usage
+* python pipeline.py reports.jsonl --concurrency 64 --workers 8 --latency 0.05
+    serves every response in reports.jsonl (e.g. written by synthetic.py) from a stub
+    server, runs the pipeline against it and prints the throughput
+"""
+
+# The endpoint of every product, and the request field holding the token of a report
+ENDPOINTS = {
+    "asset_report": ("/asset_report/get", "asset_report_token"),
+    "bank_income": ("/credit/bank_income/get", "user_token"),
+}
+
+
+"""
+ConnectionPool sends requests to a single host over at most `size` keep-alive
+connections. It is a thin wrapper around an httpx AsyncClient, so the pipeline requires
+httpx to be installed
+
+Params
+* url: the base URL of the server, e.g. https://production.plaid.com
+* size: the maximum number of open connections
+* timeout: the number of seconds to wait for a response
+"""
+
+
+class ConnectionPool:
+    def __init__(self, url: str, size: int = 16, timeout: float = 60.0):
+        try:
+            import httpx
+        except ImportError:
+            raise RuntimeError("the fetch and score pipeline requires httpx")
+        self.url = url
+        self.size = size
+        self.client = httpx.AsyncClient(
+            base_url=url,
+            limits=httpx.Limits(max_connections=size, max_keepalive_connections=size),
+            timeout=timeout,
+        )
+
+    async def post_json(self, path: str, payload: Dict[str, Any]) -> bytes:
+        response = await self.client.post(path, json=payload)
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"HTTP {response.status_code}: "
+                f"{response.content[:200].decode(errors='replace')}"
+            )
+        return response.content
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+"""
+PipelineStats records the throughput of a pipeline run. reports_per_second and
+megabytes_per_second cover the whole run, from the first fetch to the last row read.
+score_seconds adds up the time every report spent in the worker pool, including the
+time it waited for a free worker. connections_opened is only known against a
+StubServer, which counts the connections it accepts
+"""
+
+
+class PipelineStats:
+    def __init__(self):
+        self.fetched = 0
+        self.scored = 0
+        self.failed = 0
+        self.bytes_fetched = 0
+        self.fetch_latencies = []
+        self.score_seconds = 0.0
+        self.connections_opened = 0
+        self.start = time.monotonic()
+        self.end = None
+
+    @property
+    def seconds(self) -> float:
+        return (self.end or time.monotonic()) - self.start
+
+    def to_dict(self) -> Dict[str, float]:
+        seconds = self.seconds
+        latencies = sorted(self.fetch_latencies)
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+        return {
+            "fetched": self.fetched,
+            "scored": self.scored,
+            "failed": self.failed,
+            "seconds": seconds,
+            "reports_per_second": self.scored / seconds if seconds > 0 else 0.0,
+            "megabytes_per_second": (
+                self.bytes_fetched / seconds / 1e6 if seconds > 0 else 0.0
+            ),
+            "fetch_p50_seconds": percentile(0.5),
+            "fetch_p99_seconds": percentile(0.99),
+            "score_seconds": self.score_seconds,
+            "connections_opened": self.connections_opened,
+        }
+
+
+"""
+score_asset_report_response is the default scoring function of the pipeline, run in the
+worker pool. It computes the report attributes of a raw /asset_report/get response with
+the streaming JSON ingestion, without building plaid model objects
+"""
+
+
+def score_asset_report_response(
+    body: bytes,
+    attributes: List[str] = REPORT_ATTRIBUTES,
+    outlier_threshold: float = 10000.00,
+) -> Dict[str, Any]:
+    report_stream = AssetReportStream(io.StringIO(body.decode()))
+    values = report_attributes_from_stream(report_stream, attributes, outlier_threshold)
+    row = {"asset_report_id": report_stream.asset_report_id}
+    row.update(values)
+    return row
+
+
+# The directory of the Bank Income attribute files, which use flat imports of their own
+BANK_INCOME_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "bank_income",
+)
+
+
+def _load_bank_income_registry():
+    # Loaded under its own name, since the report directory has a registry.py too
+    module = sys.modules.get("bank_income_registry")
+    if module is None:
+        if BANK_INCOME_DIRECTORY not in sys.path:
+            sys.path.append(BANK_INCOME_DIRECTORY)
+        spec = importlib.util.spec_from_file_location(
+            "bank_income_registry", os.path.join(BANK_INCOME_DIRECTORY, "registry.py")
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules["bank_income_registry"] = module
+    return module
+
+
+"""
+score_bank_income_response is the scoring function of the pipeline for the bank_income
+product, run in the worker pool. It computes the Bank Income attributes of the most
+recently generated report in a raw /credit/bank_income/get response through
+evaluate_bank_income_attributes
+
+Params
+* body: the raw /credit/bank_income/get response
+* attributes: the Bank Income attributes to compute. Defaults to every registered
+    attribute
+* parameters: overrides of the windows and categories, as in monthly_average.py
+
+Returns
+* A row with the bank_income_id of the report and every computed attribute
+"""
+
+
+def score_bank_income_response(
+    body: bytes, attributes: List[str] = None, **parameters: Any
+) -> Dict[str, Any]:
+    registry = _load_bank_income_registry()
+    response = validate_and_convert_types(
+        json.loads(body),
+        (CreditBankIncomeGetResponse,),
+        ["response"],
+        True,
+        True,
+        Configuration(),
+    )
+    if not response.bank_income:
+        raise RuntimeError("the response has no Bank Income report")
+    report = max(response.bank_income, key=lambda report: report.generated_time)
+    row = {"bank_income_id": report.bank_income_id}
+    row.update(
+        registry.evaluate_bank_income_attributes(report, attributes, **parameters)
+    )
+    return row
+
+
+"""
+score_report_tokens fetches the report of every token and scores it, yielding a
+(token, row, error) tuple per report as soon as it has been scored. Rows are yielded in
+completion order, not token order, and error is None unless fetching or scoring failed
+
+Params
+* pool: the ConnectionPool to fetch with
+* tokens: the asset report tokens (or user tokens for bank_income) to fetch
+* credentials: the client_id and secret sent with every request
+* product: a key of ENDPOINTS
+* score: a function from a raw response body to a row of attributes, run in the
+    executor. Defaults to the report attributes of an asset report. Use
+    score_bank_income_response for the bank_income product
+* executor: the worker pool to score in. Defaults to a process pool of `workers`
+* workers: the number of worker processes of the default executor
+* concurrency: the maximum number of reports being fetched or scored at once
+* queue_size: the maximum number of scored rows waiting to be read
+* stats: a PipelineStats to record the run in
+"""
+
+
+async def score_report_tokens(
+    pool: ConnectionPool,
+    tokens: Iterable[str],
+    credentials: Dict[str, str] = None,
+    product: str = "asset_report",
+    score: Callable[[bytes], Dict[str, Any]] = score_asset_report_response,
+    executor: Executor = None,
+    workers: int = None,
+    concurrency: int = 32,
+    queue_size: int = 64,
+    stats: PipelineStats = None,
+) -> AsyncIterator[Tuple[str, Dict[str, Any], str]]:
+    if product not in ENDPOINTS:
+        raise ValueError(f"unknown product {product}")
+    path, token_field = ENDPOINTS[product]
+    stats = stats if stats is not None else PipelineStats()
+    loop = asyncio.get_running_loop()
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+
+    results = asyncio.Queue(maxsize=queue_size)
+    in_flight = asyncio.Semaphore(concurrency)
+    done = object()
+
+    async def process(token: str) -> None:
+        try:
+            start = time.monotonic()
+            body = await pool.post_json(
+                path, {**(credentials or {}), token_field: token}
+            )
+            stats.fetch_latencies.append(time.monotonic() - start)
+            stats.fetched += 1
+            stats.bytes_fetched += len(body)
+
+            start = time.monotonic()
+            row = await loop.run_in_executor(executor, score, body)
+            stats.score_seconds += time.monotonic() - start
+            stats.scored += 1
+            # Waits while the queue is full, holding this report's place in flight
+            await results.put((token, row, None))
+        except Exception as error:
+            stats.failed += 1
+            await results.put((token, None, f"{type(error).__name__}: {error}"))
+        finally:
+            in_flight.release()
+
+    async def produce() -> None:
+        tasks = set()
+        cancelled = False
+        try:
+            for token in tokens:
+                await in_flight.acquire()
+                task = asyncio.ensure_future(process(token))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            # Reports still in flight when the consumer stops, or when reading tokens
+            # fails, are cancelled rather than left running
+            pending = list(tasks)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            # Once cancelled nothing reads the queue, and a full queue would block here
+            if not cancelled:
+                await results.put(done)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            result = await results.get()
+            if result is done:
+                break
+            yield result
+        await producer
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+        stats.end = time.monotonic()
+        if own_executor:
+            executor.shutdown(wait=False)
+
+
+"""
+StubServer is a local HTTP/1.1 keep-alive server that answers every POST with the
+canned response of the token in the request, or a 400 error if it has none
+
+Params
+* responses: a map of token to the raw JSON response to serve for it
+* latency: the number of seconds to wait before answering each request
+"""
+
+
+class StubServer:
+    def __init__(self, responses: Dict[str, bytes], latency: float = 0.0):
+        self.responses = responses
+        self.latency = latency
+        self.requests = 0
+        self.connections = 0
+        self.server = None
+        self.port = None
+        self._handlers = {}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        self.server = await asyncio.start_server(self._serve, host, port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def close(self) -> None:
+        self.server.close()
+        # Closing the open connections ends their handlers at the next request
+        for writer in self._handlers.values():
+            writer.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        handler = asyncio.current_task()
+        self._handlers[handler] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = await _read_headers(reader)
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                status, response = self._respond(body)
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {'OK' if status == 200 else 'Bad Request'}"
+                        f"\r\nContent-Type: application/json"
+                        f"\r\nContent-Length: {len(response)}\r\n\r\n"
+                    ).encode("latin-1")
+                    + response
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self._handlers[handler]
+            writer.close()
+
+    def _respond(self, body: bytes) -> Tuple[int, bytes]:
+        try:
+            request = json.loads(body)
+        except ValueError:
+            request = {}
+        for _, token_field in ENDPOINTS.values():
+            if request.get(token_field) in self.responses:
+                return 200, self.responses[request[token_field]]
+        error = {"error_type": "INVALID_INPUT", "error_code": "INVALID_TOKEN"}
+        return 400, json.dumps(error).encode()
+
+
+async def _run_stub_benchmark(
+    responses: List[bytes],
+    concurrency: int,
+    workers: int,
+    connections: int,
+    latency: float,
+    output_path: str,
+    sketch_path: str = None,
+) -> Dict[str, float]:
+    tokens = [f"assets-stub-{index}" for index in range(len(responses))]
+    server = StubServer(dict(zip(tokens, responses)), latency)
+    port = await server.start()
+    pool = ConnectionPool(f"http://127.0.0.1:{port}", size=connections)
+    stats = PipelineStats()
+    output = open(output_path, "w") if output_path else None
+    sketches = AttributeSketches() if sketch_path else None
+    try:
+        async for token, row, error in score_report_tokens(
+            pool,
+            tokens,
+            {"client_id": "stub", "secret": "stub"},
+            workers=workers,
+            concurrency=concurrency,
+            stats=stats,
+        ):
+            if error is not None:
+                print(f"failed to score {token}: {error}", file=sys.stderr)
+                continue
+            if output is not None:
+                output.write(json.dumps({"token": token, **row}) + "\n")
+            if sketches is not None:
+                sketches.update(row)
+    finally:
+        if output is not None:
+            output.close()
+        await pool.close()
+        await server.close()
+        stats.connections_opened = server.connections
+        if sketches is not None:
+            sketches.save(sketch_path)
+    return stats.to_dict()
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the fetch and score pipeline against a local stub server"
+    )
+    parser.add_argument("input", help="a JSONL file of /asset_report/get responses")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds of simulated latency"
+    )
+    parser.add_argument("--output", help="a JSONL file to write the rows to")
+    parser.add_argument(
+        "--sketch-output", help="a file to write attribute quantile sketches to"
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.input, "rb") as jsonl:
+        responses = [line.strip() for line in jsonl if line.strip()]
+    stats = asyncio.run(
+        _run_stub_benchmark(
+            responses,
+            args.concurrency,
+            args.workers,
+            args.connections,
+            args.latency,
+            args.output,
+            args.sketch_output,
+        )
+    )
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
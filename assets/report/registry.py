@@ -0,0 +1,115 @@
+from typing import Any, Dict, List
+from plaid.model.asset_report import AssetReport
+from plaid.model.asset_report_transaction import AssetReportTransaction
+from attribute_graph import AttributeRegistry
+from attribute_registry import register_reductions
+from attributes import TRANSACTION_ATTRIBUTES, BALANCE_ATTRIBUTES
+from utils import (
+    calculate_user_historical_balances,
+    filter_report_transactions_by_category,
+)
+
+"""
+REPORT_REGISTRY declares every report level attribute as a reduction of shared
+intermediates: the transactions of the report and their inflow and outflow partitions,
+the loan disbursement, loan payment and OD/NSF transactions, and the user's net daily
+balances across depository accounts. evaluate_report_attributes only computes the
+intermediates that the requested attributes read, each once per report.
+"""
+
+REPORT_REGISTRY = AttributeRegistry(parameters={"outlier_threshold": 10000.00})
+
+
+@REPORT_REGISTRY.intermediate("transactions", "source")
+def _transactions(asset_report: AssetReport) -> List[AssetReportTransaction]:
+    transactions = []
+    for item in asset_report.items:
+        for account in item.accounts:
+            transactions.extend(account.transactions)
+    return transactions
+
+
+@REPORT_REGISTRY.intermediate("inflows", "transactions")
+def _inflows(
+    transactions: List[AssetReportTransaction],
+) -> List[AssetReportTransaction]:
+    return [transaction for transaction in transactions if transaction.amount < 0]
+
+
+@REPORT_REGISTRY.intermediate("outflows", "transactions")
+def _outflows(
+    transactions: List[AssetReportTransaction],
+) -> List[AssetReportTransaction]:
+    return [transaction for transaction in transactions if transaction.amount > 0]
+
+
+@REPORT_REGISTRY.intermediate("LOAN_DISBURSEMENTS", "source")
+def _loan_disbursements(asset_report: AssetReport) -> List[AssetReportTransaction]:
+    return filter_report_transactions_by_category(
+        asset_report, "LOAN_DISBURSEMENTS", include_depository_only=True
+    )
+
+
+@REPORT_REGISTRY.intermediate("LOAN_PAYMENTS", "source")
+def _loan_payments(asset_report: AssetReport) -> List[AssetReportTransaction]:
+    return filter_report_transactions_by_category(asset_report, "LOAN_PAYMENTS")
+
+
+@REPORT_REGISTRY.intermediate("BANK_PENALTIES", "source")
+def _od_nsf(asset_report: AssetReport) -> List[AssetReportTransaction]:
+    return filter_report_transactions_by_category(
+        asset_report, "BANK_PENALTIES", include_depository_only=True
+    )
+
+
+@REPORT_REGISTRY.intermediate("balances", "source")
+def _balances(asset_report: AssetReport) -> List[float]:
+    return list(calculate_user_historical_balances(asset_report, True).values())
+
+
+@REPORT_REGISTRY.intermediate("negative_balances", "balances")
+def _negative_balances(balances: List[float]) -> List[float]:
+    return [balance for balance in balances if balance < 0]
+
+
+register_reductions(REPORT_REGISTRY, TRANSACTION_ATTRIBUTES, BALANCE_ATTRIBUTES)
+
+
+@REPORT_REGISTRY.attribute(
+    "num_outlier_transactions", "transactions", "outlier_threshold"
+)
+def _num_outlier_transactions(
+    transactions: List[AssetReportTransaction], outlier_threshold: float
+) -> int:
+    return len(
+        [
+            transaction
+            for transaction in transactions
+            if abs(transaction.amount) > outlier_threshold
+        ]
+    )
+
+
+"""
+evaluate_report_attributes computes the requested report attributes through
+REPORT_REGISTRY, computing every shared intermediate once
+
+Params
+* asset_report: the asset report retrieved through /asset_report/get
+* attributes: the names of the attributes to compute. Defaults to every registered
+    report attribute
+* outlier_threshold: the threshold used by num_outlier_transactions
+
+Returns
+* A map of attribute name to its value
+"""
+
+
+def evaluate_report_attributes(
+    asset_report: AssetReport,
+    attributes: List[str] = None,
+    outlier_threshold: float = 10000.00,
+) -> Dict[str, Any]:
+    return REPORT_REGISTRY.evaluate(
+        asset_report, attributes, outlier_threshold=outlier_threshold
+    )
@@ -1,4 +1,12 @@
+from typing import Dict, List, Union
+
 from plaid.model.asset_report import AssetReport
+from outliers import (
+    OUTLIER_THRESHOLDS,
+    Z_SCORE_THRESHOLD,
+    MAD_THRESHOLD,
+    build_report_outlier_index,
+)
 
 """
 Number of Outlier Transactions
@@ -18,3 +26,70 @@ def num_outlier_transactions(
                 if abs(transaction.amount) > outlier_threshold:
                     count += 1
     return count
+
+
+"""
+Number of Outlier Transactions by Threshold
+----------------------
+num_outlier_transactions_by_threshold returns the number of transactions across all
+accounts that are larger than each of the outlier_thresholds. The absolute amounts are
+sorted once, so every threshold is a binary search instead of another scan of the
+transactions.
+"""
+
+
+def num_outlier_transactions_by_threshold(
+    asset_report: AssetReport, outlier_thresholds: List[float] = OUTLIER_THRESHOLDS
+) -> Dict[float, int]:
+    return build_report_outlier_index(asset_report).counts_above(outlier_thresholds)
+
+
+"""
+Number of Z-Score Outlier Transactions
+----------------------
+num_z_score_outlier_transactions returns the number of transactions across all
+accounts whose absolute amount is more than z_threshold standard deviations above the
+mean absolute amount of the report. Default of 3 standard deviations.
+"""
+
+
+def num_z_score_outlier_transactions(
+    asset_report: AssetReport, z_threshold: float = Z_SCORE_THRESHOLD
+) -> int:
+    return build_report_outlier_index(asset_report).count_z_score_outliers(z_threshold)
+
+
+"""
+Number of MAD Outlier Transactions
+----------------------
+num_mad_outlier_transactions returns the number of transactions across all accounts
+whose absolute amount has a modified z-score, 0.6745 * (amount - median) / MAD, above
+mad_threshold. The median and the median absolute deviation (MAD) are not pulled up by
+the outliers themselves, unlike the mean and standard deviation. Default of 3.5.
+"""
+
+
+def num_mad_outlier_transactions(
+    asset_report: AssetReport, mad_threshold: float = MAD_THRESHOLD
+) -> int:
+    return build_report_outlier_index(asset_report).count_mad_outliers(mad_threshold)
+
+
+"""
+Outlier Transaction Counts
+----------------------
+outlier_transaction_counts returns num_outlier_transactions_by_threshold,
+num_z_score_outlier_transactions and num_mad_outlier_transactions across all accounts
+from a single sort of the report's transactions, keyed by those names.
+"""
+
+
+def outlier_transaction_counts(
+    asset_report: AssetReport,
+    outlier_thresholds: List[float] = OUTLIER_THRESHOLDS,
+    z_threshold: float = Z_SCORE_THRESHOLD,
+    mad_threshold: float = MAD_THRESHOLD,
+) -> Dict[str, Union[int, Dict[float, int]]]:
+    return build_report_outlier_index(asset_report).counts(
+        outlier_thresholds, z_threshold, mad_threshold
+    )
@@ -0,0 +1,65 @@
+from typing import Dict, List
+from datetime import date
+
+from plaid.model.asset_report import AssetReport
+from window_index import (
+    WINDOWED_ATTRIBUTES,
+    get_report_window_index,
+    windowed_attribute_function,
+)
+
+"""
+Windowed attributes
+----------------------
+Every function in this file returns the attribute of the same name in the report level
+attribute files, restricted to the transactions dated in the window_days days up to and
+including as_of (today by default), e.g. num_inflows(asset_report, window_days=30). The
+transactions of the report are sorted and accumulated once, so every further window
+only costs two binary searches.
+"""
+
+# num_inflows, total_inflows_amount and every other name in WINDOWED_ATTRIBUTES is a
+# function of the report, window_days and as_of
+for name in WINDOWED_ATTRIBUTES:
+    globals()[name] = windowed_attribute_function(
+        name, get_report_window_index, __name__
+    )
+del name
+
+
+"""
+windowed_attributes computes several attributes over several trailing windows at once,
+sharing one sorted index of the transactions across all accounts in the report
+
+Params
+* asset_report: the asset report to compute the attributes for
+* windows: the window lengths, in days
+* attributes: the names of the attributes to compute, from WINDOWED_ATTRIBUTES
+* as_of: the last day of every window. Defaults to today
+
+Returns
+* A map of window length to the map of attribute name to its value over that window
+"""
+
+
+def windowed_attributes(
+    asset_report: AssetReport,
+    windows: List[int] = (30, 60, 90),
+    attributes: List[str] = tuple(WINDOWED_ATTRIBUTES),
+    as_of: date = None,
+) -> Dict[int, Dict[str, float]]:
+    unknown_attributes = set(attributes) - set(WINDOWED_ATTRIBUTES)
+    if unknown_attributes:
+        raise ValueError(f"unknown attributes {sorted(unknown_attributes)}")
+
+    window_index = get_report_window_index(asset_report)
+    as_of = as_of or date.today()
+    results = {}
+    for window_days in windows:
+        results[window_days] = {
+            attribute: window_index.value(
+                *WINDOWED_ATTRIBUTES[attribute], window_days, as_of
+            )
+            for attribute in attributes
+        }
+    return results
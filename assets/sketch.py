@@ -0,0 +1,285 @@
+import argparse
+import json
+import math
+import os
+import random
+from typing import Any, Dict, Iterable, List
+
+"""
+Quantile sketches
+----------------------
+KllSketch is a KLL quantile sketch (Karnin, Lang and Liberty, "Optimal Quantile
+Approximation in Streams"). It summarizes a stream of any length in O(k) memory and
+answers quantiles with a rank error on the order of 1 / k, well under 1% at the default
+k of 200. Two sketches merge into a sketch of both streams with the same guarantee, so
+sketches built by different workers, batches or service instances can be combined, and
+a sketch serializes to a small JSON object.
+
+AttributeSketches keeps one KllSketch per attribute, fed with rows of attributes as
+they are computed, to monitor the distribution of every attribute across a population
+of reports without keeping the values.
+
+Usage
+* python batch.py reports.jsonl --output attributes.csv --sketch-output sketches.json
+* python sketch.py merge day1.json day2.json --output week.json
+* python sketch.py show week.json --quantiles 0.5,0.95,0.99
+"""
+
+DEFAULT_K = 200
+
+# Each level of the sketch holds about C times as many items as the level above it
+C = 2.0 / 3.0
+
+# The quantiles reported by default
+DEFAULT_QUANTILES = [0.5, 0.95, 0.99]
+
+
+"""
+KllSketch summarizes a stream of numbers for approximate quantile queries
+
+Params
+* k: the accuracy parameter. Memory grows linearly with k and the rank error shrinks
+    as 1 / k
+* seed: the seed of the coin flips used when compacting, for reproducible sketches
+"""
+
+
+class KllSketch:
+    def __init__(self, k: int = DEFAULT_K, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.compactors = [[]]
+        self._random = random.Random(seed)
+        self._size = 0
+        self._max_size = self._capacity(0)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return int(math.ceil(self.k * C**depth)) + 1
+
+    def _grow(self) -> None:
+        self.compactors.append([])
+        self._max_size = sum(
+            self._capacity(level) for level in range(len(self.compactors))
+        )
+
+    def update(self, value: float) -> None:
+        self.compactors[0].append(value)
+        self._size += 1
+        self.n += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if self._size >= self._max_size:
+            self._compress()
+
+    def _compress(self) -> None:
+        # Compacts the lowest full level: its items are sorted and every other item,
+        # starting at a random offset, moves up a level with twice the weight
+        for level in range(len(self.compactors)):
+            compactor = self.compactors[level]
+            if len(compactor) < self._capacity(level):
+                continue
+            if level + 1 == len(self.compactors):
+                self._grow()
+            compactor.sort()
+            # An odd item out stays at this level
+            kept = [compactor.pop()] if len(compactor) % 2 else []
+            offset = self._random.randint(0, 1)
+            self.compactors[level + 1].extend(compactor[offset::2])
+            self.compactors[level] = kept
+            self._size = sum(len(compactor) for compactor in self.compactors)
+            if self._size < self._max_size:
+                return
+
+    def merge(self, other: "KllSketch") -> None:
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level].extend(compactor)
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._size = sum(len(compactor) for compactor in self.compactors)
+        while self._size >= self._max_size:
+            self._compress()
+
+    def _weighted_values(self) -> List[tuple]:
+        values = [
+            (value, 1 << level)
+            for level, compactor in enumerate(self.compactors)
+            for value in compactor
+        ]
+        values.sort()
+        return values
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: List[float]) -> List[float]:
+        if self.n == 0:
+            return [None for _ in qs]
+        values = self._weighted_values()
+        total = sum(weight for _, weight in values)
+        results = []
+        for q in qs:
+            if q <= 0:
+                results.append(self.min)
+                continue
+            if q >= 1:
+                results.append(self.max)
+                continue
+            target = q * total
+            cumulative = 0
+            for value, weight in values:
+                cumulative += weight
+                if cumulative >= target:
+                    results.append(value)
+                    break
+        return results
+
+    def rank(self, value: float) -> float:
+        # The approximate fraction of the stream that is at most value
+        if self.n == 0:
+            return 0.0
+        values = self._weighted_values()
+        total = sum(weight for _, weight in values)
+        return sum(weight for item, weight in values if item <= value) / total
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "k": self.k,
+            "n": self.n,
+            "min": self.min if self.n else None,
+            "max": self.max if self.n else None,
+            "compactors": self.compactors,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KllSketch":
+        sketch = cls(data["k"], seed=data["n"])
+        sketch.n = data["n"]
+        if sketch.n:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        sketch.compactors = [[]]
+        for _ in range(len(data["compactors"]) - 1):
+            sketch._grow()
+        sketch.compactors = [list(compactor) for compactor in data["compactors"]]
+        sketch._size = sum(len(compactor) for compactor in sketch.compactors)
+        return sketch
+
+
+"""
+AttributeSketches keeps a KllSketch for every numeric attribute in the rows it is fed.
+Values that are not numbers, such as monthly summaries, and missing values are skipped
+
+Params
+* k: the accuracy parameter of every sketch
+"""
+
+
+class AttributeSketches:
+    def __init__(self, k: int = DEFAULT_K):
+        self.k = k
+        self.sketches = {}
+
+    def update(self, row: Dict[str, Any]) -> None:
+        for attribute, value in row.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if isinstance(value, float) and math.isnan(value):
+                continue
+            sketch = self.sketches.get(attribute)
+            if sketch is None:
+                sketch = self.sketches[attribute] = KllSketch(self.k)
+            sketch.update(value)
+
+    def update_all(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.update(row)
+
+    def merge(self, other: "AttributeSketches") -> None:
+        for attribute, sketch in other.sketches.items():
+            if attribute in self.sketches:
+                self.sketches[attribute].merge(sketch)
+            else:
+                self.sketches[attribute] = KllSketch.from_dict(sketch.to_dict())
+
+    def quantiles(
+        self, qs: List[float] = DEFAULT_QUANTILES
+    ) -> Dict[str, Dict[float, float]]:
+        return {
+            attribute: dict(zip(qs, sketch.quantiles(qs)))
+            for attribute, sketch in sorted(self.sketches.items())
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "k": self.k,
+            "sketches": {
+                attribute: sketch.to_dict()
+                for attribute, sketch in sorted(self.sketches.items())
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AttributeSketches":
+        sketches = cls(data["k"])
+        sketches.sketches = {
+            attribute: KllSketch.from_dict(sketch)
+            for attribute, sketch in data["sketches"].items()
+        }
+        return sketches
+
+    def save(self, path: str) -> None:
+        # Written to a temporary file and moved into place, so that an interrupted save
+        # never leaves a partial sketch behind
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w") as sketch_file:
+            json.dump(self.to_dict(), sketch_file)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "AttributeSketches":
+        with open(path) as sketch_file:
+            return cls.from_dict(json.load(sketch_file))
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Merge and inspect attribute quantile sketches"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    merge = commands.add_parser("merge", help="merge sketch files into one")
+    merge.add_argument("inputs", nargs="+")
+    merge.add_argument("--output", required=True)
+    show = commands.add_parser("show", help="print the quantiles of a sketch file")
+    show.add_argument("input")
+    show.add_argument(
+        "--quantiles",
+        default=",".join(str(q) for q in DEFAULT_QUANTILES),
+        help="comma separated quantiles to print",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "merge":
+        merged = AttributeSketches.load(args.inputs[0])
+        for path in args.inputs[1:]:
+            merged.merge(AttributeSketches.load(path))
+        merged.save(args.output)
+    else:
+        sketches = AttributeSketches.load(args.input)
+        qs = [float(q) for q in args.quantiles.split(",")]
+        for attribute, quantiles in sketches.quantiles(qs).items():
+            values = ", ".join(
+                f"p{q * 100:g}={value:g}" for q, value in quantiles.items()
+            )
+            print(f"{attribute} (n={sketches.sketches[attribute].n}): {values}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+import json
+import os
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+from plaid.model.asset_report import AssetReport
+
+from frame import TransactionFrame, build_transaction_frame
+
+"""
+Columnar transaction store
+----------------------
+TransactionStore keeps the TransactionFrame columns of many asset reports in flat binary
+files on disk, one file per column, and reads them back through memory maps. Looking up
+a report returns a TransactionFrame whose columns are slices of the memory maps, so the
+vectorized attributes in frame_attributes.py run on a stored report without parsing or
+copying anything but its account offsets. Only the pages of the reports actually read
+are loaded from disk.
+
+Layout of a store directory
+* One file per column in COLUMNS, with every report's values appended in order. The
+    account_offsets and balance_offsets columns are global: the transactions of the
+    store's account i are [account_offsets[i], account_offsets[i + 1])
+* categories.json: the store-wide credit category vocabulary. Category codes in the
+    store index into it
+* reports.jsonl: one line per report with its asset_report_id, the range of store
+    accounts it owns, its item offsets and the id and type of every account
+
+A report's columns are written before its line in reports.jsonl, so a write that is
+cut short leaves no partial report: opening the store truncates the columns back to
+the last report in reports.jsonl.
+
+Usage
+* store = TransactionStore("/data/asset_reports")
+* store.append(asset_report) once per report
+* num_inflows(store.frame(asset_report_id)), with num_inflows from
+    report/frame_attributes.py
+"""
+
+
+# The dtype of every column file. Dates are stored as days since 1970-01-01 and read
+# back as datetime64[D]
+COLUMNS = {
+    "amounts": np.float64,
+    "dates": np.int64,
+    "primary_codes": np.int32,
+    "detailed_codes": np.int32,
+    "balance_amounts": np.float64,
+    "balance_dates": np.int64,
+    "account_offsets": np.int64,
+    "balance_offsets": np.int64,
+}
+DATE_COLUMNS = ("dates", "balance_dates")
+TRANSACTION_COLUMNS = ("amounts", "dates", "primary_codes", "detailed_codes")
+BALANCE_COLUMNS = ("balance_amounts", "balance_dates")
+
+INDEX_FILE = "reports.jsonl"
+CATEGORIES_FILE = "categories.json"
+
+
+"""
+TransactionStore opens, or creates, the store in the given directory
+
+Params
+* path: the directory of the store
+"""
+
+
+class TransactionStore:
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.primary_categories = []
+        self.detailed_categories = []
+        categories_path = os.path.join(path, CATEGORIES_FILE)
+        if os.path.exists(categories_path):
+            with open(categories_path) as categories_file:
+                categories = json.load(categories_file)
+            self.primary_categories = categories["primary"]
+            self.detailed_categories = categories["detailed"]
+        self._primary_vocabulary = {
+            category: code for code, category in enumerate(self.primary_categories)
+        }
+        self._detailed_vocabulary = {
+            category: code for code, category in enumerate(self.detailed_categories)
+        }
+
+        self._reports = {}
+        index_path = os.path.join(path, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path) as index_file:
+                for line in index_file:
+                    # A line without its newline was cut short while being written
+                    if not line.endswith("\n"):
+                        break
+                    entry = json.loads(line)
+                    self._reports[entry["asset_report_id"]] = entry
+        self._columns = {}
+        self._recover()
+
+    def __len__(self) -> int:
+        return len(self._reports)
+
+    def __contains__(self, asset_report_id: str) -> bool:
+        return asset_report_id in self._reports
+
+    def asset_report_ids(self) -> List[str]:
+        return list(self._reports)
+
+    def append(self, asset_report: AssetReport) -> None:
+        self.append_frame(build_transaction_frame(asset_report))
+
+    def append_frame(self, frame: TransactionFrame) -> None:
+        if frame.asset_report_id in self._reports:
+            raise ValueError(f"asset report {frame.asset_report_id} is already stored")
+        num_accounts = self._length("account_offsets") - 1
+        num_transactions = int(self._column("account_offsets")[-1])
+        num_balances = int(self._column("balance_offsets")[-1])
+
+        primary_codes = self._store_codes(
+            frame.primary_codes,
+            frame.primary_categories,
+            self.primary_categories,
+            self._primary_vocabulary,
+        )
+        detailed_codes = self._store_codes(
+            frame.detailed_codes,
+            frame.detailed_categories,
+            self.detailed_categories,
+            self._detailed_vocabulary,
+        )
+        self._write_categories()
+
+        columns = {
+            "amounts": frame.amounts,
+            "dates": frame.dates.astype(np.int64),
+            "primary_codes": primary_codes,
+            "detailed_codes": detailed_codes,
+            "balance_amounts": frame.balance_amounts,
+            "balance_dates": frame.balance_dates.astype(np.int64),
+            "account_offsets": frame.account_offsets[1:] + num_transactions,
+            "balance_offsets": frame.balance_offsets[1:] + num_balances,
+        }
+        for name, values in columns.items():
+            with open(self._column_path(name), "ab") as column_file:
+                column_file.write(np.asarray(values, COLUMNS[name]).tobytes())
+        self._columns = {}
+
+        entry = {
+            "asset_report_id": frame.asset_report_id,
+            "account_start": num_accounts,
+            "account_end": num_accounts + frame.num_accounts,
+            "item_offsets": [int(offset) for offset in frame.item_offsets],
+            "account_ids": list(frame.account_ids),
+            "account_types": list(frame.account_types),
+        }
+        with open(os.path.join(self.path, INDEX_FILE), "a") as index_file:
+            index_file.write(json.dumps(entry) + "\n")
+        self._reports[frame.asset_report_id] = entry
+
+    def frame(self, asset_report_id: str) -> TransactionFrame:
+        entry = self._reports[asset_report_id]
+        account_offsets = self._column("account_offsets")[
+            entry["account_start"] : entry["account_end"] + 1
+        ]
+        balance_offsets = self._column("balance_offsets")[
+            entry["account_start"] : entry["account_end"] + 1
+        ]
+        transactions = slice(int(account_offsets[0]), int(account_offsets[-1]))
+        balances = slice(int(balance_offsets[0]), int(balance_offsets[-1]))
+        return TransactionFrame(
+            amounts=self._column("amounts")[transactions],
+            dates=self._column("dates")[transactions],
+            primary_codes=self._column("primary_codes")[transactions],
+            detailed_codes=self._column("detailed_codes")[transactions],
+            account_offsets=account_offsets - account_offsets[0],
+            item_offsets=np.array(entry["item_offsets"], dtype=np.int64),
+            balance_amounts=self._column("balance_amounts")[balances],
+            balance_dates=self._column("balance_dates")[balances],
+            balance_offsets=balance_offsets - balance_offsets[0],
+            account_ids=entry["account_ids"],
+            account_types=entry["account_types"],
+            primary_categories=self.primary_categories,
+            detailed_categories=self.detailed_categories,
+            asset_report_id=asset_report_id,
+        )
+
+    def frames(self) -> Iterator[TransactionFrame]:
+        for asset_report_id in self._reports:
+            yield self.frame(asset_report_id)
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, name + ".bin")
+
+    def _length(self, name: str) -> int:
+        column_path = self._column_path(name)
+        if not os.path.exists(column_path):
+            return 0
+        return os.path.getsize(column_path) // np.dtype(COLUMNS[name]).itemsize
+
+    def _column(self, name: str) -> np.ndarray:
+        column = self._columns.get(name)
+        if column is None:
+            if self._length(name) == 0:
+                column = np.empty(0, dtype=COLUMNS[name])
+            else:
+                column = np.memmap(self._column_path(name), COLUMNS[name], mode="r")
+            if name in DATE_COLUMNS:
+                column = column.view("datetime64[D]")
+            self._columns[name] = column
+        return column
+
+    def _store_codes(
+        self,
+        codes: np.ndarray,
+        frame_categories: List[str],
+        store_categories: List[str],
+        vocabulary: Dict[str, int],
+    ) -> np.ndarray:
+        # Maps the codes of a frame's own vocabulary to codes of the store's vocabulary,
+        # adding the categories the store has not seen yet. The last entry maps -1
+        lookup = []
+        for category in frame_categories:
+            if category not in vocabulary:
+                vocabulary[category] = len(store_categories)
+                store_categories.append(category)
+            lookup.append(vocabulary[category])
+        lookup.append(-1)
+        return np.array(lookup, dtype=np.int32)[codes]
+
+    def _write_categories(self) -> None:
+        categories_path = os.path.join(self.path, CATEGORIES_FILE)
+        with open(categories_path + ".tmp", "w") as categories_file:
+            json.dump(
+                {
+                    "primary": self.primary_categories,
+                    "detailed": self.detailed_categories,
+                },
+                categories_file,
+            )
+        os.replace(categories_path + ".tmp", categories_path)
+
+    def _recover(self) -> None:
+        # Truncates every column to the reports listed in the index, dropping the
+        # columns of an append that did not finish, and rewrites the index without a
+        # line that was cut short
+        num_accounts = max(
+            [entry["account_end"] for entry in self._reports.values()], default=0
+        )
+        for name in ("account_offsets", "balance_offsets"):
+            if self._length(name) == 0:
+                with open(self._column_path(name), "wb") as column_file:
+                    column_file.write(np.zeros(1, dtype=COLUMNS[name]).tobytes())
+            self._truncate(name, num_accounts + 1)
+        num_transactions = int(self._column("account_offsets")[num_accounts])
+        num_balances = int(self._column("balance_offsets")[num_accounts])
+        for name in TRANSACTION_COLUMNS:
+            self._truncate(name, num_transactions)
+        for name in BALANCE_COLUMNS:
+            self._truncate(name, num_balances)
+        self._columns = {}
+
+        index_path = os.path.join(self.path, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path) as index_file:
+                content = index_file.read()
+            if content and not content.endswith("\n"):
+                with open(index_path, "w") as index_file:
+                    for entry in self._reports.values():
+                        index_file.write(json.dumps(entry) + "\n")
+
+    def _truncate(self, name: str, length: int) -> None:
+        column_path = self._column_path(name)
+        if not os.path.exists(column_path):
+            open(column_path, "wb").close()
+        if self._length(name) > length:
+            self._columns.pop(name, None)
+            os.truncate(column_path, length * np.dtype(COLUMNS[name]).itemsize)
@@ -0,0 +1,174 @@
+import json
+import re
+from typing import Any, Dict, IO, Iterator
+from datetime import date
+
+from records import AccountRecord, BalanceRecord, TransactionRecord, intern_category
+
+# The characters a JSON number can continue with
+_NUMBER_TAIL = re.compile(r"[0-9+\-.eE]*")
+
+"""
+AssetReportStream reads a /asset_report/get response incrementally from a file object and
+yields the accounts in the report one at a time as plain JSON objects, so that only one
+account is held in memory at a time instead of the whole report
+
+Params
+* fp: a text file object with the JSON response (or only its "report" object)
+* chunk_size: the number of characters to read from the file at a time
+
+Usage
+* iterate over accounts() to read the accounts. asset_report_id is set once it has
+    been read from the response
+"""
+
+
+class AssetReportStream:
+    def __init__(self, fp: IO[str], chunk_size: int = 1 << 16):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.asset_report_id = None
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def accounts(self) -> Iterator[Dict[str, Any]]:
+        for key in self._object_keys():
+            if key == "report":
+                yield from self._report_accounts()
+            elif key == "items":
+                yield from self._items_accounts()
+            elif key == "asset_report_id":
+                self.asset_report_id = self._read_value()
+            else:
+                self._read_value()
+
+    def _report_accounts(self) -> Iterator[Dict[str, Any]]:
+        for key in self._object_keys():
+            if key == "items":
+                yield from self._items_accounts()
+            elif key == "asset_report_id":
+                self.asset_report_id = self._read_value()
+            else:
+                self._read_value()
+
+    def _items_accounts(self) -> Iterator[Dict[str, Any]]:
+        for _ in self._array_elements():
+            for key in self._object_keys():
+                if key == "accounts":
+                    for _ in self._array_elements():
+                        yield self._read_value()
+                else:
+                    self._read_value()
+
+    def _fill(self, size: int) -> None:
+        # Drop the characters that have already been decoded before growing the buffer
+        if self._pos:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+        chunk = self.fp.read(size)
+        if not chunk:
+            self._eof = True
+        self._buffer += chunk
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._eof:
+                return ""
+            self._fill(self.chunk_size)
+
+    def _expect(self, character: str) -> None:
+        if self._peek() != character:
+            raise ValueError(
+                f"expected {character!r} in asset report JSON, found {self._peek()!r}"
+            )
+        self._pos += 1
+
+    def _read_value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number that runs to the end of the buffer may continue in the next
+                # chunk, even if only part of it decodes, e.g. "1" of "1." or "1e"
+                if (
+                    self._eof
+                    or self._buffer[self._pos] not in "-0123456789"
+                    or _NUMBER_TAIL.match(self._buffer, end).end() < len(self._buffer)
+                ):
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            # Grow the read size with the buffer so that large values are not
+            # decoded from scratch once per chunk
+            self._fill(max(self.chunk_size, len(self._buffer) - self._pos))
+
+    def _object_keys(self) -> Iterator[str]:
+        # Yields every key of the next object. The caller must read the value of the
+        # key before asking for the next one
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._read_value()
+            self._expect(":")
+            yield key
+            if self._peek() == ",":
+                self._pos += 1
+                continue
+            self._expect("}")
+            return
+
+    def _array_elements(self) -> Iterator[None]:
+        # Yields once for every element of the next array. The caller must read the
+        # element before asking for the next one
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield
+            if self._peek() == ",":
+                self._pos += 1
+                continue
+            self._expect("]")
+            return
+
+
+"""
+account_from_json takes in an account object read from the raw JSON response and returns
+an AccountRecord with the fields read by the attribute functions, without building the
+plaid model objects
+"""
+
+
+def account_from_json(account: Dict[str, Any]) -> AccountRecord:
+    transactions = []
+    for transaction in account.get("transactions") or []:
+        credit_category = transaction.get("credit_category")
+        if credit_category is not None:
+            credit_category = intern_category(
+                credit_category.get("primary"), credit_category.get("detailed")
+            )
+        transactions.append(
+            TransactionRecord(
+                transaction["amount"],
+                date.fromisoformat(transaction["date"]),
+                credit_category,
+            )
+        )
+    historical_balances = [
+        BalanceRecord(date.fromisoformat(balance["date"]), balance["current"])
+        for balance in account.get("historical_balances") or []
+    ]
+    return AccountRecord(
+        account["account_id"], account.get("type"), transactions, historical_balances
+    )
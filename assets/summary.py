@@ -0,0 +1,342 @@
+from typing import Any, Dict, Iterable, List, Tuple
+from collections import defaultdict
+from plaid.model.account_assets import AccountAssets
+from utils import TransactionSummary, merge_extreme, merge_transaction_summaries
+
+# The groups of transactions that the attributes reduce over. Groups are either a cash
+# flow partition or a credit category primary.
+CASH_FLOW_GROUPS = ["transactions", "inflows", "outflows"]
+
+TRANSACTION_GROUPS = CASH_FLOW_GROUPS + [
+    "LOAN_DISBURSEMENTS",
+    "LOAN_PAYMENTS",
+    "BANK_PENALTIES",
+]
+
+
+"""
+summarize_account_transactions makes a single pass over the transactions in an account
+and fills a TransactionSummary for every requested group
+
+Params
+* account: one of the accounts retrieved through /asset_report/get
+* groups: the cash flow partitions ("transactions", "inflows", "outflows") and credit
+    category primaries (e.g. "LOAN_PAYMENTS") to summarize
+* monthly_groups: the groups for which the monthly summary should be kept
+* outlier_threshold: if set, the number of transactions with an absolute value greater
+    than this threshold is also counted
+
+Returns
+* A map of group to its TransactionSummary, and the number of outlier transactions
+"""
+
+
+def summarize_account_transactions(
+    account: AccountAssets,
+    groups: List[str],
+    monthly_groups: List[str] = (),
+    outlier_threshold: float = None,
+) -> Tuple[Dict[str, TransactionSummary], int]:
+    summaries = {
+        group: TransactionSummary(track_monthly=group in monthly_groups)
+        for group in groups
+    }
+    all_transactions = summaries.get("transactions")
+    inflows = summaries.get("inflows")
+    outflows = summaries.get("outflows")
+    category_summaries = {
+        group: summary
+        for group, summary in summaries.items()
+        if group not in CASH_FLOW_GROUPS
+    }
+
+    num_outliers = 0
+    for transaction in account.transactions:
+        amount = transaction.amount
+        transaction_date = transaction.date
+        if all_transactions is not None:
+            all_transactions.add(amount, transaction_date)
+        if amount < 0:
+            if inflows is not None:
+                inflows.add(amount, transaction_date)
+        elif amount > 0:
+            if outflows is not None:
+                outflows.add(amount, transaction_date)
+        if outlier_threshold is not None and abs(amount) > outlier_threshold:
+            num_outliers += 1
+        # Only read the credit category when a category attribute was requested, so
+        # cash flow attributes keep working on transactions without one
+        if category_summaries:
+            summary = category_summaries.get(transaction.credit_category.primary)
+            if summary is not None:
+                summary.add(amount, transaction_date)
+    return summaries, num_outliers
+
+
+"""
+summarize_balance_values makes a single pass over a set of daily ending balances and
+returns the aggregates needed by the historical balance and negative balance attributes
+"""
+
+
+def summarize_balance_values(values: Iterable[float]) -> Dict[str, Any]:
+    count = 0
+    total = 0.0
+    min_balance = None
+    max_balance = None
+    num_negative = 0
+    total_negative = 0.0
+    for current in values:
+        count += 1
+        total += current
+        if min_balance is None or current < min_balance:
+            min_balance = current
+        if max_balance is None or current > max_balance:
+            max_balance = current
+        if current < 0:
+            num_negative += 1
+            total_negative += current
+    return {
+        "count": count,
+        "total": total,
+        "min": min_balance,
+        "max": max_balance,
+        "num_negative": num_negative,
+        "total_negative": total_negative,
+    }
+
+
+"""
+summarize_account_balances makes a single pass over the historical balances in an
+account and returns their aggregates (see summarize_balance_values), along with the
+map of date to balance used to merge balances across accounts
+"""
+
+
+def summarize_account_balances(account: AccountAssets) -> Dict[str, Any]:
+    daily = defaultdict(float)
+
+    def balance_values():
+        for balance in account.historical_balances:
+            daily[balance.date] += balance.current
+            yield balance.current
+
+    balances = summarize_balance_values(balance_values())
+    balances["daily"] = daily
+    return balances
+
+
+"""
+merge_balance_summaries merges the historical balance aggregates of two disjoint sets of
+balances of the same account, e.g. the balances already summarized and the balances added
+by a refresh
+"""
+
+
+def merge_balance_summaries(
+    first: Dict[str, Any], second: Dict[str, Any]
+) -> Dict[str, Any]:
+    merged = {
+        "count": first["count"] + second["count"],
+        "total": first["total"] + second["total"],
+        "min": merge_extreme(first["min"], second["min"], min),
+        "max": merge_extreme(first["max"], second["max"], max),
+        "num_negative": first["num_negative"] + second["num_negative"],
+        "total_negative": first["total_negative"] + second["total_negative"],
+    }
+    daily = defaultdict(float)
+    for balances in (first, second):
+        for balance_date, balance in balances["daily"].items():
+            daily[balance_date] += balance
+    merged["daily"] = daily
+    return merged
+
+
+"""
+AccountSummary holds the partial aggregates of one account: a TransactionSummary per
+transaction group, the number of outlier transactions and the historical balance
+aggregates. Every account attribute can be read from it, and report attributes can
+be composed by merging the summaries of the accounts in the report
+"""
+
+
+class AccountSummary:
+    def __init__(
+        self,
+        account_id: str,
+        account_type: str,
+        transactions: Dict[str, TransactionSummary],
+        num_outliers: int,
+        balances: Dict[str, Any],
+    ):
+        self.account_id = account_id
+        self.account_type = account_type
+        self.transactions = transactions
+        self.num_outliers = num_outliers
+        self.balances = balances
+
+
+"""
+summarize_account takes in an asset account and builds its AccountSummary with a single
+pass over its transactions and a single pass over its historical balances
+
+Params
+* account: one of the accounts retrieved through /asset_report/get
+* groups: the transaction groups to summarize. Defaults to every group
+* monthly_groups: the groups for which the monthly summary should be kept. Defaults
+    to every group
+* outlier_threshold: the threshold used to count outlier transactions, or None to skip it
+* include_balances: whether to summarize the historical balances
+
+Returns
+* The AccountSummary of the account
+"""
+
+
+def summarize_account(
+    account: AccountAssets,
+    groups: List[str] = TRANSACTION_GROUPS,
+    monthly_groups: List[str] = TRANSACTION_GROUPS,
+    outlier_threshold: float = 10000.00,
+    include_balances: bool = True,
+) -> AccountSummary:
+    summaries, num_outliers = {}, 0
+    if groups or outlier_threshold is not None:
+        summaries, num_outliers = summarize_account_transactions(
+            account, groups, monthly_groups, outlier_threshold
+        )
+    balances = summarize_account_balances(account) if include_balances else None
+    return AccountSummary(
+        account.account_id, str(account.type), summaries, num_outliers, balances
+    )
+
+
+"""
+merge_account_summaries merges the partial aggregates of several accounts, as if every
+transaction and historical balance had been summarized together
+
+Params
+* account_summaries: the AccountSummary of every account to merge
+* groups: the transaction groups to merge
+* include_depository_only: whether to ignore the summaries of non-depository accounts
+* include_balances: whether to merge the historical balances
+
+Returns
+* A map of group to its merged TransactionSummary, the total number of outlier
+    transactions and the aggregates of the net balance across accounts on each date
+    (None if include_balances is False)
+"""
+
+
+def merge_account_summaries(
+    account_summaries: List[AccountSummary],
+    groups: List[str] = TRANSACTION_GROUPS,
+    include_depository_only: bool = False,
+    include_balances: bool = True,
+) -> Tuple[Dict[str, TransactionSummary], int, Dict[str, Any]]:
+    account_summaries = [
+        summary
+        for summary in account_summaries
+        if not include_depository_only or summary.account_type == "depository"
+    ]
+    transactions = {
+        group: merge_transaction_summaries(
+            [summary.transactions[group] for summary in account_summaries]
+        )
+        for group in groups
+    }
+    num_outliers = sum(summary.num_outliers for summary in account_summaries)
+    if not include_balances:
+        return transactions, num_outliers, None
+
+    daily = defaultdict(float)
+    for summary in account_summaries:
+        if summary.balances is None:
+            continue
+        for balance_date, balance in summary.balances["daily"].items():
+            daily[balance_date] += balance
+    balances = summarize_balance_values(daily.values())
+    balances["daily"] = daily
+    return transactions, num_outliers, balances
+
+
+"""
+requested_groups returns the transaction groups, and the groups whose monthly summary
+is needed, to compute a set of attributes
+
+Params
+* attributes: the names of the requested attributes
+* transaction_attributes: a map of attribute name to its (group, statistic)
+
+Returns
+* The groups to summarize and the groups whose monthly summary should be kept
+"""
+
+
+def requested_groups(
+    attributes: List[str], transaction_attributes: Dict[str, Tuple[str, str]]
+) -> Tuple[List[str], List[str]]:
+    groups = []
+    monthly_groups = []
+    for attribute in attributes:
+        if attribute not in transaction_attributes:
+            continue
+        group, statistic = transaction_attributes[attribute]
+        if group not in groups:
+            groups.append(group)
+        if statistic == "monthly" and group not in monthly_groups:
+            monthly_groups.append(group)
+    return groups, monthly_groups
+
+
+"""
+transaction_statistic reads a statistic of a group of transactions from its
+TransactionSummary, using the same conventions as the attribute functions: the
+min, max and average of an empty group are 0.0 and so are its days since
+"""
+
+
+def transaction_statistic(summary: TransactionSummary, statistic: str) -> Any:
+    if statistic == "count":
+        return summary.count
+    if statistic == "total":
+        return summary.total
+    if statistic == "max":
+        return summary.max if summary.count else 0.0
+    if statistic == "min":
+        return summary.min if summary.count else 0.0
+    if statistic == "average":
+        return summary.average()
+    if statistic == "monthly":
+        return summary.monthly
+    if statistic == "days_since":
+        return summary.days_since_most_recent()
+    raise ValueError(f"unknown statistic {statistic}")
+
+
+"""
+balance_statistic reads a statistic of a set of daily ending balances from the
+aggregates built by summarize_balance_values
+"""
+
+
+def balance_statistic(balances: Dict[str, Any], statistic: str) -> float:
+    if statistic == "count_negative":
+        return balances["num_negative"]
+    if statistic == "lowest_negative":
+        return min(balances["min"], 0.0) if balances["count"] else 0.0
+    if statistic == "average_negative":
+        if balances["num_negative"] == 0:
+            return 0.0
+        return balances["total_negative"] / balances["num_negative"]
+    # The average, minimum and maximum balance are undefined without any historical
+    # balances, in line with the functions in historical_balances.py
+    if balances["count"] == 0:
+        raise ValueError(f"{statistic} balance requires at least one historical balance")
+    if statistic == "average":
+        return balances["total"] / balances["count"]
+    if statistic == "min":
+        return balances["min"]
+    if statistic == "max":
+        return balances["max"]
+    raise ValueError(f"unknown statistic {statistic}")
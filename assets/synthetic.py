@@ -0,0 +1,378 @@
+import argparse
+import json
+import random
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+from plaid.configuration import Configuration
+from plaid.model.asset_report import AssetReport
+from plaid.model_utils import validate_and_convert_types
+
+"""
+Synthetic asset reports
+----------------------
+synthetic.py generates deterministic asset reports for benchmarks and fixtures. The same
+seed, sizes and end_date always give the same report. Reports have a realistic mix of
+depository, credit and loan accounts, recurring paychecks, rent and loan payments,
+everyday spending, occasional loan disbursements, overdraft fees and outliers, and a
+daily historical balance that is consistent with the transactions.
+
+Usage
+* generate_asset_report(seed=7, **SIZES["large"]) returns a plaid AssetReport
+* python synthetic.py --size large --count 100 --output reports.jsonl writes a JSONL
+    file of /asset_report/get responses that can be scored with report/batch.py
+"""
+
+# Report sizes, from a single small account to 50,000 transactions
+SIZES = {
+    "tiny": {
+        "num_items": 1,
+        "accounts_per_item": 1,
+        "transactions_per_account": 20,
+    },
+    "small": {
+        "num_items": 1,
+        "accounts_per_item": 2,
+        "transactions_per_account": 250,
+    },
+    "medium": {
+        "num_items": 2,
+        "accounts_per_item": 2,
+        "transactions_per_account": 1250,
+    },
+    "large": {
+        "num_items": 3,
+        "accounts_per_item": 3,
+        "transactions_per_account": 2250,
+    },
+    "xlarge": {
+        "num_items": 5,
+        "accounts_per_item": 4,
+        "transactions_per_account": 2500,
+    },
+}
+
+# Share of accounts of each (type, subtype)
+ACCOUNT_MIX = [
+    (("depository", "checking"), 0.5),
+    (("depository", "savings"), 0.15),
+    (("credit", "credit card"), 0.25),
+    (("loan", "student"), 0.1),
+]
+
+# Everyday transactions of each account type, as (primary, detailed, weight, low, high).
+# Amounts are positive for money leaving the account and negative for money entering it
+EVERYDAY_TRANSACTIONS = {
+    "depository": [
+        ("FOOD_AND_DRINK", "FOOD_AND_DRINK_GROCERIES", 18, 15.0, 180.0),
+        ("FOOD_AND_DRINK", "FOOD_AND_DRINK_RESTAURANT", 16, 8.0, 90.0),
+        (
+            "GENERAL_MERCHANDISE",
+            "GENERAL_MERCHANDISE_ONLINE_MARKETPLACES",
+            12,
+            10.0,
+            250.0,
+        ),
+        ("TRANSPORTATION", "TRANSPORTATION_GAS", 8, 20.0, 75.0),
+        (
+            "RENT_AND_UTILITIES",
+            "RENT_AND_UTILITIES_GAS_AND_ELECTRICITY",
+            3,
+            40.0,
+            220.0,
+        ),
+        ("ENTERTAINMENT", "ENTERTAINMENT_TV_AND_MOVIES", 4, 5.0, 30.0),
+        ("TRANSFER_OUT", "TRANSFER_OUT_ACCOUNT_TRANSFER", 4, 50.0, 1500.0),
+        ("TRANSFER_IN", "TRANSFER_IN_ACCOUNT_TRANSFER", 4, -1500.0, -50.0),
+        ("LOAN_PAYMENTS", "LOAN_PAYMENTS_CREDIT_CARD_PAYMENT", 3, 50.0, 2000.0),
+        ("BANK_PENALTIES", "BANK_PENALTIES_OVERDRAFT_FEE", 1, 25.0, 36.0),
+        ("BANK_PENALTIES", "BANK_PENALTIES_INSUFFICIENT_FUNDS", 0.5, 25.0, 36.0),
+        (
+            "LOAN_DISBURSEMENTS",
+            "LOAN_DISBURSEMENTS_OTHER_DISBURSEMENT",
+            0.3,
+            -9000.0,
+            -500.0,
+        ),
+    ],
+    "credit": [
+        ("FOOD_AND_DRINK", "FOOD_AND_DRINK_GROCERIES", 14, 15.0, 180.0),
+        ("FOOD_AND_DRINK", "FOOD_AND_DRINK_RESTAURANT", 20, 8.0, 120.0),
+        (
+            "GENERAL_MERCHANDISE",
+            "GENERAL_MERCHANDISE_ONLINE_MARKETPLACES",
+            20,
+            10.0,
+            400.0,
+        ),
+        ("TRANSPORTATION", "TRANSPORTATION_GAS", 8, 20.0, 75.0),
+        ("TRAVEL", "TRAVEL_FLIGHTS", 1, 150.0, 900.0),
+        ("LOAN_PAYMENTS", "LOAN_PAYMENTS_CREDIT_CARD_PAYMENT", 3, -2000.0, -50.0),
+        ("BANK_PENALTIES", "BANK_PENALTIES_LATE_PAYMENT", 0.3, 25.0, 40.0),
+    ],
+    "loan": [
+        ("LOAN_PAYMENTS", "LOAN_PAYMENTS_STUDENT_LOAN_PAYMENT", 1, -600.0, -150.0),
+    ],
+}
+
+# Recurring transactions of depository accounts, as
+# (primary, detailed, every n days, low, high)
+RECURRING_TRANSACTIONS = [
+    ("INCOME", "INCOME_WAGES", 14, -4000.0, -1200.0),
+    ("RENT_AND_UTILITIES", "RENT_AND_UTILITIES_RENT", 30, 900.0, 2600.0),
+    ("LOAN_PAYMENTS", "LOAN_PAYMENTS_CAR_PAYMENT", 30, 250.0, 650.0),
+]
+
+# Share of depository transactions that are large outliers, in either direction
+OUTLIER_RATE = 0.002
+
+_IDENTIFIER_CHARACTERS = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+
+"""
+generate_asset_report_data generates the "report" object of an /asset_report/get
+response as plain JSON data
+
+Params
+* seed: the seed of the random generator
+* num_items: the number of items in the report
+* accounts_per_item: the number of accounts in every item
+* transactions_per_account: the number of transactions in every account
+* days_requested: the number of days of transactions and historical balances
+* end_date: the date of the most recent transaction and balance. Defaults to today
+
+Returns
+* The report as a JSON serializable dict
+"""
+
+
+def generate_asset_report_data(
+    seed: int = 0,
+    num_items: int = 1,
+    accounts_per_item: int = 2,
+    transactions_per_account: int = 250,
+    days_requested: int = 365,
+    end_date: date = None,
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    end_date = end_date or date.today()
+    generated = datetime.combine(end_date, datetime.min.time(), timezone.utc)
+    items = []
+    for item_number in range(num_items):
+        accounts = []
+        for account_number in range(accounts_per_item):
+            accounts.append(
+                _generate_account(
+                    rng,
+                    f"{seed}-{item_number}-{account_number}",
+                    transactions_per_account,
+                    days_requested,
+                    end_date,
+                    # Every item has a checking account first
+                    ACCOUNT_MIX[0][0] if account_number == 0 else None,
+                )
+            )
+        items.append(
+            {
+                "item_id": _identifier(rng),
+                "institution_name": f"Institution {item_number}",
+                "institution_id": f"ins_{rng.randint(1, 200000)}",
+                "date_last_updated": generated.isoformat().replace("+00:00", "Z"),
+                "accounts": accounts,
+            }
+        )
+    return {
+        "asset_report_id": _identifier(rng),
+        "client_report_id": None,
+        "date_generated": generated.isoformat().replace("+00:00", "Z"),
+        "days_requested": days_requested,
+        "user": {},
+        "items": items,
+    }
+
+
+"""
+generate_asset_report generates an asset report with generate_asset_report_data and
+converts it to the plaid AssetReport model, as returned by /asset_report/get
+"""
+
+
+def generate_asset_report(
+    seed: int = 0,
+    num_items: int = 1,
+    accounts_per_item: int = 2,
+    transactions_per_account: int = 250,
+    days_requested: int = 365,
+    end_date: date = None,
+) -> AssetReport:
+    data = generate_asset_report_data(
+        seed,
+        num_items,
+        accounts_per_item,
+        transactions_per_account,
+        days_requested,
+        end_date,
+    )
+    return validate_and_convert_types(
+        data, (AssetReport,), ["report"], True, True, Configuration()
+    )
+
+
+def _identifier(rng: random.Random) -> str:
+    return "".join(rng.choice(_IDENTIFIER_CHARACTERS) for _ in range(24))
+
+
+def _generate_account(
+    rng: random.Random,
+    name: str,
+    num_transactions: int,
+    days_requested: int,
+    end_date: date,
+    kind: Tuple[str, str] = None,
+) -> Dict[str, Any]:
+    if kind is None:
+        (kind,) = rng.choices(
+            [account for account, _ in ACCOUNT_MIX],
+            weights=[weight for _, weight in ACCOUNT_MIX],
+        )
+    account_type, subtype = kind
+    account_id = _identifier(rng)
+
+    entries = []
+    if subtype == "checking":
+        # Paychecks, rent and car payments recur on a schedule, everything else is drawn
+        # at random until the account has num_transactions transactions
+        for primary, detailed, every, low, high in RECURRING_TRANSACTIONS:
+            amount = round(rng.uniform(low, high), 2)
+            day = rng.randrange(every)
+            while day < days_requested and len(entries) < num_transactions // 3:
+                entries.append((day, primary, detailed, amount))
+                day += every
+    everyday = EVERYDAY_TRANSACTIONS[account_type]
+    weights = [entry[2] for entry in everyday]
+    while len(entries) < num_transactions:
+        ((primary, detailed, _, low, high),) = rng.choices(everyday, weights=weights)
+        amount = round(rng.uniform(low, high), 2)
+        if account_type == "depository" and rng.random() < OUTLIER_RATE:
+            amount = round(rng.choice([-1, 1]) * rng.uniform(10000.0, 50000.0), 2)
+        entries.append((rng.randrange(days_requested), primary, detailed, amount))
+    # Transactions are listed from the most recent
+    entries.sort(key=lambda entry: entry[0])
+
+    transactions = []
+    daily_amounts = defaultdict(float)
+    for day, primary, detailed, amount in entries:
+        transaction_date = end_date - timedelta(days=day)
+        daily_amounts[day] += amount
+        transactions.append(
+            {
+                "account_id": account_id,
+                "transaction_id": _identifier(rng),
+                "original_description": detailed.replace("_", " ").lower(),
+                "amount": amount,
+                "iso_currency_code": "USD",
+                "unofficial_currency_code": None,
+                "date": transaction_date.isoformat(),
+                "pending": False,
+                "credit_category": {"primary": primary, "detailed": detailed},
+            }
+        )
+
+    current, historical_balances = _balance_history(
+        rng, account_type, daily_amounts, days_requested, end_date
+    )
+    return {
+        "account_id": account_id,
+        "balances": {
+            "available": current if account_type == "depository" else None,
+            "current": current,
+            "limit": 5000.0 if account_type == "credit" else None,
+            "iso_currency_code": "USD",
+            "unofficial_currency_code": None,
+        },
+        "mask": f"{rng.randint(0, 9999):04d}",
+        "name": f"Account {name}",
+        "official_name": None,
+        "type": account_type,
+        "subtype": subtype,
+        "days_available": days_requested,
+        "transactions": transactions,
+        "owners": [
+            {
+                "names": ["Alberta Bobbeth Charleson"],
+                "phone_numbers": [],
+                "emails": [],
+                "addresses": [],
+            }
+        ],
+        "historical_balances": historical_balances,
+    }
+
+
+def _balance_history(
+    rng: random.Random,
+    account_type: str,
+    daily_amounts: Dict[int, float],
+    days_requested: int,
+    end_date: date,
+) -> Tuple[float, List[Dict[str, Any]]]:
+    # Walk back from the current balance, undoing each day's transactions. A positive
+    # amount lowers a depository balance and raises the amount owed on credit and loans
+    direction = 1 if account_type == "depository" else -1
+    changes = []
+    change = 0.0
+    for day in range(days_requested):
+        changes.append(change)
+        change += direction * daily_amounts.get(day, 0.0)
+    # Pick the lowest balance over the history, and shift the current balance so that
+    # the history never goes below it. Some checking accounts dip below zero
+    if account_type == "depository":
+        lowest = rng.uniform(-400.0, 1500.0)
+    elif account_type == "credit":
+        lowest = rng.uniform(0.0, 800.0)
+    else:
+        lowest = rng.uniform(5000.0, 40000.0)
+    current = round(lowest - min(changes, default=0.0), 2)
+    historical_balances = [
+        {
+            "date": (end_date - timedelta(days=day)).isoformat(),
+            "current": round(current + change, 2),
+            "iso_currency_code": "USD",
+            "unofficial_currency_code": None,
+        }
+        for day, change in enumerate(changes)
+    ]
+    return current, historical_balances
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Write synthetic /asset_report/get responses as JSONL"
+    )
+    parser.add_argument("--size", choices=list(SIZES), default="small")
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--days-requested", type=int, default=365)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None)
+    parser.add_argument("--output", required=True, help="the JSONL file to write")
+    args = parser.parse_args(argv)
+
+    with open(args.output, "w") as output:
+        for index in range(args.count):
+            report = generate_asset_report_data(
+                args.seed + index,
+                days_requested=args.days_requested,
+                end_date=args.end_date,
+                **SIZES[args.size],
+            )
+            response = {
+                "report": report,
+                "warnings": [],
+                "request_id": f"synthetic-{index}",
+            }
+            output.write(json.dumps(response) + "\n")
+
+
+if __name__ == "__main__":
+    main()
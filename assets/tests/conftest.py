@@ -0,0 +1,100 @@
+import importlib.util
+import os
+import sys
+from datetime import date
+
+import pytest
+
+ASSETS_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The attribute files import the assets-level modules by their flat names
+if ASSETS_DIRECTORY not in sys.path:
+    sys.path.insert(0, ASSETS_DIRECTORY)
+
+from synthetic import generate_asset_report, generate_asset_report_data  # noqa: E402
+
+# Reports end on a fixed date so that they are the same from one day to the next
+END_DATE = date(2024, 1, 1)
+
+# The shape of the synthetic report shared by the tests
+REPORT_SEED = 7
+REPORT_ARGUMENTS = {
+    "num_items": 2,
+    "accounts_per_item": 3,
+    "transactions_per_account": 120,
+    "days_requested": 180,
+    "end_date": END_DATE,
+}
+
+
+# The attribute files that define one function per attribute, in both levels
+ATTRIBUTE_FILES = [
+    "cash_flow",
+    "debt_insights",
+    "historical_balances",
+    "negative_record",
+    "unusual_account_activity",
+]
+
+
+def load_attribute_module(level: str, name: str):
+    # The account and report files share names, so each is loaded under its own name
+    module_name = f"{level}_{name}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    # registry.py, batch.py and pipeline.py import the attributes.py of their level
+    siblings = {}
+    if name != "attributes":
+        siblings["attributes"] = load_attribute_module(level, "attributes")
+    previous = {sibling: sys.modules.get(sibling) for sibling in siblings}
+    sys.modules.update(siblings)
+    try:
+        path = os.path.join(ASSETS_DIRECTORY, level, f"{name}.py")
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    finally:
+        for sibling, sibling_module in previous.items():
+            if sibling_module is None:
+                sys.modules.pop(sibling, None)
+            else:
+                sys.modules[sibling] = sibling_module
+    return module
+
+
+def expected_attributes(level: str, source, attributes):
+    # Every attribute computed by its own function in the attribute files of the level
+    modules = [load_attribute_module(level, name) for name in ATTRIBUTE_FILES]
+    results = {}
+    for attribute in attributes:
+        module = next(module for module in modules if hasattr(module, attribute))
+        results[attribute] = getattr(module, attribute)(source)
+    return results
+
+
+@pytest.fixture
+def attribute_module():
+    return load_attribute_module
+
+
+@pytest.fixture(scope="session")
+def report_data():
+    return generate_asset_report_data(REPORT_SEED, **REPORT_ARGUMENTS)
+
+
+@pytest.fixture(scope="session")
+def asset_report():
+    return generate_asset_report(REPORT_SEED, **REPORT_ARGUMENTS)
+
+
+def assert_attributes_equal(actual, expected):
+    # Values computed along different paths can differ by floating point rounding
+    assert actual.keys() == expected.keys()
+    for name, value in expected.items():
+        if isinstance(value, dict):
+            assert_attributes_equal(actual[name], value)
+        elif isinstance(value, float):
+            assert actual[name] == pytest.approx(value, rel=1e-9, abs=1e-6), name
+        else:
+            assert actual[name] == value, name
@@ -0,0 +1,114 @@
+import gc
+import weakref
+from datetime import date
+
+import numpy as np
+import pytest
+
+from balances import (
+    build_dense_balances,
+    clear_dense_balances,
+    get_account_dense_balances,
+    get_report_dense_balances,
+)
+from conftest import assert_attributes_equal, load_attribute_module
+from records import AccountRecord, BalanceRecord, ItemRecord, ReportRecord
+
+historical_balances = load_attribute_module("report", "historical_balances")
+
+
+def test_historical_balance_attributes_match_each_function(asset_report):
+    clear_dense_balances()
+    names = [
+        "avg_historical_balance",
+        "min_historical_balance",
+        "max_historical_balance",
+    ]
+    attributes = historical_balances.historical_balance_attributes(asset_report)
+    assert_attributes_equal(
+        {name: attributes[name] for name in names},
+        {name: getattr(historical_balances, name)(asset_report) for name in names},
+    )
+
+
+def test_historical_balance_attributes_require_a_balance():
+    report = ReportRecord(
+        "empty", [ItemRecord("item", [AccountRecord("account", "depository", [], [])])]
+    )
+    for name in ["min_historical_balance", "max_historical_balance"]:
+        with pytest.raises(ValueError):
+            getattr(historical_balances, name)(report)
+    for gap_policy in ["skip", "forward_fill", "zero"]:
+        with pytest.raises(ValueError):
+            historical_balances.historical_balance_attributes(report, gap_policy)
+
+
+def _account(account_id, balances):
+    # balances maps a day of January 2024 to the balance of the account on that day
+    return AccountRecord(
+        account_id,
+        "depository",
+        [],
+        [
+            BalanceRecord(date(2024, 1, day), current)
+            for day, current in balances.items()
+        ],
+    )
+
+
+def _gapped_balances():
+    # "ends" covers January 1-4 without the 3rd, "starts" covers January 3-7 without
+    # the 6th and "empty" has no balances
+    return build_dense_balances(
+        [
+            _account("ends", {1: 10.0, 2: 20.0, 4: 40.0}),
+            _account("starts", {3: 1.0, 4: 2.0, 5: 3.0, 7: 5.0}),
+            _account("empty", {}),
+        ]
+    )
+
+
+def test_totals_of_each_gap_policy():
+    dense_balances = _gapped_balances()
+    assert dense_balances.day(0) == date(2024, 1, 1)
+    assert dense_balances.num_days == 7
+    expected = {
+        "skip": [10.0, 20.0, 1.0, 42.0, 3.0, np.nan, 5.0],
+        # "ends" is not carried past January 4th
+        "forward_fill": [10.0, 20.0, 21.0, 42.0, 3.0, 3.0, 5.0],
+        "zero": [10.0, 20.0, 1.0, 42.0, 3.0, 0.0, 5.0],
+    }
+    for gap_policy, totals in expected.items():
+        np.testing.assert_array_equal(dense_balances.totals(gap_policy), totals)
+    with pytest.raises(ValueError):
+        dense_balances.totals("interpolate")
+
+
+def test_coverage():
+    assert _gapped_balances().coverage() == {
+        "ends": {
+            "first_date": date(2024, 1, 1),
+            "last_date": date(2024, 1, 4),
+            "days": 3,
+            "missing_days": 1,
+        },
+        "starts": {
+            "first_date": date(2024, 1, 3),
+            "last_date": date(2024, 1, 7),
+            "days": 4,
+            "missing_days": 1,
+        },
+        "empty": {"first_date": None, "last_date": None, "days": 0, "missing_days": 0},
+    }
+
+
+def test_dense_balances_cache_does_not_keep_reports_alive():
+    clear_dense_balances()
+    account = _account("account", {1: 10.0, 2: -5.0})
+    report = ReportRecord("report", [ItemRecord("item", [account])])
+    get_report_dense_balances(report, True)
+    get_account_dense_balances(account)
+    references = [weakref.ref(report), weakref.ref(account)]
+    del report, account
+    gc.collect()
+    assert [reference() for reference in references] == [None, None]
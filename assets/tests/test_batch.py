@@ -0,0 +1,133 @@
+import csv
+import json
+
+import pytest
+
+from conftest import assert_attributes_equal, expected_attributes, load_attribute_module
+from synthetic import generate_asset_report, generate_asset_report_data
+
+batch = load_attribute_module("report", "batch")
+report_attributes = load_attribute_module("report", "attributes")
+
+
+# The shape of the reports in reports_path
+REPORTS_ARGUMENTS = {"accounts_per_item": 2, "transactions_per_account": 30}
+
+
+@pytest.fixture
+def reports_path(tmp_path):
+    path = tmp_path / "reports.jsonl"
+    with open(path, "w") as reports:
+        for seed in range(5):
+            report = generate_asset_report_data(seed, **REPORTS_ARGUMENTS)
+            reports.write(json.dumps({"report": report}) + "\n")
+    return path
+
+
+def test_resume_counts_only_skipped_reports(tmp_path, reports_path):
+    output = tmp_path / "attributes.csv"
+    checkpoint = tmp_path / "attributes.checkpoint"
+    # A checkpoint entry that is not in this input is not a skipped report
+    checkpoint.write_text("1\n2\nmissing\n")
+    stats = batch.run_batch(
+        str(reports_path), str(output), workers=1, checkpoint_path=str(checkpoint)
+    )
+    assert stats["skipped"] == 2
+    assert stats["scored"] == 3
+
+
+def test_resume_rejects_different_csv_columns(tmp_path, reports_path):
+    output = tmp_path / "attributes.csv"
+    checkpoint = tmp_path / "attributes.checkpoint"
+    batch.run_batch(
+        str(reports_path),
+        str(output),
+        attributes=["num_inflows"],
+        workers=1,
+        checkpoint_path=str(checkpoint),
+    )
+    with open(output, newline="") as rows:
+        assert next(csv.reader(rows)) == batch.KEY_COLUMNS + ["num_inflows"]
+    with pytest.raises(ValueError):
+        batch.run_batch(
+            str(reports_path),
+            str(output),
+            attributes=["num_outflows"],
+            workers=1,
+            checkpoint_path=str(checkpoint),
+        )
+
+
+def test_parquet_parts_share_one_schema(tmp_path, reports_path):
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    output = tmp_path / "attributes"
+    batch.run_batch(
+        str(reports_path), str(output), output_format="parquet", workers=1, chunksize=1
+    )
+    schemas = [
+        pyarrow_parquet.read_schema(str(part)) for part in sorted(output.iterdir())
+    ]
+    assert len(schemas) == 5
+    assert all(schema.equals(schemas[0]) for schema in schemas)
+    assert schemas[0].names == batch.KEY_COLUMNS + report_attributes.REPORT_ATTRIBUTES
+
+
+def test_parquet_rows_match_each_function(tmp_path, reports_path):
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    output = tmp_path / "attributes"
+    batch.run_batch(str(reports_path), str(output), output_format="parquet", workers=1)
+    rows = pyarrow_parquet.read_table(str(output)).to_pylist()
+    assert sorted(row["report_key"] for row in rows) == ["1", "2", "3", "4", "5"]
+    for row in rows:
+        # Line n of the input is the report of seed n - 1
+        asset_report = generate_asset_report(
+            int(row["report_key"]) - 1, **REPORTS_ARGUMENTS
+        )
+        assert row.pop("report_key") and row.pop("asset_report_id") == (
+            asset_report.asset_report_id
+        )
+        values = {
+            attribute: json.loads(value) if isinstance(value, str) else value
+            for attribute, value in row.items()
+        }
+        assert_attributes_equal(
+            values,
+            expected_attributes(
+                "report", asset_report, report_attributes.REPORT_ATTRIBUTES
+            ),
+        )
+
+
+def test_resume_adds_to_the_saved_sketches(tmp_path, reports_path):
+    output = tmp_path / "attributes.csv"
+    checkpoint = tmp_path / "attributes.checkpoint"
+    sketch = tmp_path / "attributes.sketch"
+    # Only report 0 is left for the resumed run to score
+    checkpoint.write_text("1\n2\n3\n4\n")
+    batch.AttributeSketches().save(str(sketch))
+    batch.run_batch(
+        str(reports_path),
+        str(output),
+        attributes=["num_inflows"],
+        workers=1,
+        checkpoint_path=str(checkpoint),
+        sketch_path=str(sketch),
+    )
+    sketches = batch.AttributeSketches.load(str(sketch))
+    assert sketches.sketches["num_inflows"].n == 1
+    assert not (tmp_path / "attributes.sketch.tmp").exists()
+
+
+def test_resume_requires_the_sketch_file(tmp_path, reports_path):
+    output = tmp_path / "attributes.csv"
+    checkpoint = tmp_path / "attributes.checkpoint"
+    checkpoint.write_text("1\n")
+    with pytest.raises(RuntimeError):
+        batch.run_batch(
+            str(reports_path),
+            str(output),
+            workers=1,
+            checkpoint_path=str(checkpoint),
+            sketch_path=str(tmp_path / "attributes.sketch"),
+        )
+    assert not output.exists()
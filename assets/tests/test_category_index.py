@@ -0,0 +1,67 @@
+from datetime import date
+
+from records import AccountRecord, TransactionRecord, intern_category
+from utils import (
+    clear_category_indexes,
+    filter_account_transactions_by_category,
+    get_account_category_summary,
+)
+
+
+def _linear_filter(account, primary_category, detailed_category=""):
+    # The scan filter_account_transactions_by_category replaced
+    return [
+        transaction
+        for transaction in account.transactions
+        if transaction.credit_category.primary == primary_category
+        and (
+            not detailed_category
+            or transaction.credit_category.detailed == detailed_category
+        )
+    ]
+
+
+def _categories(account):
+    categories = set()
+    for transaction in account.transactions:
+        primary = transaction.credit_category.primary
+        categories.add((primary, ""))
+        categories.add((primary, transaction.credit_category.detailed))
+    return sorted(categories) + [("MISSING", ""), ("BANK_PENALTIES", "MISSING")]
+
+
+def test_category_filters_match_a_linear_scan(asset_report):
+    clear_category_indexes()
+    for item in asset_report.items:
+        for account in item.accounts:
+            for primary, detailed in _categories(account):
+                expected = _linear_filter(account, primary, detailed)
+                assert (
+                    filter_account_transactions_by_category(account, primary, detailed)
+                    == expected
+                )
+                summary = get_account_category_summary(account, primary, detailed)
+                assert summary.count == len(expected)
+                assert summary.total == sum(t.amount for t in expected)
+
+
+def test_category_index_sees_appended_transactions():
+    clear_category_indexes()
+    rent = intern_category("RENT_AND_UTILITIES", "RENT_AND_UTILITIES_RENT")
+    transactions = [TransactionRecord(-1200.0, date(2024, 1, 1), rent)]
+    account = AccountRecord("account", "depository", transactions, [])
+    assert get_account_category_summary(account, "RENT_AND_UTILITIES").count == 1
+
+    # Appended in place, so the list is the same object with one more transaction
+    transactions.append(TransactionRecord(-1250.0, date(2024, 2, 1), rent))
+    assert filter_account_transactions_by_category(
+        account, "RENT_AND_UTILITIES"
+    ) == _linear_filter(account, "RENT_AND_UTILITIES")
+    summary = get_account_category_summary(account, "RENT_AND_UTILITIES")
+    assert (summary.count, summary.total) == (2, -2450.0)
+
+    # A change that keeps the length is only seen after clearing the index
+    transactions[0] = TransactionRecord(-1000.0, date(2024, 1, 1), rent)
+    clear_category_indexes(account.account_id)
+    summary = get_account_category_summary(account, "RENT_AND_UTILITIES")
+    assert (summary.count, summary.total) == (2, -2250.0)
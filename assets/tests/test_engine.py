@@ -0,0 +1,57 @@
+from conftest import assert_attributes_equal, expected_attributes, load_attribute_module
+from summary import requested_groups, summarize_account
+
+account_attributes = load_attribute_module("account", "attributes")
+report_attributes = load_attribute_module("report", "attributes")
+
+
+def test_account_attributes_match_each_function(asset_report):
+    for item in asset_report.items:
+        for account in item.accounts:
+            assert_attributes_equal(
+                account_attributes.compute_account_attributes(account),
+                expected_attributes(
+                    "account", account, account_attributes.ACCOUNT_ATTRIBUTES
+                ),
+            )
+
+
+def test_account_attributes_compute_only_the_requested(asset_report):
+    account = asset_report.items[0].accounts[0]
+    attributes = ["num_inflows", "max_od_nsf", "min_historical_balance"]
+    assert_attributes_equal(
+        account_attributes.compute_account_attributes(account, attributes),
+        expected_attributes("account", account, attributes),
+    )
+
+
+def test_report_attributes_match_each_function(asset_report):
+    assert_attributes_equal(
+        report_attributes.compute_report_attributes(asset_report),
+        expected_attributes(
+            "report", asset_report, report_attributes.REPORT_ATTRIBUTES
+        ),
+    )
+
+
+def test_report_attributes_merge_account_summaries_in_any_order(asset_report):
+    accounts = [account for item in asset_report.items for account in item.accounts]
+    groups, monthly_groups = requested_groups(
+        report_attributes.REPORT_ATTRIBUTES, report_attributes.TRANSACTION_ATTRIBUTES
+    )
+    summaries = [
+        summarize_account(
+            account,
+            groups,
+            monthly_groups,
+            10000.00,
+            str(account.type) == "depository",
+        )
+        for account in accounts
+    ]
+    assert_attributes_equal(
+        report_attributes.report_attributes_from_summaries(summaries[::-1]),
+        expected_attributes(
+            "report", asset_report, report_attributes.REPORT_ATTRIBUTES
+        ),
+    )
@@ -0,0 +1,76 @@
+from collections import defaultdict
+
+from conftest import assert_attributes_equal, expected_attributes, load_attribute_module
+from frame import build_transaction_frame, monthly_summary_of_columns
+from records import TransactionRecord, extract_report_records
+
+account_attributes = load_attribute_module("account", "attributes")
+report_attributes = load_attribute_module("report", "attributes")
+account_frame_attributes = load_attribute_module("account", "frame_attributes")
+report_frame_attributes = load_attribute_module("report", "frame_attributes")
+
+
+def test_report_frame_attributes_match_each_function(asset_report):
+    frame = build_transaction_frame(asset_report)
+    attributes = report_attributes.REPORT_ATTRIBUTES
+    assert_attributes_equal(
+        {
+            attribute: getattr(report_frame_attributes, attribute)(frame)
+            for attribute in attributes
+        },
+        expected_attributes("report", asset_report, attributes),
+    )
+
+
+def test_account_frame_attributes_match_each_function(asset_report):
+    frame = build_transaction_frame(asset_report)
+    attributes = account_attributes.ACCOUNT_ATTRIBUTES
+    for item in asset_report.items:
+        for account in item.accounts:
+            account_index = frame.account_index(account.account_id)
+            assert_attributes_equal(
+                {
+                    attribute: getattr(account_frame_attributes, attribute)(
+                        frame, account_index
+                    )
+                    for attribute in attributes
+                },
+                expected_attributes("account", account, attributes),
+            )
+
+
+def test_frame_of_records_matches_each_function(asset_report):
+    frame = build_transaction_frame(extract_report_records(asset_report))
+    attributes = report_attributes.REPORT_ATTRIBUTES
+    assert_attributes_equal(
+        {
+            attribute: getattr(report_frame_attributes, attribute)(frame)
+            for attribute in attributes
+        },
+        expected_attributes("report", asset_report, attributes),
+    )
+
+
+def test_frame_of_a_record_without_a_category(asset_report):
+    # A transaction without a credit category is a record that holds None
+    records = extract_report_records(asset_report)
+    account = records.items[0].accounts[0]
+    account.transactions.append(
+        TransactionRecord(25.0, account.transactions[0].date, None)
+    )
+    frame = build_transaction_frame(records)
+    transactions = frame.transaction_slice(0)
+    assert len(frame.amounts[transactions]) == len(account.transactions)
+    assert frame.primary_codes[transactions][-1] == -1
+    assert frame.detailed_codes[transactions][-1] == -1
+    assert (frame.primary_codes[transactions][:-1] >= 0).all()
+
+
+def test_frame_monthly_summaries_default_to_zero(asset_report):
+    frame = build_transaction_frame(asset_report)
+    for monthly_summary in [
+        report_frame_attributes.cash_flow_monthly_summary(frame),
+        monthly_summary_of_columns(frame.dates[:0], frame.amounts[:0]),
+    ]:
+        assert isinstance(monthly_summary, defaultdict)
+        assert monthly_summary["1999-01"] == 0.0
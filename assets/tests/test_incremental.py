@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+from conftest import END_DATE, assert_attributes_equal, load_attribute_module
+from incremental import ReportState
+from records import AccountRecord, ItemRecord, ReportRecord, extract_report_records
+
+account_attributes = load_attribute_module("account", "attributes")
+report_attributes = load_attribute_module("report", "attributes")
+
+
+def _window(report, start, end, dropped_account_ids=()):
+    # The report as a refresh covering only the days from start to end would return it
+    return ReportRecord(
+        report.asset_report_id,
+        [
+            ItemRecord(
+                item.item_id,
+                [
+                    AccountRecord(
+                        account.account_id,
+                        account.type,
+                        [t for t in account.transactions if start <= t.date <= end],
+                        [
+                            b
+                            for b in account.historical_balances
+                            if start <= b.date <= end
+                        ],
+                    )
+                    for account in item.accounts
+                    if account.account_id not in dropped_account_ids
+                ],
+            )
+            for item in report.items
+        ],
+    )
+
+
+def test_refreshes_match_a_recompute_of_the_latest_report(asset_report):
+    report = extract_report_records(asset_report)
+    first_account = report.items[0].accounts[0].account_id
+    last_account = report.items[-1].accounts[-1].account_id
+    refreshes = [
+        _window(report, END_DATE - timedelta(170), END_DATE - timedelta(60)),
+        _window(report, END_DATE - timedelta(140), END_DATE - timedelta(30)),
+        _window(
+            report,
+            END_DATE - timedelta(110),
+            END_DATE,
+            dropped_account_ids={last_account},
+        ),
+    ]
+    state = ReportState()
+    for refresh in refreshes:
+        state.update(refresh)
+        # Round trip the state between refreshes, as a service would
+        state = ReportState.from_dict(state.to_dict())
+        assert_attributes_equal(
+            report_attributes.report_attributes_from_summaries(
+                state.account_summaries()
+            ),
+            report_attributes.compute_report_attributes(refresh),
+        )
+
+    assert last_account not in state.accounts
+    account = refreshes[-1].items[0].accounts[0]
+    assert_attributes_equal(
+        account_attributes.account_attributes_from_summary(
+            state.accounts[first_account]
+        ),
+        account_attributes.compute_account_attributes(account),
+    )
@@ -0,0 +1,49 @@
+from conftest import load_attribute_module
+from instrumentation import Instrumentation
+
+negative_record = load_attribute_module("account", "negative_record")
+ORIGINAL = negative_record.longest_negative_balance_streak
+
+
+def _calls(instrumentation, name):
+    stats = instrumentation.to_dict().get(f"{negative_record.__name__}.{name}")
+    return stats["calls"] if stats else 0
+
+
+def test_nested_call_is_recorded_once(asset_report):
+    account = asset_report.items[0].accounts[0]
+    with Instrumentation(negative_record) as instrumentation:
+        negative_record.longest_negative_balance_streak(account)
+    assert _calls(instrumentation, "longest_negative_balance_streak") == 1
+    assert _calls(instrumentation, "negative_balance_run_attributes") == 0
+    assert negative_record.longest_negative_balance_streak is ORIGINAL
+
+
+def test_nested_contexts_restore_the_original(asset_report):
+    account = asset_report.items[0].accounts[0]
+    instrumentation = Instrumentation(negative_record)
+    with instrumentation:
+        with instrumentation:
+            negative_record.longest_negative_balance_streak(account)
+        # The inner exit does not stop the outer context
+        negative_record.longest_negative_balance_streak(account)
+    assert negative_record.longest_negative_balance_streak is ORIGINAL
+    assert _calls(instrumentation, "longest_negative_balance_streak") == 2
+
+
+def test_overlapping_contexts_restore_the_original(asset_report):
+    account = asset_report.items[0].accounts[0]
+    first = Instrumentation(negative_record)
+    second = Instrumentation(negative_record)
+    first.instrument()
+    negative_record.longest_negative_balance_streak(account)
+    second.instrument()
+    negative_record.longest_negative_balance_streak(account)
+    first.restore()
+    assert negative_record.longest_negative_balance_streak is not ORIGINAL
+    negative_record.longest_negative_balance_streak(account)
+    second.restore()
+    assert negative_record.longest_negative_balance_streak is ORIGINAL
+    negative_record.longest_negative_balance_streak(account)
+    assert _calls(first, "longest_negative_balance_streak") == 2
+    assert _calls(second, "longest_negative_balance_streak") == 2
@@ -0,0 +1,63 @@
+import json
+
+from conftest import (
+    assert_attributes_equal,
+    expected_attributes,
+    load_attribute_module,
+)
+from lazy import LazyAssetReport
+
+account_attributes = load_attribute_module("account", "attributes")
+report_attributes = load_attribute_module("report", "attributes")
+cash_flow = load_attribute_module("report", "cash_flow")
+negative_record = load_attribute_module("report", "negative_record")
+
+
+def _raw(report_data, account_type=None):
+    # Indented, with escaped quotes in names, to exercise the bracket index
+    report_data = json.loads(json.dumps(report_data))
+    for item in report_data["items"]:
+        for account in item["accounts"]:
+            account["name"] = 'Checking "main" \\ {1}'
+        if account_type is not None:
+            item["accounts"][-1]["type"] = account_type
+    return json.dumps({"report": report_data}, indent=2).encode()
+
+
+def test_lazy_report_matches_each_function(asset_report, report_data):
+    lazy_report = LazyAssetReport(_raw(report_data))
+    assert lazy_report.asset_report_id == asset_report.asset_report_id
+    assert_attributes_equal(
+        expected_attributes(
+            "report", lazy_report, report_attributes.REPORT_ATTRIBUTES
+        ),
+        expected_attributes(
+            "report", asset_report, report_attributes.REPORT_ATTRIBUTES
+        ),
+    )
+    lazy_accounts = lazy_report.accounts
+    accounts = [account for item in asset_report.items for account in item.accounts]
+    assert [account.account_id for account in lazy_accounts] == [
+        account.account_id for account in accounts
+    ]
+    for lazy_account, account in zip(lazy_accounts, accounts):
+        assert_attributes_equal(
+            expected_attributes(
+                "account", lazy_account, account_attributes.ACCOUNT_ATTRIBUTES
+            ),
+            expected_attributes(
+                "account", account, account_attributes.ACCOUNT_ATTRIBUTES
+            ),
+        )
+
+
+def test_lazy_report_only_parses_accounts_it_reads(report_data):
+    lazy_report = LazyAssetReport(_raw(report_data, "credit"))
+    assert lazy_report.num_loaded_accounts() == 0
+    # Depository only attributes never parse the other accounts
+    negative_record.count_od_nsf(lazy_report)
+    depository = [a for a in lazy_report.accounts if str(a.type) == "depository"]
+    assert lazy_report.num_loaded_accounts() == len(depository)
+    assert len(depository) < len(lazy_report.accounts)
+    cash_flow.num_transactions(lazy_report)
+    assert lazy_report.num_loaded_accounts() == len(lazy_report.accounts)
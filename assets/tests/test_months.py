@@ -0,0 +1,86 @@
+from collections import defaultdict
+
+from conftest import REPORT_ARGUMENTS, REPORT_SEED, load_attribute_module
+from months import (
+    clear_monthly_buckets,
+    get_report_monthly_buckets,
+    net_monthly_summary,
+)
+from synthetic import generate_asset_report
+from utils import calculate_monthly_summary_of_transactions
+
+account_cash_flow = load_attribute_module("account", "cash_flow")
+report_cash_flow = load_attribute_module("report", "cash_flow")
+
+
+def _transactions(asset_report):
+    return [
+        transaction
+        for item in asset_report.items
+        for account in item.accounts
+        for transaction in account.transactions
+    ]
+
+
+def test_account_monthly_summaries_match_calculation(asset_report):
+    clear_monthly_buckets()
+    for item in asset_report.items:
+        for account in item.accounts:
+            transactions = account.transactions
+            assert account_cash_flow.inflows_monthly_summary(
+                account
+            ) == calculate_monthly_summary_of_transactions(
+                [t for t in transactions if t.amount < 0]
+            )
+            assert account_cash_flow.outflows_monthly_summary(
+                account
+            ) == calculate_monthly_summary_of_transactions(
+                [t for t in transactions if t.amount > 0]
+            )
+            assert account_cash_flow.monthly_cash_flow(
+                account
+            ) == calculate_monthly_summary_of_transactions(transactions)
+
+
+def test_report_monthly_summaries_match_calculation(asset_report):
+    clear_monthly_buckets()
+    transactions = _transactions(asset_report)
+    assert report_cash_flow.inflows_monthly_summary(
+        asset_report
+    ) == calculate_monthly_summary_of_transactions(
+        [t for t in transactions if t.amount < 0]
+    )
+    assert report_cash_flow.outflows_monthly_summary(
+        asset_report
+    ) == calculate_monthly_summary_of_transactions(
+        [t for t in transactions if t.amount > 0]
+    )
+    assert report_cash_flow.cash_flow_monthly_summary(
+        asset_report
+    ) == calculate_monthly_summary_of_transactions(transactions)
+
+
+def test_report_monthly_buckets_check_report_identity(asset_report):
+    clear_monthly_buckets()
+    # The same seed gives a report with the same asset_report_id
+    refreshed = generate_asset_report(REPORT_SEED, **REPORT_ARGUMENTS)
+    for transaction in _transactions(refreshed):
+        transaction.amount += 1.0
+    first = get_report_monthly_buckets(asset_report).summary("net")
+    second = get_report_monthly_buckets(refreshed).summary("net")
+    assert second == calculate_monthly_summary_of_transactions(
+        _transactions(refreshed)
+    )
+    assert second != first
+
+
+def test_monthly_summaries_default_to_zero(asset_report):
+    clear_monthly_buckets()
+    account = asset_report.items[0].accounts[0]
+    for monthly_summary in [
+        account_cash_flow.monthly_cash_flow(account),
+        report_cash_flow.cash_flow_monthly_summary(asset_report),
+        net_monthly_summary(account.transactions),
+    ]:
+        assert isinstance(monthly_summary, defaultdict)
+        assert monthly_summary["1999-01"] == 0.0
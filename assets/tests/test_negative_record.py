@@ -0,0 +1,120 @@
+from datetime import date
+
+import pytest
+
+import balances
+from conftest import REPORT_ARGUMENTS, REPORT_SEED, load_attribute_module
+from records import AccountRecord, BalanceRecord, ItemRecord, ReportRecord
+from synthetic import generate_asset_report
+
+STREAK_ATTRIBUTES = [
+    "longest_negative_balance_streak",
+    "num_negative_balance_episodes",
+    "days_since_negative_balance",
+    "average_negative_episode_depth",
+]
+AS_OF = date(2024, 2, 1)
+
+
+@pytest.fixture(scope="module")
+def asset_report():
+    # Balances shifted down so that every account has several negative streaks
+    asset_report = generate_asset_report(REPORT_SEED, **REPORT_ARGUMENTS)
+    for item in asset_report.items:
+        for account in item.accounts:
+            currents = sorted(b.current for b in account.historical_balances)
+            median = currents[len(currents) // 2]
+            for balance in account.historical_balances:
+                balance.current -= median
+    return asset_report
+
+
+def _levels(asset_report):
+    account = asset_report.items[0].accounts[0]
+    return [
+        (load_attribute_module("account", "negative_record"), account),
+        (load_attribute_module("report", "negative_record"), asset_report),
+    ]
+
+
+def test_streak_functions_match_run_attributes(asset_report):
+    for negative_record, source in _levels(asset_report):
+        for gap_policy in balances.GAP_POLICIES:
+            expected = negative_record.negative_balance_run_attributes(
+                source, gap_policy, AS_OF
+            )
+            assert expected["num_negative_balance_episodes"] > 1
+            for name in STREAK_ATTRIBUTES:
+                function = getattr(negative_record, name)
+                assert function(source, gap_policy, as_of=AS_OF) == expected[name]
+
+
+def test_streak_functions_share_one_pass(asset_report, monkeypatch):
+    calls = []
+    compute = balances._negative_balance_attributes
+
+    def counted(*args):
+        calls.append(args)
+        return compute(*args)
+
+    monkeypatch.setattr(balances, "_negative_balance_attributes", counted)
+    balances.clear_dense_balances()
+    for negative_record, source in _levels(asset_report):
+        calls.clear()
+        for name in STREAK_ATTRIBUTES:
+            getattr(negative_record, name)(source, as_of=AS_OF)
+        assert len(calls) == 1
+        # A result read from the cache can be changed without changing the cache
+        negative_record.negative_balance_run_attributes(source, as_of=AS_OF).clear()
+        assert negative_record.days_since_negative_balance(source, as_of=AS_OF) >= 0
+
+
+def test_streak_attributes_of_hand_built_balances():
+    # January 1-10 of 2024 without the 6th: three negative streaks of 2, 1 and 3 days
+    # with a missing day between the last two
+    currents = [5.0, -3.0, -7.0, 2.0, -1.0, None, -4.0, -2.0, -6.0, 1.0]
+    account = AccountRecord(
+        "account",
+        "depository",
+        [],
+        [
+            BalanceRecord(date(2024, 1, day), current)
+            for day, current in enumerate(currents, start=1)
+            if current is not None
+        ],
+    )
+    report = ReportRecord("report", [ItemRecord("item", [account])])
+    skipped = {
+        "count_negative_historical_balances": 6,
+        "lowest_negative_historical_balance": -7.0,
+        "average_negative_historical_balance": -23.0 / 6,
+        "longest_negative_balance_streak": 3,
+        "num_negative_balance_episodes": 3,
+        # The last negative balance is on January 9th
+        "days_since_negative_balance": 23,
+        "average_negative_episode_depth": -14.0 / 3,
+    }
+    expected = {
+        "skip": skipped,
+        # A balance of 0 on the 6th still ends the second streak
+        "zero": skipped,
+        # The -1.0 of the 5th carries over the 6th and joins the last two streaks
+        "forward_fill": {
+            "count_negative_historical_balances": 7,
+            "lowest_negative_historical_balance": -7.0,
+            "average_negative_historical_balance": -24.0 / 7,
+            "longest_negative_balance_streak": 5,
+            "num_negative_balance_episodes": 2,
+            "days_since_negative_balance": 23,
+            "average_negative_episode_depth": -6.5,
+        },
+    }
+    balances.clear_dense_balances()
+    for negative_record, source in [
+        (load_attribute_module("account", "negative_record"), account),
+        (load_attribute_module("report", "negative_record"), report),
+    ]:
+        for gap_policy, attributes in expected.items():
+            assert negative_record.negative_balance_run_attributes(
+                source, gap_policy, AS_OF
+            ) == pytest.approx(attributes)
@@ -0,0 +1,110 @@
+from datetime import date
+
+import numpy as np
+
+from conftest import load_attribute_module
+from outliers import OUTLIER_THRESHOLDS
+from records import AccountRecord, ItemRecord, ReportRecord, TransactionRecord
+
+
+def test_counts_above_match_num_outlier_transactions(asset_report):
+    account = asset_report.items[0].accounts[0]
+    accounts = [account for item in asset_report.items for account in item.accounts]
+    for level, source, source_accounts in [
+        ("account", account, [account]),
+        ("report", asset_report, accounts),
+    ]:
+        unusual_account_activity = load_attribute_module(
+            level, "unusual_account_activity"
+        )
+        amounts = [
+            abs(transaction.amount)
+            for account in source_accounts
+            for transaction in account.transactions
+        ]
+        # The default thresholds, thresholds equal to an amount, which is not above
+        # itself, and thresholds below and above every amount
+        thresholds = OUTLIER_THRESHOLDS + sorted(set(amounts))[::7]
+        thresholds += [0.0, float(np.quantile(amounts, 0.9)), max(amounts) + 1.0]
+        counts = unusual_account_activity.num_outlier_transactions_by_threshold(
+            source, thresholds
+        )
+        assert counts == {
+            threshold: unusual_account_activity.num_outlier_transactions(
+                source, threshold
+            )
+            for threshold in thresholds
+        }
+        assert counts[0.0] == len(amounts) - amounts.count(0.0)
+        assert counts[max(amounts) + 1.0] == 0
+
+
+def _transactions(amounts):
+    return [TransactionRecord(amount, date(2024, 1, 1), None) for amount in amounts]
+
+
+def test_statistical_outlier_counts_of_hand_computed_amounts():
+    # The absolute amounts are 8, 9, 10, 11, 12, 13, 14, 40 and 100, with a mean of
+    # 24.11 and a standard deviation of 28.37, so the z-scores of 40 and 100 are 0.56
+    # and 2.68. The median is 12 and the MAD 2, so their modified z-scores are
+    # 0.6745 * 28 / 2 = 9.44 and 0.6745 * 88 / 2 = 29.68, and 0.67 for 14
+    account = AccountRecord(
+        "account",
+        "depository",
+        _transactions([8.0, -9.0, 10.0, 11.0, 12.0, -13.0, 14.0, 40.0, -100.0]),
+        [],
+    )
+    # The same transactions split across two accounts
+    report = ReportRecord(
+        "report",
+        [
+            ItemRecord(
+                "item",
+                [
+                    AccountRecord("first", "depository", account.transactions[:4], []),
+                    AccountRecord("second", "depository", account.transactions[4:], []),
+                ],
+            )
+        ],
+    )
+    for level, source in [("account", account), ("report", report)]:
+        unusual_account_activity = load_attribute_module(
+            level, "unusual_account_activity"
+        )
+        # 100 is not 3 standard deviations above the mean, as it inflates them itself
+        assert unusual_account_activity.num_z_score_outlier_transactions(source) == 0
+        assert (
+            unusual_account_activity.num_z_score_outlier_transactions(source, 2.5) == 1
+        )
+        assert (
+            unusual_account_activity.num_z_score_outlier_transactions(source, 0.5) == 2
+        )
+        assert unusual_account_activity.num_mad_outlier_transactions(source) == 2
+        assert unusual_account_activity.num_mad_outlier_transactions(source, 10.0) == 1
+        assert unusual_account_activity.outlier_transaction_counts(source, [12.0]) == {
+            "num_outlier_transactions_by_threshold": {12.0: 4},
+            "num_z_score_outlier_transactions": 0,
+            "num_mad_outlier_transactions": 2,
+        }
+
+
+def test_statistical_outlier_counts_without_spread():
+    # Every amount the same, or more than half of them, leaves nothing to scale by
+    account = AccountRecord(
+        "account", "depository", _transactions([50.0] * 6 + [-50.0, 900.0]), []
+    )
+    unusual_account_activity = load_attribute_module(
+        "account", "unusual_account_activity"
+    )
+    assert unusual_account_activity.num_mad_outlier_transactions(account) == 0
+    # With 7 of 8 amounts the same, the z-score of 900 is sqrt(7) = 2.65
+    assert unusual_account_activity.num_z_score_outlier_transactions(account) == 0
+    assert unusual_account_activity.num_z_score_outlier_transactions(account, 2.6) == 1
+    empty = AccountRecord("empty", "depository", [], [])
+    assert unusual_account_activity.outlier_transaction_counts(empty) == {
+        "num_outlier_transactions_by_threshold": {
+            threshold: 0 for threshold in OUTLIER_THRESHOLDS
+        },
+        "num_z_score_outlier_transactions": 0,
+        "num_mad_outlier_transactions": 0,
+    }
@@ -0,0 +1,127 @@
+import asyncio
+import importlib.util
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import load_attribute_module
+from synthetic import generate_asset_report_data
+
+pipeline = load_attribute_module("report", "pipeline")
+
+# Only the ConnectionPool needs httpx
+requires_httpx = pytest.mark.skipif(
+    importlib.util.find_spec("httpx") is None, reason="httpx is not installed"
+)
+
+
+def _responses(count):
+    return {
+        f"assets-stub-{seed}": json.dumps(
+            {"report": generate_asset_report_data(seed, transactions_per_account=30)}
+        ).encode()
+        for seed in range(count)
+    }
+
+
+async def _score(responses, consume, queue_size=64):
+    server = pipeline.StubServer(responses)
+    port = await server.start()
+    pool = pipeline.ConnectionPool(f"http://127.0.0.1:{port}", size=4)
+    try:
+        with ThreadPoolExecutor(2) as executor:
+            rows = pipeline.score_report_tokens(
+                pool,
+                list(responses),
+                executor=executor,
+                concurrency=4,
+                queue_size=queue_size,
+            )
+            try:
+                return await consume(rows)
+            finally:
+                await rows.aclose()
+    finally:
+        await pool.close()
+        await server.close()
+
+
+@requires_httpx
+def test_rows_match_scoring_each_response():
+    responses = _responses(4)
+
+    async def consume(rows):
+        return {token: (row, error) async for token, row, error in rows}
+
+    results = asyncio.run(_score(responses, consume))
+    assert set(results) == set(responses)
+    for token, (row, error) in results.items():
+        assert error is None
+        assert row == pipeline.score_asset_report_response(responses[token])
+
+
+@requires_httpx
+def test_stopping_early_cancels_reports_in_flight():
+    responses = _responses(8)
+
+    async def consume(rows):
+        async for token, row, error in rows:
+            break
+        await rows.aclose()
+        return [
+            task
+            for task in asyncio.all_tasks()
+            if task.get_coro().__name__ == "process" and not task.done()
+        ]
+
+    assert asyncio.run(_score(responses, consume, queue_size=1)) == []
+
+
+def test_score_bank_income_response():
+    today = date.today()
+    transactions = [
+        {
+            "amount": 1500.0,
+            "date": str(today - timedelta(days=days)),
+            "name": "PAYROLL",
+            "original_description": "PAYROLL",
+            "pending": False,
+            "transaction_id": f"transaction-{days}",
+            "check_number": None,
+            "iso_currency_code": "USD",
+            "unofficial_currency_code": None,
+        }
+        for days in range(1, 90, 14)
+    ]
+    source = {
+        "income_source_id": "source",
+        "income_description": "PAYROLL",
+        "income_category": "SALARY",
+        "account_id": "account",
+        "start_date": transactions[-1]["date"],
+        "end_date": transactions[0]["date"],
+        "pay_frequency": "BIWEEKLY",
+        "total_amount": 1500.0 * len(transactions),
+        "transaction_count": len(transactions),
+        "historical_summary": [{"transactions": transactions}],
+    }
+    body = json.dumps(
+        {
+            "request_id": "request",
+            "bank_income": [
+                {
+                    "bank_income_id": f"bank-income-{index}",
+                    "generated_time": f"2024-01-0{index + 1}T00:00:00Z",
+                    "days_requested": 90,
+                    "items": [{"item_id": "item", "bank_income_sources": [source]}],
+                }
+                for index in range(2)
+            ],
+        }
+    ).encode()
+    row = pipeline.score_bank_income_response(body)
+    assert row["bank_income_id"] == "bank-income-1"
+    assert row["num_active_sources"] == 1
+    assert row["monthly_average_net_income"] > 0
@@ -0,0 +1,39 @@
+from conftest import assert_attributes_equal, expected_attributes, load_attribute_module
+from records import extract_account_records, extract_report_records
+
+account_attributes = load_attribute_module("account", "attributes")
+report_attributes = load_attribute_module("report", "attributes")
+
+
+def test_report_records_match_the_model(asset_report):
+    attributes = report_attributes.REPORT_ATTRIBUTES
+    assert_attributes_equal(
+        expected_attributes("report", extract_report_records(asset_report), attributes),
+        expected_attributes("report", asset_report, attributes),
+    )
+
+
+def test_account_records_match_the_model(asset_report):
+    attributes = account_attributes.ACCOUNT_ATTRIBUTES
+    for item in asset_report.items:
+        for account in item.accounts:
+            records = extract_account_records(account)
+            assert_attributes_equal(
+                expected_attributes("account", records, attributes),
+                expected_attributes("account", account, attributes),
+            )
+            assert_attributes_equal(
+                account_attributes.compute_account_attributes(records),
+                expected_attributes("account", account, attributes),
+            )
+
+
+def test_categories_are_interned(asset_report):
+    records = extract_report_records(asset_report)
+    categories = {}
+    for item in records.items:
+        for account in item.accounts:
+            for transaction in account.transactions:
+                category = transaction.credit_category
+                key = (category.primary, category.detailed)
+                assert categories.setdefault(key, category) is category
@@ -0,0 +1,48 @@
+import pytest
+
+from attribute_graph import AttributeRegistry
+from conftest import assert_attributes_equal, expected_attributes, load_attribute_module
+
+account_registry = load_attribute_module("account", "registry")
+report_registry = load_attribute_module("report", "registry")
+
+
+def test_report_registry_matches_each_function(asset_report):
+    attributes = list(report_registry.REPORT_REGISTRY.attributes)
+    assert_attributes_equal(
+        report_registry.evaluate_report_attributes(asset_report),
+        expected_attributes("report", asset_report, attributes),
+    )
+
+
+def test_account_registry_matches_each_function(asset_report):
+    attributes = list(account_registry.ACCOUNT_REGISTRY.attributes)
+    for item in asset_report.items:
+        for account in item.accounts:
+            assert_attributes_equal(
+                account_registry.evaluate_account_attributes(account),
+                expected_attributes("account", account, attributes),
+            )
+
+
+def test_intermediates_are_computed_once():
+    registry = AttributeRegistry(parameters={"offset": 1})
+    calls = []
+
+    @registry.intermediate("doubled", "source")
+    def _doubled(source):
+        calls.append(source)
+        return [value * 2 for value in source]
+
+    @registry.intermediate("shifted", "doubled", "offset")
+    def _shifted(doubled, offset):
+        return [value + offset for value in doubled]
+
+    registry.attribute("total", "shifted")(sum)
+    registry.attribute("count", "doubled")(len)
+
+    assert registry.plan(["total", "count"]) == ["doubled", "shifted"]
+    assert registry.evaluate([1, 2], offset=2) == {"total": 10, "count": 2}
+    assert len(calls) == 1
+    with pytest.raises(ValueError):
+        registry.evaluate([1, 2], ["missing"])
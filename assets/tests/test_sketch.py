@@ -0,0 +1,62 @@
+import numpy as np
+
+from sketch import AttributeSketches, KllSketch
+from synthetic import generate_asset_report_data
+
+QUANTILES = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+
+def _amounts():
+    report = generate_asset_report_data(
+        3, num_items=2, accounts_per_item=3, transactions_per_account=2000
+    )
+    return [
+        transaction["amount"]
+        for item in report["items"]
+        for account in item["accounts"]
+        for transaction in account["transactions"]
+    ]
+
+
+def _max_rank_error(sketch, values):
+    values = np.sort(values)
+    errors = []
+    for q, estimate in zip(QUANTILES, sketch.quantiles(QUANTILES)):
+        rank = np.searchsorted(values, estimate, side="right") / len(values)
+        errors.append(abs(rank - q))
+    return max(errors)
+
+
+def test_quantiles_are_within_the_rank_error():
+    amounts = _amounts()
+    sketch = KllSketch()
+    for amount in amounts:
+        sketch.update(amount)
+    assert sketch.n == len(amounts)
+    assert _max_rank_error(sketch, amounts) < 0.02
+
+
+def test_merged_and_restored_sketches_keep_the_rank_error():
+    amounts = _amounts()
+    halves = [KllSketch(seed=0), KllSketch(seed=1)]
+    for index, amount in enumerate(amounts):
+        halves[index % 2].update(amount)
+    restored = KllSketch.from_dict(halves[0].to_dict())
+    restored.merge(halves[1])
+    assert restored.n == len(amounts)
+    assert restored.min == min(amounts)
+    assert restored.max == max(amounts)
+    assert _max_rank_error(restored, amounts) < 0.02
+
+
+def test_attribute_sketches_skip_non_numeric_values():
+    sketches = AttributeSketches()
+    sketches.update_all(
+        [
+            {"num_inflows": 3, "flag": True, "monthly": {}, "avg": float("nan")},
+            {"num_inflows": 5, "avg": 1.5},
+        ]
+    )
+    assert sorted(sketches.sketches) == ["avg", "num_inflows"]
+    assert sketches.sketches["num_inflows"].n == 2
+    assert sketches.sketches["avg"].n == 1
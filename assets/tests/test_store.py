@@ -0,0 +1,60 @@
+import pytest
+
+from conftest import (
+    REPORT_ARGUMENTS,
+    assert_attributes_equal,
+    expected_attributes,
+    load_attribute_module,
+)
+from store import TransactionStore
+from synthetic import generate_asset_report
+
+account_attributes = load_attribute_module("account", "attributes")
+report_attributes = load_attribute_module("report", "attributes")
+account_frame_attributes = load_attribute_module("account", "frame_attributes")
+report_frame_attributes = load_attribute_module("report", "frame_attributes")
+
+
+def _frame_attributes(frame):
+    return {
+        attribute: getattr(report_frame_attributes, attribute)(frame)
+        for attribute in report_attributes.REPORT_ATTRIBUTES
+    }
+
+
+def test_stored_reports_match_each_function(tmp_path, asset_report):
+    # A second report adds categories and offsets the first report's columns
+    other_report = generate_asset_report(11, **REPORT_ARGUMENTS)
+    store = TransactionStore(str(tmp_path))
+    store.append(other_report)
+    store.append(asset_report)
+    with pytest.raises(ValueError):
+        store.append(asset_report)
+
+    reopened = TransactionStore(str(tmp_path))
+    assert reopened.asset_report_ids() == [
+        other_report.asset_report_id,
+        asset_report.asset_report_id,
+    ]
+    for report in (other_report, asset_report):
+        frame = reopened.frame(report.asset_report_id)
+        assert_attributes_equal(
+            _frame_attributes(frame),
+            expected_attributes(
+                "report", report, report_attributes.REPORT_ATTRIBUTES
+            ),
+        )
+        for item in report.items:
+            for account in item.accounts:
+                account_index = frame.account_index(account.account_id)
+                assert_attributes_equal(
+                    {
+                        attribute: getattr(account_frame_attributes, attribute)(
+                            frame, account_index
+                        )
+                        for attribute in account_attributes.ACCOUNT_ATTRIBUTES
+                    },
+                    expected_attributes(
+                        "account", account, account_attributes.ACCOUNT_ATTRIBUTES
+                    ),
+                )
@@ -0,0 +1,62 @@
+import io
+import json
+
+from conftest import assert_attributes_equal, expected_attributes, load_attribute_module
+from stream import AssetReportStream
+
+account_attributes = load_attribute_module("account", "attributes")
+report_attributes = load_attribute_module("report", "attributes")
+
+
+def _response(report_data):
+    return io.StringIO(json.dumps({"report": report_data}))
+
+
+def test_report_attributes_from_json_match_each_function(asset_report, report_data):
+    assert_attributes_equal(
+        report_attributes.compute_report_attributes_from_json(
+            _response(report_data)
+        ),
+        expected_attributes(
+            "report", asset_report, report_attributes.REPORT_ATTRIBUTES
+        ),
+    )
+
+
+def test_account_attributes_from_json_match_each_function(asset_report, report_data):
+    results = account_attributes.compute_account_attributes_from_json(
+        _response(report_data)
+    )
+    accounts = [account for item in asset_report.items for account in item.accounts]
+    assert list(results) == [account.account_id for account in accounts]
+    for account in accounts:
+        assert_attributes_equal(
+            results[account.account_id],
+            expected_attributes(
+                "account", account, account_attributes.ACCOUNT_ATTRIBUTES
+            ),
+        )
+
+
+def test_report_stream_reads_the_report_id(asset_report, report_data):
+    report_stream = AssetReportStream(_response(report_data))
+    report_attributes.report_attributes_from_stream(
+        report_stream, ["num_transactions"]
+    )
+    assert report_stream.asset_report_id == asset_report.asset_report_id
+
+
+def test_numbers_split_across_chunks():
+    # Every chunk size splits the numbers after their sign, digits, point or exponent
+    # somewhere
+    response = (
+        '{"report": {"days_requested": -12.5e1, "asset_report_id": "report", '
+        '"client_report_id": 1.25, "items": [{"item_id": "item", "accounts": '
+        '[{"account_id": "account", "type": "depository", "transactions": [], '
+        '"historical_balances": []}]}], "user": 7}}'
+    )
+    for chunk_size in range(1, len(response) + 1):
+        report_stream = AssetReportStream(io.StringIO(response), chunk_size)
+        accounts = list(report_stream.accounts())
+        assert [account["account_id"] for account in accounts] == ["account"]
+        assert report_stream.asset_report_id == "report"
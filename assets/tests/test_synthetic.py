@@ -0,0 +1,35 @@
+from conftest import REPORT_ARGUMENTS, REPORT_SEED
+from synthetic import SIZES, generate_asset_report, generate_asset_report_data
+
+
+def test_the_same_seed_gives_the_same_report(report_data):
+    assert generate_asset_report_data(REPORT_SEED, **REPORT_ARGUMENTS) == report_data
+    assert generate_asset_report_data(REPORT_SEED + 1, **REPORT_ARGUMENTS) != (
+        report_data
+    )
+
+
+def test_report_model_matches_its_data(asset_report, report_data):
+    assert asset_report.asset_report_id == report_data["asset_report_id"]
+    for item, item_data in zip(asset_report.items, report_data["items"]):
+        assert item.item_id == item_data["item_id"]
+        for account, account_data in zip(item.accounts, item_data["accounts"]):
+            assert account.account_id == account_data["account_id"]
+            assert [t.amount for t in account.transactions] == [
+                t["amount"] for t in account_data["transactions"]
+            ]
+            assert [b.current for b in account.historical_balances] == [
+                b["current"] for b in account_data["historical_balances"]
+            ]
+
+
+def test_sizes_have_the_requested_shape():
+    # The larger sizes take too long to generate in the test suite
+    for size in ["tiny", "small"]:
+        arguments = SIZES[size]
+        asset_report = generate_asset_report(0, days_requested=30, **arguments)
+        accounts = [account for item in asset_report.items for account in item.accounts]
+        assert len(asset_report.items) == arguments["num_items"]
+        assert len(accounts) == arguments["num_items"] * arguments["accounts_per_item"]
+        for account in accounts:
+            assert len(account.transactions) == arguments["transactions_per_account"]
@@ -0,0 +1,55 @@
+import gc
+import weakref
+
+import pytest
+
+from conftest import REPORT_ARGUMENTS, REPORT_SEED
+from synthetic import generate_asset_report
+
+from utils import (
+    calculate_user_historical_balances,
+    cached_user_historical_balances,
+    clear_historical_balances_cache,
+)
+
+
+def test_cached_user_historical_balances_matches_calculation(asset_report):
+    clear_historical_balances_cache()
+    for include_depository_only in (False, True):
+        expected = calculate_user_historical_balances(
+            asset_report, include_depository_only
+        )
+        assert dict(
+            cached_user_historical_balances(asset_report, include_depository_only)
+        ) == dict(expected)
+
+
+def test_cached_user_historical_balances_checks_report_identity(asset_report):
+    clear_historical_balances_cache()
+    # The same seed gives a report with the same asset_report_id
+    refreshed = generate_asset_report(REPORT_SEED, **REPORT_ARGUMENTS)
+    for item in refreshed.items:
+        for account in item.accounts:
+            for balance in account.historical_balances:
+                balance.current += 100.0
+    first = cached_user_historical_balances(asset_report, True)
+    second = cached_user_historical_balances(refreshed, True)
+    assert refreshed.asset_report_id == asset_report.asset_report_id
+    assert dict(second) == dict(calculate_user_historical_balances(refreshed, True))
+    assert dict(second) != dict(first)
+
+
+def test_cached_user_historical_balances_is_read_only(asset_report):
+    balances = cached_user_historical_balances(asset_report, True)
+    with pytest.raises(TypeError):
+        balances[next(iter(balances))] = 0.0
+
+
+def test_historical_balances_cache_does_not_keep_reports_alive():
+    clear_historical_balances_cache()
+    report = generate_asset_report(REPORT_SEED, **REPORT_ARGUMENTS)
+    cached_user_historical_balances(report, True)
+    reference = weakref.ref(report)
+    del report
+    gc.collect()
+    assert reference() is None
@@ -0,0 +1,82 @@
+import gc
+import weakref
+from datetime import timedelta
+
+import pytest
+
+from conftest import END_DATE, load_attribute_module
+from records import AccountRecord, ItemRecord, ReportRecord, extract_report_records
+from window_index import WINDOWED_ATTRIBUTES, clear_window_indexes
+
+ATTRIBUTE_FILES = ["cash_flow", "debt_insights", "negative_record"]
+WINDOWS = [7, 30, 90]
+
+
+def _attribute_function(level, name):
+    for module_name in ATTRIBUTE_FILES:
+        module = load_attribute_module(level, module_name)
+        if hasattr(module, name):
+            return getattr(module, name)
+    raise AttributeError(name)
+
+
+def _in_window(transactions, window_days):
+    start = END_DATE - timedelta(window_days)
+    return [t for t in transactions if start < t.date <= END_DATE]
+
+
+def _account_in_window(account, window_days):
+    return AccountRecord(
+        account.account_id,
+        account.type,
+        _in_window(account.transactions, window_days),
+        account.historical_balances,
+    )
+
+
+@pytest.mark.parametrize("name", list(WINDOWED_ATTRIBUTES))
+def test_account_windows_match_filtered_attributes(asset_report, name):
+    windows = load_attribute_module("account", "windows")
+    function = _attribute_function("account", name)
+    report = extract_report_records(asset_report)
+    for item in report.items:
+        for account in item.accounts:
+            for window_days in WINDOWS:
+                assert getattr(windows, name)(
+                    account, window_days, END_DATE
+                ) == pytest.approx(function(_account_in_window(account, window_days)))
+
+
+@pytest.mark.parametrize("name", list(WINDOWED_ATTRIBUTES))
+def test_report_windows_match_filtered_attributes(asset_report, name):
+    windows = load_attribute_module("report", "windows")
+    function = _attribute_function("report", name)
+    report = extract_report_records(asset_report)
+    for window_days in WINDOWS:
+        filtered = ReportRecord(
+            report.asset_report_id,
+            [
+                ItemRecord(
+                    item.item_id,
+                    [
+                        _account_in_window(account, window_days)
+                        for account in item.accounts
+                    ],
+                )
+                for item in report.items
+            ],
+        )
+        assert getattr(windows, name)(report, window_days, END_DATE) == pytest.approx(
+            function(filtered)
+        )
+
+
+def test_window_index_cache_does_not_keep_reports_alive(asset_report):
+    windows = load_attribute_module("report", "windows")
+    clear_window_indexes()
+    report = extract_report_records(asset_report)
+    windows.num_inflows(report, 30, END_DATE)
+    reference = weakref.ref(report)
+    del report
+    gc.collect()
+    assert reference() is None
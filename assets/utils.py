@@ -1,6 +1,8 @@
-from typing import Dict, List
-from collections import defaultdict
-from datetime import datetime
+from typing import Dict, List, Mapping
+from types import MappingProxyType
+from collections import OrderedDict, defaultdict
+from datetime import date, datetime
+import weakref
 
 
 from plaid.model.asset_report import AssetReport
@@ -35,6 +37,88 @@ def calculate_user_historical_balances(
     return user_historical_balances
 
 
+# Memoized results of calculate_user_historical_balances, keyed by
+# (asset_report_id, include_depository_only) and stored with a weak reference to the
+# report they were computed from, so that the cache never keeps a report alive. The
+# least recently used entry is evicted once the cache holds
+# HISTORICAL_BALANCES_CACHE_SIZE entries.
+HISTORICAL_BALANCES_CACHE_SIZE = 128
+_historical_balances_cache = OrderedDict()
+_historical_balances_cache_stats = {"hits": 0, "misses": 0}
+
+
+"""
+cached_user_historical_balances returns the same balances as
+calculate_user_historical_balances, but only aggregates the balances of a report once for
+each include_depository_only value. Later calls for the same report object read the
+memoized balances
+
+Params
+* asset_report: the asset report retrieved through /asset_report/get
+* include_depository_account: whether to ignore all non-depository accounts
+
+Returns
+* A read-only map of date to the users net balance across all accounts on that date
+"""
+
+
+def cached_user_historical_balances(
+    asset_report: AssetReport,
+    include_depository_only: bool = False,
+) -> Mapping[str, float]:
+    key = (asset_report.asset_report_id, include_depository_only)
+    entry = _historical_balances_cache.get(key)
+    # An entry is only reused for the same report object, so a report with the same
+    # id from another refresh, or reports without an id, get their own balances
+    if entry is not None and entry[0]() is asset_report:
+        _historical_balances_cache_stats["hits"] += 1
+        _historical_balances_cache.move_to_end(key)
+        return entry[1]
+
+    _historical_balances_cache_stats["misses"] += 1
+    user_historical_balances = MappingProxyType(
+        calculate_user_historical_balances(asset_report, include_depository_only)
+    )
+    _historical_balances_cache[key] = (
+        weakref.ref(asset_report),
+        user_historical_balances,
+    )
+    _historical_balances_cache.move_to_end(key)
+    if len(_historical_balances_cache) > HISTORICAL_BALANCES_CACHE_SIZE:
+        _historical_balances_cache.popitem(last=False)
+    return user_historical_balances
+
+
+"""
+clear_historical_balances_cache drops the memoized historical balances of the given
+report, or of every report if no asset_report_id is given
+"""
+
+
+def clear_historical_balances_cache(asset_report_id: str = None) -> None:
+    if asset_report_id is None:
+        _historical_balances_cache.clear()
+        return
+    for include_depository_only in (False, True):
+        _historical_balances_cache.pop((asset_report_id, include_depository_only), None)
+
+
+"""
+historical_balances_cache_info returns the number of cache hits and misses of
+cached_user_historical_balances since the process started, along with the current
+and maximum number of memoized reports
+"""
+
+
+def historical_balances_cache_info() -> Dict[str, int]:
+    return {
+        "hits": _historical_balances_cache_stats["hits"],
+        "misses": _historical_balances_cache_stats["misses"],
+        "size": len(_historical_balances_cache),
+        "max_size": HISTORICAL_BALANCES_CACHE_SIZE,
+    }
+
+
 """
 filter_account_transactions_by_category takes in an asset account and returns the
 transactions in the account that match a given category
@@ -54,17 +138,8 @@ def filter_account_transactions_by_category(
     primary_category: str,
     detailed_category: str = "",
 ) -> List[AssetReportTransaction]:
-    filtered_transactions = []
-    for transaction in asset_report_account.transactions:
-        if transaction.credit_category.primary != primary_category:
-            continue
-        if (
-            detailed_category
-            and transaction.credit_category.detailed != detailed_category
-        ):
-            continue
-        filtered_transactions.append(transaction)
-    return filtered_transactions
+    category_index = get_account_category_index(asset_report_account)
+    return list(category_index.transactions_for(primary_category, detailed_category))
 
 
 """
@@ -116,9 +191,43 @@ Returns
 def calculate_monthly_summary_of_transactions(
     transactions: List[AssetReportTransaction],
 ) -> Dict[str, float]:
-    monthly_summary = defaultdict(float)
+    # Bucket by integer month and only format the months that occur
+    monthly_totals = defaultdict(float)
     for transaction in transactions:
-        monthly_summary[transaction.date.strftime("%Y-%m")] += transaction.amount
+        monthly_totals[month_ordinal(transaction.date)] += transaction.amount
+    return month_keyed(monthly_totals)
+
+
+"""
+month_ordinal returns the month of a date as an integer, counting months since year 0, so
+that consecutive months are consecutive integers. month_string converts it back to the
+"YYYY-MM" key used by the monthly summaries, and month_from_string parses such a key
+"""
+
+
+def month_ordinal(value: date) -> int:
+    return value.year * 12 + value.month - 1
+
+
+def month_string(month: int) -> str:
+    return f"{month // 12:04d}-{month % 12 + 1:02d}"
+
+
+def month_from_string(value: str) -> int:
+    year, month = value.split("-")
+    return int(year) * 12 + int(month) - 1
+
+
+"""
+month_keyed converts a map of month ordinal to amount into the map of "YYYY-MM" key to
+amount returned by the monthly summary attributes
+"""
+
+
+def month_keyed(monthly_totals: Dict[int, float]) -> Dict[str, float]:
+    monthly_summary = defaultdict(float)
+    for month, amount in monthly_totals.items():
+        monthly_summary[month_string(month)] = amount
     return monthly_summary
 
 
@@ -143,3 +252,259 @@ def get_most_recent_transaction(
         transactions,
         key=lambda transaction: transaction.date,
     )
+
+
+"""
+TransactionSummary keeps running aggregates for a group of transactions so that
+the count, total, min, max, average, monthly summary and most recent date can all
+be read after a single pass over the transactions
+
+Params
+* track_monthly: whether to keep the map of month to net amount for the group
+
+Usage
+* call add(amount, transaction_date) once for every transaction in the group
+* call merge(other) to combine the summaries of two disjoint groups of transactions
+* to_dict() and from_dict(data) convert the summary to and from JSON serializable data
+"""
+
+
+class TransactionSummary:
+    def __init__(self, track_monthly: bool = True):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.most_recent_date = None
+        # Net amount per month ordinal. Month keys are only formatted by monthly
+        self.months = defaultdict(float) if track_monthly else None
+
+    def add(self, amount: float, transaction_date: date) -> None:
+        self.count += 1
+        self.total += amount
+        if self.min is None or amount < self.min:
+            self.min = amount
+        if self.max is None or amount > self.max:
+            self.max = amount
+        if self.most_recent_date is None or transaction_date > self.most_recent_date:
+            self.most_recent_date = transaction_date
+        if self.months is not None:
+            self.months[month_ordinal(transaction_date)] += amount
+
+    def merge(self, other: "TransactionSummary") -> "TransactionSummary":
+        merged = TransactionSummary(
+            track_monthly=self.months is not None and other.months is not None
+        )
+        merged.count = self.count + other.count
+        merged.total = self.total + other.total
+        merged.min = merge_extreme(self.min, other.min, min)
+        merged.max = merge_extreme(self.max, other.max, max)
+        merged.most_recent_date = merge_extreme(
+            self.most_recent_date, other.most_recent_date, max
+        )
+        if merged.months is not None:
+            for months in (self.months, other.months):
+                for month, amount in months.items():
+                    merged.months[month] += amount
+        return merged
+
+    @property
+    def monthly(self) -> Dict[str, float]:
+        if self.months is None:
+            return None
+        return month_keyed(self.months)
+
+    def average(self) -> float:
+        if self.count == 0:
+            return 0.0
+        return self.total / self.count
+
+    def days_since_most_recent(self) -> int:
+        if self.most_recent_date is None:
+            return 0
+        return (date.today() - self.most_recent_date).days
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "most_recent_date": self.most_recent_date.isoformat()
+            if self.most_recent_date
+            else None,
+            "monthly": dict(self.monthly) if self.months is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TransactionSummary":
+        summary = cls(track_monthly=data["monthly"] is not None)
+        summary.count = data["count"]
+        summary.total = data["total"]
+        summary.min = data["min"]
+        summary.max = data["max"]
+        if data["most_recent_date"]:
+            summary.most_recent_date = date.fromisoformat(data["most_recent_date"])
+        if summary.months is not None:
+            for month, amount in data["monthly"].items():
+                summary.months[month_from_string(month)] = amount
+        return summary
+
+
+"""
+merge_extreme returns the extreme (pick is min or max) of two optional values, ignoring
+a value that is None
+"""
+
+
+def merge_extreme(first, second, pick):
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return pick(first, second)
+
+
+"""
+merge_transaction_summaries takes in a list of TransactionSummary and merges them into
+one, as if every transaction had been added to a single summary. Merging is associative,
+so summaries can be built per account, per worker or per refresh and combined later
+
+Params
+* summaries: the summaries to merge
+
+Returns
+* The merged TransactionSummary
+"""
+
+
+def merge_transaction_summaries(
+    summaries: List[TransactionSummary],
+) -> TransactionSummary:
+    merged = TransactionSummary()
+    for summary in summaries:
+        merged = merged.merge(summary)
+    return merged
+
+
+"""
+CategoryIndex groups the transactions of an account by credit category, keyed by
+the primary category and by the (primary, detailed) category pair, so that filtering
+and summarizing a category reads the index instead of rescanning every transaction
+
+Params
+* transactions: the transactions of the account to index
+"""
+
+
+class CategoryIndex:
+    def __init__(self, transactions: List[AssetReportTransaction]):
+        self.transactions = transactions
+        self.num_transactions = len(transactions)
+        self.by_primary = defaultdict(list)
+        self.by_detailed = defaultdict(list)
+        for transaction in transactions:
+            primary = transaction.credit_category.primary
+            detailed = transaction.credit_category.detailed
+            self.by_primary[primary].append(transaction)
+            self.by_detailed[(primary, detailed)].append(transaction)
+        self._summaries = {}
+
+    def transactions_for(
+        self, primary_category: str, detailed_category: str = ""
+    ) -> List[AssetReportTransaction]:
+        if detailed_category:
+            return self.by_detailed.get((primary_category, detailed_category), [])
+        return self.by_primary.get(primary_category, [])
+
+    def summary(
+        self, primary_category: str, detailed_category: str = ""
+    ) -> TransactionSummary:
+        key = (primary_category, detailed_category)
+        if key not in self._summaries:
+            summary = TransactionSummary()
+            for transaction in self.transactions_for(
+                primary_category, detailed_category
+            ):
+                summary.add(transaction.amount, transaction.date)
+            self._summaries[key] = summary
+        return self._summaries[key]
+
+
+# Category indexes shared by every attribute module, keyed by account_id. The least
+# recently used index is evicted once the table holds CATEGORY_INDEX_CACHE_SIZE accounts.
+CATEGORY_INDEX_CACHE_SIZE = 1024
+_category_indexes = OrderedDict()
+
+
+"""
+get_account_category_index takes in an asset account and returns its CategoryIndex,
+building it on the first call and reusing it on every later call for the same account.
+The index is rebuilt when the account's transaction list is replaced or changes length,
+e.g. after transactions are appended to it. Any other in-place change to the list, such
+as replacing one transaction with another, needs a call to clear_category_indexes
+
+Params
+* asset_report_account: one of the accounts retrieved through /asset_report/get
+
+Returns
+* The CategoryIndex of the account
+"""
+
+
+def get_account_category_index(asset_report_account: AccountAssets) -> CategoryIndex:
+    account_id = asset_report_account.account_id
+    category_index = _category_indexes.get(account_id)
+    # An account with the same id from another report (e.g. after a refresh) has its
+    # own transaction list, so the cached index is only reused for the same list, and
+    # only while it has as many transactions as when it was indexed
+    transactions = asset_report_account.transactions
+    if (
+        category_index is None
+        or category_index.transactions is not transactions
+        or category_index.num_transactions != len(transactions)
+    ):
+        category_index = CategoryIndex(transactions)
+        _category_indexes[account_id] = category_index
+        if len(_category_indexes) > CATEGORY_INDEX_CACHE_SIZE:
+            _category_indexes.popitem(last=False)
+    _category_indexes.move_to_end(account_id)
+    return category_index
+
+
+"""
+clear_category_indexes drops the cached category index of the given account, or of
+every account if no account_id is given
+"""
+
+
+def clear_category_indexes(account_id: str = None) -> None:
+    if account_id is None:
+        _category_indexes.clear()
+    else:
+        _category_indexes.pop(account_id, None)
+
+
+"""
+get_account_category_summary takes in an asset account and returns the count, total,
+min, max, average, monthly summary and most recent date of the transactions that
+match a given category, read from the account's category index
+
+Params
+* asset_report_account: one of the accounts retrieved through /asset_report/get
+* primary_category: the primary category to summarize
+* detailed_category: the (optional) detailed category to summarize
+
+Returns
+* A TransactionSummary for the matching transactions
+"""
+
+
+def get_account_category_summary(
+    asset_report_account: AccountAssets,
+    primary_category: str,
+    detailed_category: str = "",
+) -> TransactionSummary:
+    return get_account_category_index(asset_report_account).summary(
+        primary_category, detailed_category
+    )
@@ -0,0 +1,240 @@
+import weakref
+from typing import Any, Callable, Dict, List, Tuple
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+
+from plaid.model.account_assets import AccountAssets
+from plaid.model.asset_report import AssetReport
+
+# The groups of transactions that can be queried over a window
+WINDOW_GROUPS = [
+    "transactions",
+    "inflows",
+    "outflows",
+    "LOAN_DISBURSEMENTS",
+    "LOAN_PAYMENTS",
+    "BANK_PENALTIES",
+]
+
+# Groups that only include transactions from depository accounts at the report level,
+# in line with debt_insights.py and negative_record.py
+DEPOSITORY_ONLY_GROUPS = ["LOAN_DISBURSEMENTS", "BANK_PENALTIES"]
+
+# The attributes that can be computed over a window, as (group, statistic). Each name
+# matches the attribute of the same name in the account and report level attribute files
+WINDOWED_ATTRIBUTES = {
+    "num_inflows": ("inflows", "count"),
+    "total_inflows_amount": ("inflows", "total"),
+    "num_outflows": ("outflows", "count"),
+    "total_outflows_amount": ("outflows", "total"),
+    "num_transactions": ("transactions", "count"),
+    "net_cash_flow": ("transactions", "total"),
+    "count_loan_disbursements": ("LOAN_DISBURSEMENTS", "count"),
+    "amount_loan_disbursements": ("LOAN_DISBURSEMENTS", "total"),
+    "avg_loan_disbursement": ("LOAN_DISBURSEMENTS", "average"),
+    "count_loan_payments": ("LOAN_PAYMENTS", "count"),
+    "amount_loan_payments": ("LOAN_PAYMENTS", "total"),
+    "avg_loan_payment": ("LOAN_PAYMENTS", "average"),
+    "count_od_nsf": ("BANK_PENALTIES", "count"),
+    "amount_od_nsf": ("BANK_PENALTIES", "total"),
+    "avg_od_nsf": ("BANK_PENALTIES", "average"),
+}
+
+
+"""
+WindowIndex sorts a set of transactions by date once and keeps, for every transaction
+group, the cumulative count and cumulative amount of the group's transactions. The count,
+total and average of a group over any trailing window are then two binary searches and
+a subtraction, so every extra window costs O(log n) instead of another full scan.
+
+A window of N days as of a date covers the transactions dated in the N days up to and
+including that date.
+
+Params
+* amounts: the amount of every transaction
+* days: the date of every transaction, as a proleptic Gregorian ordinal (date.toordinal)
+* groups: a map of group to a boolean mask of the transactions in the group
+"""
+
+
+class WindowIndex:
+    def __init__(
+        self, amounts: np.ndarray, days: np.ndarray, groups: Dict[str, np.ndarray]
+    ):
+        order = np.argsort(days, kind="stable")
+        self.days = days[order]
+        sorted_amounts = amounts[order]
+        self.counts = {}
+        self.totals = {}
+        for group, mask in groups.items():
+            sorted_mask = mask[order]
+            self.counts[group] = np.concatenate(([0], np.cumsum(sorted_mask)))
+            self.totals[group] = np.concatenate(
+                ([0.0], np.cumsum(np.where(sorted_mask, sorted_amounts, 0.0)))
+            )
+
+    def bounds(self, window_days: int, as_of: date = None) -> Tuple[int, int]:
+        end = (as_of or date.today()).toordinal()
+        start = int(np.searchsorted(self.days, end - window_days, side="right"))
+        stop = int(np.searchsorted(self.days, end, side="right"))
+        return start, stop
+
+    def count(self, group: str, window_days: int, as_of: date = None) -> int:
+        start, stop = self.bounds(window_days, as_of)
+        return int(self.counts[group][stop] - self.counts[group][start])
+
+    def total(self, group: str, window_days: int, as_of: date = None) -> float:
+        start, stop = self.bounds(window_days, as_of)
+        return float(self.totals[group][stop] - self.totals[group][start])
+
+    def average(self, group: str, window_days: int, as_of: date = None) -> float:
+        count = self.count(group, window_days, as_of)
+        if count == 0:
+            return 0.0
+        return self.total(group, window_days, as_of) / count
+
+    def value(
+        self, group: str, statistic: str, window_days: int, as_of: date = None
+    ) -> float:
+        if statistic == "count":
+            return self.count(group, window_days, as_of)
+        if statistic == "total":
+            return self.total(group, window_days, as_of)
+        if statistic == "average":
+            return self.average(group, window_days, as_of)
+        raise ValueError(f"unknown statistic {statistic}")
+
+
+def _window_index(
+    transactions_by_account: List[Tuple[list, bool]], depository_only_groups: List[str]
+) -> WindowIndex:
+    amounts = []
+    days = []
+    primaries = []
+    depository = []
+    for transactions, is_depository in transactions_by_account:
+        for transaction in transactions:
+            amounts.append(transaction.amount)
+            days.append(transaction.date.toordinal())
+            credit_category = getattr(transaction, "credit_category", None)
+            primaries.append(
+                credit_category.primary if credit_category is not None else None
+            )
+            depository.append(is_depository)
+    amounts = np.array(amounts, dtype=np.float64)
+    days = np.array(days, dtype=np.int64)
+    primaries = np.array(primaries, dtype=object)
+    depository = np.array(depository, dtype=bool)
+
+    groups = {
+        "transactions": np.ones(len(amounts), dtype=bool),
+        "inflows": amounts < 0,
+        "outflows": amounts > 0,
+    }
+    for group in WINDOW_GROUPS[3:]:
+        groups[group] = primaries == group
+        if group in depository_only_groups:
+            groups[group] &= depository
+    return WindowIndex(amounts, days, groups)
+
+
+# Window indexes keyed by account_id and asset_report_id. The least recently used index
+# is evicted once a table holds WINDOW_INDEX_CACHE_SIZE entries.
+WINDOW_INDEX_CACHE_SIZE = 64
+_account_window_indexes = OrderedDict()
+_report_window_indexes = OrderedDict()
+
+
+def _cached(cache: OrderedDict, key: str, source: object, build) -> WindowIndex:
+    # An entry is only reused for the same source object, so an account or report
+    # with the same id from another refresh gets its own index. The source is held
+    # through a weak reference, so the cache never keeps a report alive
+    entry = cache.get(key)
+    if entry is None or entry[0]() is not source:
+        entry = (weakref.ref(source), build())
+        cache[key] = entry
+        if len(cache) > WINDOW_INDEX_CACHE_SIZE:
+            cache.popitem(last=False)
+    cache.move_to_end(key)
+    return entry[1]
+
+
+"""
+get_account_window_index returns the WindowIndex over the transactions of an account,
+building it on the first call and reusing it for later calls on the same account
+"""
+
+
+def get_account_window_index(account: AccountAssets) -> WindowIndex:
+    return _cached(
+        _account_window_indexes,
+        account.account_id,
+        account,
+        lambda: _window_index([(account.transactions, True)], []),
+    )
+
+
+"""
+get_report_window_index returns the WindowIndex over the transactions of every account
+in a report, where the loan disbursement and OD/NSF groups only include depository
+accounts. It is built on the first call and reused for later calls on the same report
+"""
+
+
+def get_report_window_index(asset_report: AssetReport) -> WindowIndex:
+    return _cached(
+        _report_window_indexes,
+        asset_report.asset_report_id,
+        asset_report,
+        lambda: _window_index(
+            [
+                (account.transactions, str(account.type) == "depository")
+                for item in asset_report.items
+                for account in item.accounts
+            ],
+            DEPOSITORY_ONLY_GROUPS,
+        ),
+    )
+
+
+"""
+clear_window_indexes drops every cached account and report window index
+"""
+
+
+def clear_window_indexes() -> None:
+    _account_window_indexes.clear()
+    _report_window_indexes.clear()
+
+
+"""
+windowed_attribute_function returns the function of a windowed attribute, which reads
+the attribute over a window from the WindowIndex of the account or report it is given.
+account/windows.py and report/windows.py define one for every name in
+WINDOWED_ATTRIBUTES
+
+Params
+* name: the name of the attribute, from WINDOWED_ATTRIBUTES
+* get_window_index: get_account_window_index or get_report_window_index
+* module: the name of the module the function is defined in
+"""
+
+
+def windowed_attribute_function(
+    name: str, get_window_index: Callable[[Any], WindowIndex], module: str
+) -> Callable[..., float]:
+    group, statistic = WINDOWED_ATTRIBUTES[name]
+
+    def windowed_attribute(source: Any, window_days: int, as_of: date = None) -> float:
+        return get_window_index(source).value(group, statistic, window_days, as_of)
+
+    windowed_attribute.__name__ = name
+    windowed_attribute.__qualname__ = name
+    windowed_attribute.__module__ = module
+    windowed_attribute.__doc__ = (
+        f"{name} over the transactions dated in the window_days days up to and "
+        "including as_of (today by default)"
+    )
+    return windowed_attribute
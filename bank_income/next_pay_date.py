@@ -1,5 +1,6 @@
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 from datetime import date, timedelta
+import numpy as np
 from plaid.model.credit_bank_income_source import CreditBankIncomeSource
 
 
@@ -14,6 +15,7 @@ next_expected_pay_date takes in a Bank Income Source and predicts the next pay d
 for that source
 Params
 * source: The Bank Income source to predict the next pay date for.
+* as_of: The date to predict from. Defaults to today
 
 Returns
 * The next expected pay date for the source. If we are unable to predict the next pay date,
@@ -21,14 +23,18 @@ Returns
 """
 
 
-def next_expected_pay_date(source: CreditBankIncomeSource) -> Optional[date]:
+def next_expected_pay_date(
+    source: CreditBankIncomeSource, as_of: Optional[date] = None
+) -> Optional[date]:
     # If the source doesn't have a known frequency, then we are unable to predict
     # the next pay date
     if str(source.pay_frequency) == "UNKNOWN":
         return None
 
+    if as_of is None:
+        as_of = date.today()
     frequency = str(source.pay_frequency)
-    days_since_pay = date.today() - source.end_date
+    days_since_pay = as_of - source.end_date
 
     if days_since_pay.days < EXPECTED_CADENCE[frequency]:
         # If it hasn't been the expected amount of days since the last
@@ -37,10 +43,123 @@ def next_expected_pay_date(source: CreditBankIncomeSource) -> Optional[date]:
     elif days_since_pay.days <= EXPECTED_CADENCE[frequency] + BUFFER[frequency]:
         # If the expected number of days has already passed, but within the buffer/error
         # window for the frequency, return tommorrow's date
-        return date.today() + 1
+        return as_of + timedelta(1)
     elif days_since_pay.days < EXPECTED_CADENCE[frequency] * 2:
         # Otherwise assume that the subsequent pay date has been missed and return
         # the one after that
         return source.end_date + timedelta(EXPECTED_CADENCE[frequency] * 2)
     # If none of the above conditions apply then assume the income source has ended
     return None
+
+
+# The pay frequency codes used by the batch functions below. Sources with an UNKNOWN
+# pay frequency have the code UNKNOWN_PAY_FREQUENCY
+PAY_FREQUENCY_CODES = {"WEEKLY": 0, "BIWEEKLY": 1, "MONTHLY": 2, "SEMI_MONTHLY": 3}
+UNKNOWN_PAY_FREQUENCY = -1
+
+# EXPECTED_CADENCE and BUFFER indexed by pay frequency code
+_CADENCE_BY_CODE = np.zeros(len(PAY_FREQUENCY_CODES), dtype=np.int64)
+_BUFFER_BY_CODE = np.zeros(len(PAY_FREQUENCY_CODES), dtype=np.int64)
+for _frequency, _code in PAY_FREQUENCY_CODES.items():
+    _CADENCE_BY_CODE[_code] = EXPECTED_CADENCE[_frequency]
+    _BUFFER_BY_CODE[_code] = BUFFER[_frequency]
+
+
+"""
+encode_sources turns Bank Income sources into the arrays read by the batch functions
+below
+
+Params
+* sources: The Bank Income sources to encode.
+
+Returns
+* The end date of every source as a datetime64[D] array, NaT where the source has no
+    end date
+* The pay frequency code of every source as an int8 array
+"""
+
+
+def encode_sources(
+    sources: Iterable[CreditBankIncomeSource],
+) -> Tuple[np.ndarray, np.ndarray]:
+    end_dates = []
+    frequency_codes = []
+    for source in sources:
+        end_dates.append(source.end_date)
+        frequency_codes.append(
+            PAY_FREQUENCY_CODES.get(str(source.pay_frequency), UNKNOWN_PAY_FREQUENCY)
+        )
+    return (
+        np.array(end_dates, dtype="datetime64[D]"),
+        np.array(frequency_codes, dtype=np.int8),
+    )
+
+
+"""
+projected_pay_dates is the batch form of next_expected_pay_date. It predicts the next
+pay date of every source from arrays of end dates and pay frequency codes, and projects
+the pay dates after it by adding the expected cadence of each source
+
+Params
+* end_dates: The end date of every source, as datetime64[D] values. NaT for no end date
+* frequency_codes: The pay frequency code of every source (see PAY_FREQUENCY_CODES)
+* as_of: The date to predict from, shared by every source. Defaults to today
+* periods: The number of pay dates to project for every source
+
+Returns
+* A datetime64[D] array of shape (len(end_dates), periods). Column 0 is the same as
+    next_expected_pay_date for every source, and column k is k expected cadences later.
+    Rows are NaT where next_expected_pay_date would return None
+"""
+
+
+def projected_pay_dates(
+    end_dates: np.ndarray,
+    frequency_codes: np.ndarray,
+    as_of: Optional[date] = None,
+    periods: int = 1,
+) -> np.ndarray:
+    if as_of is None:
+        as_of = date.today()
+    end_dates = np.asarray(end_dates, dtype="datetime64[D]")
+    frequency_codes = np.asarray(frequency_codes)
+    as_of = np.datetime64(as_of, "D")
+
+    known = (frequency_codes >= 0) & ~np.isnat(end_dates)
+    codes = np.where(known, frequency_codes, 0)
+    cadence = _CADENCE_BY_CODE[codes]
+    buffer = _BUFFER_BY_CODE[codes]
+    days_since_pay = (as_of - end_dates).astype(np.int64)
+
+    # The same conditions as next_expected_pay_date, in the same order
+    before_cadence = known & (days_since_pay < cadence)
+    within_buffer = known & ~before_cadence & (days_since_pay <= cadence + buffer)
+    missed_one = (
+        known & ~before_cadence & ~within_buffer & (days_since_pay < cadence * 2)
+    )
+
+    next_dates = np.full(len(end_dates), np.datetime64("NaT"), dtype="datetime64[D]")
+    cadence_days = cadence.astype("timedelta64[D]")
+    next_dates[before_cadence] = (
+        end_dates[before_cadence] + cadence_days[before_cadence]
+    )
+    next_dates[within_buffer] = as_of + np.timedelta64(1, "D")
+    next_dates[missed_one] = end_dates[missed_one] + cadence_days[missed_one] * 2
+
+    steps = np.arange(periods, dtype=np.int64)
+    return next_dates[:, None] + cadence_days[:, None] * steps
+
+
+"""
+next_expected_pay_dates is projected_pay_dates with a single period
+
+Returns
+* A datetime64[D] array with the next expected pay date of every source, NaT where
+    next_expected_pay_date would return None
+"""
+
+
+def next_expected_pay_dates(
+    end_dates: np.ndarray, frequency_codes: np.ndarray, as_of: Optional[date] = None
+) -> np.ndarray:
+    return projected_pay_dates(end_dates, frequency_codes, as_of, periods=1)[:, 0]
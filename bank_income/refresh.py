@@ -1,5 +1,6 @@
-from typing import List
+from typing import Dict, List, Set, Tuple
 import datetime
+from plaid.model.credit_bank_income import CreditBankIncome
 from plaid.model.credit_bank_income_get_response import CreditBankIncomeGetResponse
 from plaid.model.credit_bank_income_source import CreditBankIncomeSource
 
@@ -19,23 +20,10 @@ Returns
 def get_new_streams(
     bank_income_get_response: CreditBankIncomeGetResponse,
 ) -> List[CreditBankIncomeSource]:
-    original_report = bank_income_get_response.bank_income[1]
-    refreshed_report = bank_income_get_response.bank_income[0]
-
-    # Get IDs of income sources in original report
-    original_income_source_ids = set()
-    for item in original_report.items:
-        for source in item.bank_income_sources:
-            original_income_source_ids.add(source.income_source_id)
-
-    # Find income sources in refreshed report that are not present in the original report
-    new_income_sources = []
-    for item in refreshed_report.items:
-        for source in item.bank_income_sources:
-            if source.income_source_id not in original_income_source_ids:
-                new_income_sources.append(source)
-
-    return new_income_sources
+    new_sources, _ = _new_and_updated_sources(
+        *_latest_versions(bank_income_get_response)
+    )
+    return new_sources
 
 
 """
@@ -53,24 +41,10 @@ Returns
 def get_streams_with_new_transactions(
     bank_income_get_response: CreditBankIncomeGetResponse,
 ) -> List[CreditBankIncomeSource]:
-    original_report = bank_income_get_response.bank_income[1]
-    refreshed_report = bank_income_get_response.bank_income[0]
-
-    # Generate a map of income source to income source end date in the original report
-    original_income_source_end_dates = {}
-    for item in original_report.items:
-        for source in item.bank_income_sources:
-            original_income_source_end_dates[source.income_source_id] = source.end_date
-
-    # Find income sources in refreshed report that have been updated with new transactions
-    updated_income_sources = []
-    for item in refreshed_report.items:
-        for source in item.bank_income_sources:
-            if source.income_source_id in original_income_source_end_dates:
-                if  source.end_date > original_income_source_end_dates[source.income_source_id]:
-                    updated_income_sources.append(source)
-
-    return updated_income_sources
+    _, updated_sources = _new_and_updated_sources(
+        *_latest_versions(bank_income_get_response)
+    )
+    return updated_sources
 
 
 def is_source_inactive(
@@ -105,22 +79,225 @@ Returns
 def get_inactive_sources(
     bank_income_get_response: CreditBankIncomeGetResponse,
 ) -> List[CreditBankIncomeSource]:
-    refreshed_report = bank_income_get_response.bank_income[0]
-    original_report = bank_income_get_response.bank_income[1]
-
-    # Get IDs of inactive sources in original report
-    original_inactive_sources_ids = set()
-    for item in original_report.items:
-        for source in item.bank_income_sources:
-            if is_source_inactive(source, original_report.generated_time):
-                original_inactive_sources_ids.add(source.income_source_id)
-
-    # Find newly inactive sources in refreshed report
-    newly_inactive_sources = []
-    for item in refreshed_report.items:
-        for source in item.bank_income_sources:
-            if is_source_inactive(source, refreshed_report.generated_time):
-                if source.income_source_id not in original_inactive_sources_ids:
-                    newly_inactive_sources.append(source)
-
-    return newly_inactive_sources
+    return _newly_inactive_sources(*_latest_versions(bank_income_get_response))
+
+
+"""
+_VersionIndex indexes one version of a Bank Income report by income_source_id in a
+single pass: the sources in report order and the latest source with each ID. The IDs of
+the sources that were inactive when the version was generated are only computed on the
+first call to inactive_source_ids, since they read the generated_time and pay_frequency
+that the new and updated sources do not need
+"""
+
+
+class _VersionIndex:
+    def __init__(self, report: CreditBankIncome):
+        self.report = report
+        self.sources = []
+        self.sources_by_id = {}
+        self._inactive_source_ids = None
+        for item in report.items:
+            for source in item.bank_income_sources:
+                self.sources.append(source)
+                self.sources_by_id[source.income_source_id] = source
+
+    def inactive_source_ids(self) -> Set[str]:
+        if self._inactive_source_ids is None:
+            generated_time = self.report.generated_time
+            self._inactive_source_ids = {
+                source.income_source_id
+                for source in self.sources
+                if is_source_inactive(source, generated_time)
+            }
+        return self._inactive_source_ids
+
+
+"""
+RefreshChanges holds the changes between two consecutive versions of a Bank Income
+report
+
+Params
+* previous_report: the older of the two versions
+* refreshed_report: the newer of the two versions
+* new_sources: income sources of the refreshed report that are not in the previous one
+* updated_sources: income sources whose end date moved forward in the refreshed report
+* newly_inactive_sources: income sources that are inactive in the refreshed report and
+    were not inactive in the previous one
+"""
+
+
+class RefreshChanges:
+    def __init__(
+        self,
+        previous_report: CreditBankIncome,
+        refreshed_report: CreditBankIncome,
+        new_sources: List[CreditBankIncomeSource],
+        updated_sources: List[CreditBankIncomeSource],
+        newly_inactive_sources: List[CreditBankIncomeSource],
+    ):
+        self.previous_report = previous_report
+        self.refreshed_report = refreshed_report
+        self.new_sources = new_sources
+        self.updated_sources = updated_sources
+        self.newly_inactive_sources = newly_inactive_sources
+
+
+def _new_and_updated_sources(
+    previous: _VersionIndex, refreshed: _VersionIndex
+) -> Tuple[List[CreditBankIncomeSource], List[CreditBankIncomeSource]]:
+    new_sources = []
+    updated_sources = []
+    for source in refreshed.sources:
+        previous_source = previous.sources_by_id.get(source.income_source_id)
+        if previous_source is None:
+            new_sources.append(source)
+        elif source.end_date > previous_source.end_date:
+            updated_sources.append(source)
+    return new_sources, updated_sources
+
+
+def _newly_inactive_sources(
+    previous: _VersionIndex, refreshed: _VersionIndex
+) -> List[CreditBankIncomeSource]:
+    previous_inactive_source_ids = previous.inactive_source_ids()
+    refreshed_inactive_source_ids = refreshed.inactive_source_ids()
+    return [
+        source
+        for source in refreshed.sources
+        if source.income_source_id in refreshed_inactive_source_ids
+        and source.income_source_id not in previous_inactive_source_ids
+    ]
+
+
+def _compare_versions(
+    previous: _VersionIndex, refreshed: _VersionIndex
+) -> RefreshChanges:
+    new_sources, updated_sources = _new_and_updated_sources(previous, refreshed)
+    return RefreshChanges(
+        previous.report,
+        refreshed.report,
+        new_sources,
+        updated_sources,
+        _newly_inactive_sources(previous, refreshed),
+    )
+
+
+def _latest_versions(
+    bank_income_get_response: CreditBankIncomeGetResponse,
+) -> Tuple[_VersionIndex, _VersionIndex]:
+    # bank_income lists the newest version first
+    return (
+        _VersionIndex(bank_income_get_response.bank_income[1]),
+        _VersionIndex(bank_income_get_response.bank_income[0]),
+    )
+
+
+"""
+RefreshTimeline holds every version of a Bank Income report from oldest to newest, the
+changes between each consecutive pair of versions and the lifecycle of every income
+source across the versions
+
+The lifecycle of a source is a list of (generated_time, event, source) entries, oldest
+first, where event is one of
+* "new": the source first appears in this version
+* "updated": the source's end date moved forward in this version
+* "inactive": the source became inactive in this version
+* "reactivated": the source was inactive in the previous version and is active again
+* "removed": the source was in the previous version and is missing from this one.
+    The source of a "removed" entry is the source from the previous version
+
+Params
+* reports: the versions of the report, oldest first
+* changes: the RefreshChanges of every consecutive pair of versions, oldest first
+* lifecycles: a map of income_source_id to the lifecycle of the source
+"""
+
+
+class RefreshTimeline:
+    def __init__(
+        self,
+        reports: List[CreditBankIncome],
+        changes: List[RefreshChanges],
+        lifecycles: Dict[
+            str, List[Tuple[datetime.datetime, str, CreditBankIncomeSource]]
+        ],
+    ):
+        self.reports = reports
+        self.changes = changes
+        self.lifecycles = lifecycles
+
+    def latest_changes(self) -> RefreshChanges:
+        if not self.changes:
+            return None
+        return self.changes[-1]
+
+
+"""
+build_refresh_timeline takes in a response from /credit/bank_income/get with any number
+of report versions and returns the RefreshTimeline of the report. Every version is
+indexed once, so a history of n versions takes n passes over the sources rather than
+one pass per pair and per kind of change
+
+Params
+* bank_income_get_response: The response from /credit/bank_income/get
+
+Returns
+* The RefreshTimeline of the report. changes[-1] is the same as calling
+    get_new_streams, get_streams_with_new_transactions and get_inactive_sources on the
+    response
+"""
+
+
+def build_refresh_timeline(
+    bank_income_get_response: CreditBankIncomeGetResponse,
+) -> RefreshTimeline:
+    # bank_income lists the newest version first
+    reports = list(reversed(bank_income_get_response.bank_income))
+    changes = []
+    lifecycles = {}
+    previous = None
+    for report in reports:
+        version = _VersionIndex(report)
+        generated_time = report.generated_time
+        inactive_source_ids = version.inactive_source_ids()
+        if previous is None:
+            for income_source_id, source in version.sources_by_id.items():
+                lifecycle = lifecycles.setdefault(income_source_id, [])
+                lifecycle.append((generated_time, "new", source))
+                if income_source_id in inactive_source_ids:
+                    lifecycle.append((generated_time, "inactive", source))
+            previous = version
+            continue
+
+        refresh_changes = _compare_versions(previous, version)
+        changes.append(refresh_changes)
+        new_source_ids = {
+            source.income_source_id for source in refresh_changes.new_sources
+        }
+        updated_source_ids = {
+            source.income_source_id for source in refresh_changes.updated_sources
+        }
+        newly_inactive_source_ids = {
+            source.income_source_id
+            for source in refresh_changes.newly_inactive_sources
+        }
+        for income_source_id, source in version.sources_by_id.items():
+            lifecycle = lifecycles.setdefault(income_source_id, [])
+            if income_source_id in new_source_ids:
+                lifecycle.append((generated_time, "new", source))
+            elif income_source_id in updated_source_ids:
+                lifecycle.append((generated_time, "updated", source))
+            if income_source_id in newly_inactive_source_ids:
+                lifecycle.append((generated_time, "inactive", source))
+            elif (
+                income_source_id in previous.inactive_source_ids()
+                and income_source_id not in inactive_source_ids
+            ):
+                lifecycle.append((generated_time, "reactivated", source))
+        for income_source_id, source in previous.sources_by_id.items():
+            if income_source_id not in version.sources_by_id:
+                lifecycles[income_source_id].append((generated_time, "removed", source))
+        previous = version
+
+    return RefreshTimeline(reports, changes, lifecycles)
@@ -0,0 +1,153 @@
+from typing import Any, Dict, List
+from datetime import date
+import importlib.util
+import os
+import sys
+from plaid.model.credit_bank_income import CreditBankIncome
+from plaid.model.credit_bank_income_source import CreditBankIncomeSource
+from monthly_average import CATEGORIES_TO_INCLUDE
+from next_pay_date import next_expected_pay_date
+from util import (
+    get_active_sources,
+    source_monthly_avg_net_income,
+    get_gross_income_from_net_income,
+)
+
+# The directory of the asset attribute files, which holds the registry class shared
+# with the Bank Income attributes
+ASSETS_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets"
+)
+
+
+def _load_attribute_graph():
+    # Loaded from its path rather than by putting assets/ on sys.path, so that the
+    # other asset files don't shadow the Bank Income ones. It keeps the name the asset
+    # files import it by, so both trees share one module
+    module = sys.modules.get("attribute_graph")
+    if module is None:
+        spec = importlib.util.spec_from_file_location(
+            "attribute_graph", os.path.join(ASSETS_DIRECTORY, "attribute_graph.py")
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules["attribute_graph"] = module
+    return module
+
+
+AttributeRegistry = _load_attribute_graph().AttributeRegistry
+
+
+"""
+BANK_INCOME_REGISTRY declares every Bank Income attribute as a reduction of shared
+intermediates, such as the active income sources of a report and their monthly average
+net incomes (see assets/attribute_graph.py). The value named "source" is the Bank Income
+report being scored, and the windows and categories are parameters that can be
+overridden per call
+"""
+
+BANK_INCOME_REGISTRY = AttributeRegistry(
+    parameters={
+        "active_source_window": 30,
+        "avg_calculation_window": 90,
+        "categories_to_include": CATEGORIES_TO_INCLUDE,
+    }
+)
+
+
+@BANK_INCOME_REGISTRY.intermediate("income_sources", "source")
+def _income_sources(report: CreditBankIncome) -> List[CreditBankIncomeSource]:
+    income_sources = []
+    for bank_income_item in report.items:
+        income_sources.extend(bank_income_item.bank_income_sources)
+    return income_sources
+
+
+@BANK_INCOME_REGISTRY.intermediate(
+    "active_sources", "source", "active_source_window", "categories_to_include"
+)
+def _active_sources(
+    report: CreditBankIncome,
+    active_source_window: int,
+    categories_to_include: List[str],
+) -> List[CreditBankIncomeSource]:
+    return get_active_sources(report, active_source_window, categories_to_include)
+
+
+@BANK_INCOME_REGISTRY.intermediate(
+    "source_net_incomes",
+    "active_sources",
+    "active_source_window",
+    "avg_calculation_window",
+)
+def _source_net_incomes(
+    active_sources: List[CreditBankIncomeSource],
+    active_source_window: int,
+    avg_calculation_window: int,
+) -> List[float]:
+    return [
+        source_monthly_avg_net_income(
+            source, active_source_window, avg_calculation_window
+        )
+        for source in active_sources
+    ]
+
+
+@BANK_INCOME_REGISTRY.attribute("monthly_average_net_income", "source_net_incomes")
+def _monthly_average_net_income(source_net_incomes: List[float]) -> float:
+    net_monthly_average = 0.0
+    for net_income in source_net_incomes:
+        net_monthly_average += net_income
+    return net_monthly_average
+
+
+@BANK_INCOME_REGISTRY.attribute(
+    "monthly_average_gross_income", "active_sources", "source_net_incomes"
+)
+def _monthly_average_gross_income(
+    active_sources: List[CreditBankIncomeSource], source_net_incomes: List[float]
+) -> float:
+    gross_monthly_average = 0.0
+    for source, net_income in zip(active_sources, source_net_incomes):
+        gross_monthly_average += get_gross_income_from_net_income(
+            net_income, str(source.income_category)
+        )
+    return gross_monthly_average
+
+
+@BANK_INCOME_REGISTRY.attribute("num_active_sources", "active_sources")
+def _num_active_sources(active_sources: List[CreditBankIncomeSource]) -> int:
+    return len(active_sources)
+
+
+@BANK_INCOME_REGISTRY.attribute("next_expected_pay_dates", "income_sources")
+def _next_expected_pay_dates(
+    income_sources: List[CreditBankIncomeSource],
+) -> Dict[str, date]:
+    return {
+        source.income_source_id: next_expected_pay_date(source)
+        for source in income_sources
+    }
+
+
+"""
+evaluate_bank_income_attributes computes the requested Bank Income attributes through
+BANK_INCOME_REGISTRY, so that e.g. the net and gross monthly averages share the same
+active sources and per-source averages
+
+Params
+* report: The Bank Income report to calculate the attributes for.
+* attributes: the names of the attributes to compute. Defaults to every registered
+    attribute
+* parameters: overrides of active_source_window, avg_calculation_window and
+    categories_to_include, as in monthly_average.py
+
+Returns
+* A map of attribute name to its value
+"""
+
+
+def evaluate_bank_income_attributes(
+    report: CreditBankIncome, attributes: List[str] = None, **parameters: Any
+) -> Dict[str, Any]:
+    return BANK_INCOME_REGISTRY.evaluate(report, attributes, **parameters)
@@ -0,0 +1,111 @@
+from typing import Any, Dict, Iterable, Iterator, List
+from datetime import date, timedelta
+from plaid.model.credit_bank_income import CreditBankIncome
+from monthly_average import CATEGORIES_TO_INCLUDE
+from util import (
+    get_source_index,
+    is_source_active,
+    source_monthly_avg_net_income,
+    get_gross_income_from_net_income,
+)
+
+
+"""
+sweep_monthly_average_income computes monthly_average_net_income and
+monthly_average_gross_income for every combination of the given windows and category
+subsets, for one Bank Income report.
+
+Each source's transactions are indexed once (see get_source_index in util.py), and the
+monthly average of every source is computed once per pair of windows. Category subsets
+only choose which of those averages are added up, so extra subsets cost one pass over
+the sources each and extra windows one binary search per source.
+
+Params
+* report: The Bank Income report to calculate monthly income for.
+* active_source_windows: The active source windows, in days, to try.
+* avg_calculation_windows: The averaging windows, in days, to try.
+* category_subsets: The lists of income categories to try as categories_to_include.
+
+Returns
+* One row for every combination, with the active_source_window, avg_calculation_window,
+    categories_to_include, monthly_average_net_income and monthly_average_gross_income.
+    Each value is the same as calling the function in monthly_average.py with those
+    arguments
+"""
+
+
+def sweep_monthly_average_income(
+    report: CreditBankIncome,
+    active_source_windows: List[int] = (30,),
+    avg_calculation_windows: List[int] = (90,),
+    category_subsets: List[List[str]] = (CATEGORIES_TO_INCLUDE,),
+) -> List[Dict[str, Any]]:
+    sources = []
+    for bank_income_item in report.items:
+        for source in bank_income_item.bank_income_sources:
+            # Build every source index up front so the grid only reads them
+            get_source_index(source)
+            sources.append((source, str(source.income_category)))
+    category_subsets = [set(categories) for categories in category_subsets]
+    # Sources outside every subset are never averaged
+    included_categories = set().union(*category_subsets)
+
+    rows = []
+    for active_source_window in active_source_windows:
+        active_window_start_date = date.today() - timedelta(active_source_window)
+        active = [
+            category in included_categories
+            and is_source_active(source, active_window_start_date)
+            for source, category in sources
+        ]
+        for avg_calculation_window in avg_calculation_windows:
+            net_incomes = [
+                source_monthly_avg_net_income(
+                    source, active_source_window, avg_calculation_window
+                )
+                if is_active
+                else 0.0
+                for (source, _), is_active in zip(sources, active)
+            ]
+            gross_incomes = [
+                get_gross_income_from_net_income(net_income, category)
+                for (_, category), net_income in zip(sources, net_incomes)
+            ]
+            for categories in category_subsets:
+                net_monthly_average = 0.0
+                gross_monthly_average = 0.0
+                for index, (_, category) in enumerate(sources):
+                    if active[index] and category in categories:
+                        net_monthly_average += net_incomes[index]
+                        gross_monthly_average += gross_incomes[index]
+                rows.append(
+                    {
+                        "active_source_window": active_source_window,
+                        "avg_calculation_window": avg_calculation_window,
+                        "categories_to_include": sorted(categories),
+                        "monthly_average_net_income": net_monthly_average,
+                        "monthly_average_gross_income": gross_monthly_average,
+                    }
+                )
+    return rows
+
+
+"""
+sweep_monthly_average_income_batch runs sweep_monthly_average_income over a batch of
+Bank Income reports and yields the rows of each report in turn, with the report's
+bank_income_id added to every row
+"""
+
+
+def sweep_monthly_average_income_batch(
+    reports: Iterable[CreditBankIncome],
+    active_source_windows: List[int] = (30,),
+    avg_calculation_windows: List[int] = (90,),
+    category_subsets: List[List[str]] = (CATEGORIES_TO_INCLUDE,),
+) -> Iterator[Dict[str, Any]]:
+    for report in reports:
+        bank_income_id = getattr(report, "bank_income_id", None)
+        for row in sweep_monthly_average_income(
+            report, active_source_windows, avg_calculation_windows, category_subsets
+        ):
+            yield {"bank_income_id": bank_income_id, **row}
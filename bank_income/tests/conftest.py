@@ -0,0 +1,72 @@
+import os
+import sys
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from plaid.configuration import Configuration
+from plaid.model.credit_bank_income_get_response import CreditBankIncomeGetResponse
+from plaid.model_utils import validate_and_convert_types
+
+BANK_INCOME_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The Bank Income files import each other by their flat names
+if BANK_INCOME_DIRECTORY not in sys.path:
+    sys.path.insert(0, BANK_INCOME_DIRECTORY)
+
+# Sources and reports are built around a fixed date so that they are the same from one
+# day to the next
+END_DATE = date(2024, 1, 1)
+
+
+def bank_income_source(
+    income_source_id: str,
+    payment_days: List[int],
+    amount: float = 1500.0,
+    end_date: date = END_DATE,
+    **fields: Any,
+) -> Dict[str, Any]:
+    # The raw JSON of a source with one transaction per entry of payment_days, given as
+    # days before end_date
+    transactions = [
+        {
+            "amount": amount,
+            "date": str(end_date - timedelta(days=days)),
+            "name": "PAYROLL",
+            "original_description": "PAYROLL",
+            "pending": False,
+            "transaction_id": f"{income_source_id}-{index}",
+            "check_number": None,
+            "iso_currency_code": "USD",
+            "unofficial_currency_code": None,
+        }
+        for index, days in enumerate(payment_days)
+    ]
+    source = {
+        "income_source_id": income_source_id,
+        "income_description": "PAYROLL",
+        "income_category": "SALARY",
+        "account_id": "account",
+        "total_amount": amount * len(transactions),
+        "transaction_count": len(transactions),
+        "historical_summary": [{"transactions": transactions}],
+    }
+    if transactions:
+        source["start_date"] = str(end_date - timedelta(days=max(payment_days)))
+        source["end_date"] = str(end_date - timedelta(days=min(payment_days)))
+    source.update(fields)
+    return source
+
+
+def bank_income_response(
+    versions: List[Dict[str, Any]]
+) -> CreditBankIncomeGetResponse:
+    # The /credit/bank_income/get response of the given raw report versions, newest
+    # first
+    return validate_and_convert_types(
+        {"request_id": "request", "bank_income": versions},
+        (CreditBankIncomeGetResponse,),
+        ["response"],
+        True,
+        True,
+        Configuration(),
+    )
@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from conftest import END_DATE, bank_income_response, bank_income_source
+from next_pay_date import (
+    EXPECTED_CADENCE,
+    encode_sources,
+    next_expected_pay_date,
+    next_expected_pay_dates,
+    projected_pay_dates,
+)
+
+PAY_FREQUENCIES = ["WEEKLY", "BIWEEKLY", "SEMI_MONTHLY", "MONTHLY", "UNKNOWN"]
+
+
+def _sources(raw_sources):
+    return bank_income_response(
+        [
+            {
+                "bank_income_id": "report",
+                "generated_time": f"{END_DATE}T00:00:00Z",
+                "days_requested": 90,
+                "items": [{"item_id": "item", "bank_income_sources": raw_sources}],
+            }
+        ]
+    ).bank_income[0].items[0].bank_income_sources
+
+
+def _dates(values):
+    return [None if np.isnat(value) else value.astype(date) for value in values]
+
+
+def test_batch_matches_next_expected_pay_date():
+    # Every pay frequency paid 0 to 69 days before as_of, which covers each branch
+    sources = _sources(
+        [
+            bank_income_source(
+                f"{pay_frequency}-{days}", [days], pay_frequency=pay_frequency
+            )
+            for pay_frequency in PAY_FREQUENCIES
+            for days in range(70)
+        ]
+    )
+    expected = [next_expected_pay_date(source, END_DATE) for source in sources]
+    assert any(pay_date == END_DATE + timedelta(1) for pay_date in expected)
+    assert any(pay_date is None for pay_date in expected)
+    end_dates, frequency_codes = encode_sources(sources)
+    assert _dates(next_expected_pay_dates(end_dates, frequency_codes, END_DATE)) == (
+        expected
+    )
+
+
+def test_pay_date_within_buffer_is_the_day_after_as_of():
+    # Paid 8 days ago weekly is past the cadence but within the buffer
+    source = _sources([bank_income_source("weekly", [8], pay_frequency="WEEKLY")])[0]
+    assert next_expected_pay_date(source, END_DATE) == END_DATE + timedelta(1)
+    end_dates, frequency_codes = encode_sources([source])
+    assert _dates(next_expected_pay_dates(end_dates, frequency_codes, END_DATE)) == [
+        END_DATE + timedelta(1)
+    ]
+
+    # Without an as_of, the prediction is made from today
+    today = date.today()
+    source = _sources(
+        [bank_income_source("weekly", [8], end_date=today, pay_frequency="WEEKLY")]
+    )[0]
+    assert next_expected_pay_date(source) == today + timedelta(1)
+    end_dates, frequency_codes = encode_sources([source])
+    assert _dates(next_expected_pay_dates(end_dates, frequency_codes)) == [
+        today + timedelta(1)
+    ]
+
+
+def test_projected_pay_dates():
+    sources = _sources(
+        [
+            bank_income_source("weekly", [3], pay_frequency="WEEKLY"),
+            bank_income_source("buffer", [15], pay_frequency="BIWEEKLY"),
+            bank_income_source("missed", [40], pay_frequency="MONTHLY"),
+            bank_income_source("ended", [60], pay_frequency="SEMI_MONTHLY"),
+            bank_income_source("unknown", [3], pay_frequency="UNKNOWN"),
+        ]
+    )
+    end_dates, frequency_codes = encode_sources(sources)
+    projected = projected_pay_dates(end_dates, frequency_codes, END_DATE, periods=3)
+    assert projected.shape == (5, 3)
+
+    def following(first, pay_frequency):
+        cadence = timedelta(EXPECTED_CADENCE[pay_frequency])
+        return [first, first + cadence, first + 2 * cadence]
+
+    assert [_dates(row) for row in projected] == [
+        following(END_DATE + timedelta(4), "WEEKLY"),
+        following(END_DATE + timedelta(1), "BIWEEKLY"),
+        following(END_DATE + timedelta(20), "MONTHLY"),
+        [None, None, None],
+        [None, None, None],
+    ]
+    # Column 0 is the next expected pay date
+    assert _dates(projected[:, 0]) == [
+        next_expected_pay_date(source, END_DATE) for source in sources
+    ]
@@ -0,0 +1,139 @@
+from datetime import timedelta
+
+from conftest import END_DATE, bank_income_response, bank_income_source
+from refresh import (
+    build_refresh_timeline,
+    get_inactive_sources,
+    get_new_streams,
+    get_streams_with_new_transactions,
+)
+
+
+def _version(bank_income_id, sources, days_after_end_date=None):
+    version = {
+        "bank_income_id": bank_income_id,
+        "days_requested": 90,
+        "items": [{"item_id": "item", "bank_income_sources": sources}],
+    }
+    if days_after_end_date is not None:
+        generated_date = END_DATE + timedelta(days=days_after_end_date)
+        version["generated_time"] = f"{generated_date}T00:00:00Z"
+    return version
+
+
+def _ids(sources):
+    return [source.income_source_id for source in sources]
+
+
+def _refresh_response(with_optional_fields=True):
+    # a gets a new transaction, b stops being paid weekly and c is added
+    def source(income_source_id, payment_days, pay_frequency):
+        fields = {"pay_frequency": pay_frequency} if with_optional_fields else {}
+        return bank_income_source(income_source_id, payment_days, **fields)
+
+    generated = (0, -30) if with_optional_fields else (None, None)
+    previous = _version(
+        "previous",
+        [source("a", [40, 54], "BIWEEKLY"), source("b", [35], "WEEKLY")],
+        generated[1],
+    )
+    refreshed = _version(
+        "refreshed",
+        [
+            source("a", [10, 40, 54], "BIWEEKLY"),
+            source("b", [35], "WEEKLY"),
+            source("c", [5], "MONTHLY"),
+        ],
+        generated[0],
+    )
+    return bank_income_response([refreshed, previous])
+
+
+def test_refresh_changes():
+    response = _refresh_response()
+    assert _ids(get_new_streams(response)) == ["c"]
+    assert _ids(get_streams_with_new_transactions(response)) == ["a"]
+    assert _ids(get_inactive_sources(response)) == ["b"]
+
+
+def test_new_and_updated_sources_without_optional_fields():
+    # Versions without a generated_time and sources without a pay_frequency, which
+    # only the inactive sources read
+    response = _refresh_response(with_optional_fields=False)
+    assert _ids(get_new_streams(response)) == ["c"]
+    assert _ids(get_streams_with_new_transactions(response)) == ["a"]
+
+
+def test_refresh_timeline():
+    first = _version(
+        "first",
+        [
+            bank_income_source("a", [40, 54], pay_frequency="BIWEEKLY"),
+            bank_income_source("b", [35], pay_frequency="WEEKLY"),
+        ],
+        -30,
+    )
+    second = _version(
+        "second",
+        [
+            bank_income_source("a", [10, 40, 54], pay_frequency="BIWEEKLY"),
+            bank_income_source("b", [35], pay_frequency="WEEKLY"),
+            bank_income_source("c", [5], pay_frequency="MONTHLY"),
+        ],
+        0,
+    )
+    # b is paid again and c is gone
+    third = _version(
+        "third",
+        [
+            bank_income_source("a", [10, 40, 54], pay_frequency="BIWEEKLY"),
+            bank_income_source("b", [-15, 35], pay_frequency="WEEKLY"),
+        ],
+        20,
+    )
+    timeline = build_refresh_timeline(bank_income_response([third, second, first]))
+
+    assert [report.bank_income_id for report in timeline.reports] == [
+        "first",
+        "second",
+        "third",
+    ]
+    times = [report.generated_time for report in timeline.reports]
+    lifecycles = {
+        income_source_id: [
+            (times.index(generated_time), event, source.income_source_id)
+            for generated_time, event, source in lifecycle
+        ]
+        for income_source_id, lifecycle in timeline.lifecycles.items()
+    }
+    assert lifecycles == {
+        "a": [(0, "new", "a"), (1, "updated", "a")],
+        "b": [
+            (0, "new", "b"),
+            (1, "inactive", "b"),
+            (2, "updated", "b"),
+            (2, "reactivated", "b"),
+        ],
+        "c": [(1, "new", "c"), (2, "removed", "c")],
+    }
+
+    changes = [
+        (
+            _ids(refresh_changes.new_sources),
+            _ids(refresh_changes.updated_sources),
+            _ids(refresh_changes.newly_inactive_sources),
+        )
+        for refresh_changes in timeline.changes
+    ]
+    assert changes == [(["c"], ["a"], ["b"]), ([], ["b"], [])]
+
+    # The latest changes are the ones of the refresh functions
+    response = bank_income_response([second, first])
+    latest_changes = build_refresh_timeline(response).latest_changes()
+    assert _ids(latest_changes.new_sources) == _ids(get_new_streams(response))
+    assert _ids(latest_changes.updated_sources) == _ids(
+        get_streams_with_new_transactions(response)
+    )
+    assert _ids(latest_changes.newly_inactive_sources) == _ids(
+        get_inactive_sources(response)
+    )
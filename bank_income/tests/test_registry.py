@@ -0,0 +1,61 @@
+import sys
+from datetime import date
+
+import pytest
+
+from conftest import bank_income_response, bank_income_source
+from monthly_average import monthly_average_gross_income, monthly_average_net_income
+from next_pay_date import next_expected_pay_date
+from registry import ASSETS_DIRECTORY, evaluate_bank_income_attributes
+
+
+def test_registry_matches_each_function():
+    # The monthly averages are computed up to today, so the payments are too
+    today = date.today()
+    sources = [
+        bank_income_source(
+            "salary",
+            list(range(4, 200, 14)),
+            amount=2100.0,
+            end_date=today,
+            income_category="SALARY",
+            pay_frequency="BIWEEKLY",
+        ),
+        bank_income_source(
+            "rental",
+            [50, 80],
+            amount=900.0,
+            end_date=today,
+            income_category="RENTAL",
+            pay_frequency="MONTHLY",
+        ),
+    ]
+    report = bank_income_response(
+        [
+            {
+                "bank_income_id": "report",
+                "generated_time": f"{today}T00:00:00Z",
+                "days_requested": 365,
+                "items": [{"item_id": "item", "bank_income_sources": sources}],
+            }
+        ]
+    ).bank_income[0]
+    sources = report.items[0].bank_income_sources
+
+    for parameters in [{}, {"active_source_window": 60, "avg_calculation_window": 30}]:
+        attributes = evaluate_bank_income_attributes(report, **parameters)
+        assert attributes == {
+            "monthly_average_net_income": pytest.approx(
+                monthly_average_net_income(report, **parameters)
+            ),
+            "monthly_average_gross_income": pytest.approx(
+                monthly_average_gross_income(report, **parameters)
+            ),
+            "num_active_sources": 1 if not parameters else 2,
+            "next_expected_pay_dates": {
+                source.income_source_id: next_expected_pay_date(source)
+                for source in sources
+            },
+        }
+    # The registry class is read from assets/ without putting it on the path
+    assert ASSETS_DIRECTORY not in sys.path
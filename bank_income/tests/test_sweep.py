@@ -0,0 +1,103 @@
+from datetime import date
+
+import pytest
+
+from conftest import bank_income_response, bank_income_source
+from monthly_average import (
+    CATEGORIES_TO_INCLUDE,
+    monthly_average_gross_income,
+    monthly_average_net_income,
+)
+from sweep import sweep_monthly_average_income, sweep_monthly_average_income_batch
+
+ACTIVE_SOURCE_WINDOWS = [15, 30, 60]
+AVG_CALCULATION_WINDOWS = [30, 90, 180]
+CATEGORY_SUBSETS = [
+    CATEGORIES_TO_INCLUDE,
+    ["SALARY"],
+    ["GIG_ECONOMY", "TAX_REFUND", "RENTAL"],
+    ["UNEMPLOYMENT"],
+    [],
+]
+
+
+def _report(bank_income_id):
+    # The monthly averages are computed up to today, so the payments are too
+    today = date.today()
+
+    def source(income_source_id, income_category, payment_days, amount):
+        return bank_income_source(
+            income_source_id,
+            payment_days,
+            amount=amount,
+            end_date=today,
+            income_category=income_category,
+        )
+
+    sources = [
+        # Paid since long before every averaging window
+        source("salary", "SALARY", list(range(3, 300, 14)), 2100.0),
+        # Started within the shortest active window
+        source("gig", "GIG_ECONOMY", [2, 6, 11], 180.5),
+        # Started within the averaging windows but not the active ones
+        source("rental", "RENTAL", [8, 38, 68, 98], 950.0),
+        # Stopped before every active window
+        source("unemployment", "UNEMPLOYMENT", [70, 77, 84], 400.0),
+        source("refund", "TAX_REFUND", [200], 1250.0),
+    ]
+    return bank_income_response(
+        [
+            {
+                "bank_income_id": bank_income_id,
+                "generated_time": f"{today}T00:00:00Z",
+                "days_requested": 365,
+                "items": [{"item_id": "item", "bank_income_sources": sources}],
+            }
+        ]
+    ).bank_income[0]
+
+
+def _expected_rows(report):
+    return [
+        {
+            "active_source_window": active_source_window,
+            "avg_calculation_window": avg_calculation_window,
+            "categories_to_include": sorted(categories),
+            "monthly_average_net_income": pytest.approx(
+                monthly_average_net_income(
+                    report, active_source_window, avg_calculation_window, categories
+                )
+            ),
+            "monthly_average_gross_income": pytest.approx(
+                monthly_average_gross_income(
+                    report, active_source_window, avg_calculation_window, categories
+                )
+            ),
+        }
+        for active_source_window in ACTIVE_SOURCE_WINDOWS
+        for avg_calculation_window in AVG_CALCULATION_WINDOWS
+        for categories in CATEGORY_SUBSETS
+    ]
+
+
+def test_sweep_matches_monthly_averages():
+    report = _report("report")
+    rows = sweep_monthly_average_income(
+        report, ACTIVE_SOURCE_WINDOWS, AVG_CALCULATION_WINDOWS, CATEGORY_SUBSETS
+    )
+    assert rows == _expected_rows(report)
+
+
+def test_sweep_batch_tags_every_row():
+    reports = [_report("first"), _report("second")]
+    rows = list(
+        sweep_monthly_average_income_batch(
+            reports, ACTIVE_SOURCE_WINDOWS, AVG_CALCULATION_WINDOWS, CATEGORY_SUBSETS
+        )
+    )
+    expected_rows = [
+        {"bank_income_id": report.bank_income_id, **row}
+        for report in reports
+        for row in _expected_rows(report)
+    ]
+    assert rows == expected_rows
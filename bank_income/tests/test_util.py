@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+import pytest
+
+from conftest import END_DATE, bank_income_response, bank_income_source
+from util import clear_source_indexes, get_total_amount_for_date_range
+
+
+def _linear_total_amount(income_source, start_date, end_date):
+    # The original scan over every transaction of the source
+    total_amount = 0.0
+    for historical_summary in income_source.historical_summary:
+        if "transactions" not in historical_summary:
+            continue
+        for transaction in historical_summary.transactions:
+            if transaction.date >= start_date and transaction.date <= end_date:
+                total_amount += transaction.amount
+    return total_amount
+
+
+def _sources():
+    # Payments out of date order, several on the same date, a historical summary
+    # without transactions and a source without any transactions
+    paid = bank_income_source("paid", [3, 40, 10, 10, 25, 40, 10], amount=250.25)
+    refunded = bank_income_source("refunded", [60, 5], amount=-75.5)
+    split = bank_income_source("split", [30, 15])
+    split["historical_summary"] += [
+        {},
+        bank_income_source("split", [15, 45], amount=99.0)["historical_summary"][0],
+    ]
+    empty = bank_income_source("empty", [])
+    response = bank_income_response(
+        [
+            {
+                "bank_income_id": "report",
+                "generated_time": f"{END_DATE}T00:00:00Z",
+                "days_requested": 90,
+                "items": [
+                    {
+                        "item_id": "item",
+                        "bank_income_sources": [paid, refunded, split, empty],
+                    }
+                ],
+            }
+        ]
+    )
+    return response.bank_income[0].items[0].bank_income_sources
+
+
+def test_total_amount_matches_linear_scan():
+    clear_source_indexes()
+    # Every range between dates before, inside and after the transactions, including
+    # empty ranges whose end is before their start
+    dates = [END_DATE - timedelta(days=days) for days in range(-5, 70, 5)]
+    dates += [END_DATE - timedelta(days=days) for days in (3, 10, 40)]
+    for source in _sources():
+        for start_date in dates:
+            for end_date in dates:
+                assert get_total_amount_for_date_range(
+                    source, start_date, end_date
+                ) == pytest.approx(
+                    _linear_total_amount(source, start_date, end_date)
+                )
+
+
+def test_source_with_the_same_id_gets_its_own_index():
+    clear_source_indexes()
+    start_date = END_DATE - timedelta(days=90)
+    for source in _sources():
+        get_total_amount_for_date_range(source, start_date, END_DATE)
+    # A later version of the source with one more payment
+    refreshed = bank_income_response(
+        [
+            {
+                "bank_income_id": "refreshed",
+                "generated_time": f"{END_DATE}T00:00:00Z",
+                "days_requested": 90,
+                "items": [
+                    {
+                        "item_id": "item",
+                        "bank_income_sources": [
+                            bank_income_source("paid", [1, 3, 40], amount=250.25)
+                        ],
+                    }
+                ],
+            }
+        ]
+    )
+    source = refreshed.bank_income[0].items[0].bank_income_sources[0]
+    assert get_total_amount_for_date_range(
+        source, start_date, END_DATE
+    ) == pytest.approx(3 * 250.25)
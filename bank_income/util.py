@@ -1,8 +1,82 @@
 from typing import List
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 from datetime import date, timedelta
+from itertools import accumulate
 from plaid.model.credit_bank_income import CreditBankIncome
 from plaid.model.credit_bank_income_source import CreditBankIncomeSource
 
+"""
+SourceIndex holds the transactions of an income source sorted by date, with the
+cumulative amount of the transactions up to each date, so that the total amount of the
+source over any date range is two binary searches and a subtraction
+
+Params
+* income_source: the income source to index
+"""
+
+
+class SourceIndex:
+    def __init__(self, income_source: CreditBankIncomeSource):
+        transactions = []
+        for historical_summary in income_source.historical_summary:
+            if "transactions" not in historical_summary:
+                continue
+            for transaction in historical_summary.transactions:
+                transactions.append((transaction.date, transaction.amount))
+        transactions.sort(key=lambda transaction: transaction[0])
+        self.dates = [transaction_date for transaction_date, _ in transactions]
+        self.cumulative_amounts = [0.0] + list(
+            accumulate(amount for _, amount in transactions)
+        )
+
+    def total_amount(self, start_date: date, end_date: date) -> float:
+        start = bisect_left(self.dates, start_date)
+        end = bisect_right(self.dates, end_date)
+        if end <= start:
+            return 0.0
+        return self.cumulative_amounts[end] - self.cumulative_amounts[start]
+
+
+# Source indexes keyed by income_source_id. The least recently used index is evicted
+# once the table holds SOURCE_INDEX_CACHE_SIZE sources.
+SOURCE_INDEX_CACHE_SIZE = 1024
+_source_indexes = OrderedDict()
+
+
+"""
+get_source_index returns the SourceIndex of an income source, building it on the first
+call and reusing it on every later call for the same source
+"""
+
+
+def get_source_index(income_source: CreditBankIncomeSource) -> SourceIndex:
+    income_source_id = income_source.income_source_id
+    entry = _source_indexes.get(income_source_id)
+    # A source with the same id from another report version (e.g. after a refresh) has
+    # its own index
+    if entry is None or entry[0] is not income_source:
+        entry = (income_source, SourceIndex(income_source))
+        _source_indexes[income_source_id] = entry
+        if len(_source_indexes) > SOURCE_INDEX_CACHE_SIZE:
+            _source_indexes.popitem(last=False)
+    _source_indexes.move_to_end(income_source_id)
+    return entry[1]
+
+
+"""
+clear_source_indexes drops the cached index of the given income source, or of every
+source if no income_source_id is given
+"""
+
+
+def clear_source_indexes(income_source_id: str = None) -> None:
+    if income_source_id is None:
+        _source_indexes.clear()
+    else:
+        _source_indexes.pop(income_source_id, None)
+
+
 """
 get_total_amount_for_date_range calculates the total amount for 
 an income source within a given start and end date
@@ -14,14 +88,7 @@ def get_total_amount_for_date_range(
     start_date: date,
     end_date: date,
 ) -> float:
-    total_amount = 0.0
-    for historical_summary in income_source.historical_summary:
-        if "transactions" not in historical_summary:
-            continue
-        for transaction in historical_summary.transactions:
-            if transaction.date >= start_date and transaction.date <= end_date:
-                total_amount += transaction.amount
-    return total_amount
+    return get_source_index(income_source).total_amount(start_date, end_date)
 
 
 """
@@ -46,14 +113,26 @@ def get_active_sources(
                 continue
             # Check if source has at least one transaction within the active window or
             # is a TAX_REFUND
-            if (
-                source.end_date >= active_window_start_date
-                or str(source.income_category) == "TAX_REFUND"
-            ):
+            if is_source_active(source, active_window_start_date):
                 active_sources.append(source)
     return active_sources
 
 
+"""
+is_source_active returns whether an income source has a transaction on or after the
+start of the active window, or is a TAX_REFUND
+"""
+
+
+def is_source_active(
+    source: CreditBankIncomeSource, active_window_start_date: date
+) -> bool:
+    return (
+        source.end_date >= active_window_start_date
+        or str(source.income_category) == "TAX_REFUND"
+    )
+
+
 """
 source_monthly_avg_net_income returns the monthly average net income
 for an income source across a given averaging window